@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""Benchmark reloading file.json.
+Usage: ./bench_reload.py [<number of objects>]
+Writes <number of objects> Places (1000000 by default) to a temporary
+file.json, then reports how many objects per second FileStorage.reload()
+builds, and how many it builds and decodes the timestamps of, first with
+datetime.strptime() as before parse_datetime(), then with
+parse_datetime(), over the same file.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+def rate(count, seconds):
+    """Return the rate of count operations in seconds as a string."""
+    return "{:,.0f}/s".format(count / seconds)
+
+
+def reload(storage, decode):
+    """Return the seconds taken to reload storage and, if decode is set,
+    to read the timestamps of every object."""
+    from models.engine.file_storage import FileStorage
+
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    storage.reload()
+    if decode:
+        for obj in storage.all().values():
+            obj.created_at
+            obj.updated_at
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(tempfile.mkdtemp())
+    from models import base_model, storage
+    from models.place import Place
+
+    for i in range(count):
+        Place().name = "Place {}".format(i)
+    storage.save()
+
+    print("reload objects:              ",
+          rate(count, reload(storage, False)))
+    parse_datetime = base_model.parse_datetime
+    base_model.parse_datetime = \
+        lambda text: datetime.strptime(text, base_model.tform)
+    try:
+        print("reload and decode, strptime: ",
+              rate(count, reload(storage, True)))
+    finally:
+        base_model.parse_datetime = parse_datetime
+    print("reload and decode, new path: ",
+          rate(count, reload(storage, True)))
+    os.remove("file.json")
+    os.rmdir(os.getcwd())
@@ -0,0 +1,244 @@
+#!/usr/bin/python3
+"""Import objects into storage from JSON Lines or CSV, or export them.
+Usage: ./bulk.py import <file> [--class <class>] [--format jsonl|csv]
+                        [--jobs <n>] [--chunk <n>]
+       ./bulk.py export <file> [--class <class>] [--format jsonl|csv]
+<file> may be - for the standard input or output. The format is csv for
+files ending in .csv and JSON Lines otherwise, unless --format is given.
+JSON Lines hold one to_dict() dictionary per line. CSV files have a
+header row naming the columns: __class__, id, created_at, updated_at,
+the class attributes, and extra, a JSON object of any other attribute.
+Columns left empty keep the class default.
+Imported files are read a chunk of lines at a time, so memory does not
+grow with the size of the file beyond the objects themselves, which are
+added and written at once with storage.bulk_new(). With --jobs, chunks
+are parsed by that many worker processes; this only pays off when
+parsing costs more than sending the parsed dictionaries back, so a
+single process is the default. Exports write one object at a time.
+The models are only imported by main(), so worker processes never load
+storage themselves.
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+
+KINDS = {str: "str", int: "int", float: "float", list: "list"}
+"""dict: The name of the CSV conversion of each class attribute type."""
+_schema = {}
+
+
+def schema(classes):
+    """Return the kind of every class attribute of each class of classes,
+    mapped by class name and attribute name."""
+    kinds = {}
+    for cls_name, cls in classes.items():
+        kinds[cls_name] = {
+            k: KINDS[type(getattr(cls, k))] for k, v in vars(cls).items()
+            if not k.startswith("_") and not callable(v) and
+            not isinstance(v, property) and type(getattr(cls, k)) in KINDS}
+    return kinds
+
+
+def columns(kinds, cls_name=None):
+    """Return the CSV columns of cls_name, or of every class in kinds."""
+    names = ["__class__", "id", "created_at", "updated_at"]
+    for name in [cls_name] if cls_name is not None else kinds:
+        names.extend(attr for attr in kinds[name] if attr not in names)
+    return names + ["extra"]
+
+
+def init_worker(kinds):
+    """Set the class attribute kinds used by parse_chunk()."""
+    global _schema
+    _schema = kinds
+
+
+def parse_chunk(fmt, header, cls_name, start, items):
+    """Return the dictionaries of a chunk of lines or CSV rows.
+    Args:
+        fmt (str): "jsonl" or "csv".
+        header (list): The CSV columns.
+        cls_name (str): The class of items naming none.
+        start (int): The line number of the first item.
+        items (list): JSON Lines, or CSV rows as lists of cells.
+    Raises:
+        ValueError: If an item cannot be parsed, naming its line.
+    """
+    found = []
+    for n, item in enumerate(items, start):
+        try:
+            if fmt == "jsonl":
+                if item.strip() == "":
+                    continue
+                o = json.loads(item)
+                if type(o) is not dict:
+                    raise ValueError("not a JSON object")
+            else:
+                o = parse_row(header, item)
+            if cls_name is not None:
+                o.setdefault("__class__", cls_name)
+        except ValueError as e:
+            raise ValueError("line {}: {}".format(n, e)) from None
+        found.append(o)
+    return found
+
+
+def parse_row(header, row):
+    """Return the dictionary of the CSV row with the columns header."""
+    if len(row) != len(header):
+        raise ValueError("expecting {} cells".format(len(header)))
+    o = {}
+    for column, cell in zip(header, row):
+        if cell != "" and column != "extra":
+            o[column] = cell
+    kinds = _schema.get(o.get("__class__"), {})
+    for attr, kind in kinds.items():
+        if attr in o and kind == "int":
+            o[attr] = int(o[attr])
+        elif attr in o and kind == "float":
+            o[attr] = float(o[attr])
+        elif attr in o and kind == "list":
+            o[attr] = json.loads(o[attr])
+    if "extra" in header and row[header.index("extra")] != "":
+        o.update(json.loads(row[header.index("extra")]))
+    return o
+
+
+def format_row(names, o):
+    """Return the CSV cells of the to_dict() dictionary o."""
+    o = dict(o)
+    row = []
+    for column in names[:-1]:
+        value = o.pop(column, "")
+        row.append(value if type(value) is str else json.dumps(value))
+    row.append(json.dumps(o) if len(o) != 0 else "")
+    return row
+
+
+def chunks(f, fmt, size):
+    """Yield the header and (line number, items) chunks of the file f.
+    CSV rows are split by the csv module here so quoted cells may hold
+    newlines; the workers only convert them.
+    """
+    if fmt == "jsonl":
+        yield None
+        lines = f
+    else:
+        lines = csv.reader(f)
+        yield next(lines, [])
+    start, items = 1 + (fmt == "csv"), []
+    for item in lines:
+        items.append(item)
+        if len(items) == size:
+            yield start, items
+            start, items = start + size, []
+    if len(items) != 0:
+        yield start, items
+
+
+def parsed(f, fmt, cls_name, kinds, jobs, size):
+    """Yield the dictionaries parsed from f, in order, by jobs processes.
+    At most two chunks per process are read ahead of the parsed ones.
+    """
+    tasks = chunks(f, fmt, size)
+    header = next(tasks)
+    if fmt == "csv" and "__class__" not in header and cls_name is None:
+        raise ValueError("no __class__ column and no --class")
+    if jobs <= 1:
+        init_worker(kinds)
+        for start, items in tasks:
+            yield from parse_chunk(fmt, header, cls_name, start, items)
+        return
+    with ProcessPoolExecutor(jobs, initializer=init_worker,
+                             initargs=(kinds,)) as pool:
+        pending = deque()
+        for start, items in tasks:
+            pending.append(pool.submit(parse_chunk, fmt, header, cls_name,
+                                       start, items))
+            if len(pending) >= 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def import_file(storage, kinds, f, fmt, cls_name=None, jobs=1, size=10000):
+    """Add every object of the file f to storage and write them once.
+    Return the report of storage.bulk_new()."""
+    return storage.bulk_new(parsed(f, fmt, cls_name, kinds, jobs, size))
+
+
+def export_file(storage, kinds, f, fmt, cls_name=None):
+    """Write every object of storage, or of cls_name, to the file f.
+    Return the number of objects written."""
+    n = 0
+    if fmt == "jsonl":
+        for o in storage.dicts(cls_name):
+            f.write(json.dumps(o) + "\n")
+            n += 1
+        return n
+    names = columns(kinds, cls_name)
+    writer = csv.writer(f)
+    writer.writerow(names)
+    for o in storage.dicts(cls_name):
+        writer.writerow(format_row(names, o))
+        n += 1
+    return n
+
+
+def open_file(path, mode):
+    """Return the context manager of the file path opened in mode, or of
+    the standard input or output, left open, if path is -."""
+    if path == "-":
+        return nullcontext(sys.stdin if mode == "r" else sys.stdout)
+    return open(path, mode, newline="")
+
+
+def main(argv=None):
+    """Run the import or export command of argv, return the exit status."""
+    parser = argparse.ArgumentParser(
+        description="Import or export storage objects as JSON Lines or CSV.")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("file", help="the file to read or write, - for "
+                        "standard input or output")
+    parser.add_argument("--class", dest="cls", help="the class of the "
+                        "imported objects naming none, or the only class "
+                        "to export")
+    parser.add_argument("--format", choices=("jsonl", "csv"))
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="the number of parsing processes")
+    parser.add_argument("--chunk", type=int, default=10000,
+                        help="the number of lines given to a process at once")
+    args = parser.parse_args(argv)
+    fmt = args.format or ("csv" if args.file.endswith(".csv") else "jsonl")
+
+    from models import storage
+    from models.base_model import classes
+
+    if args.cls is not None and args.cls not in classes:
+        print("** class doesn't exist **", file=sys.stderr)
+        return 1
+    kinds = schema(classes)
+    try:
+        if args.command == "export":
+            with open_file(args.file, "w") as f:
+                n = export_file(storage, kinds, f, fmt, args.cls)
+            print("Exported {} objects".format(n), file=sys.stderr)
+            return 0
+        with open_file(args.file, "r") as f:
+            report = import_file(storage, kinds, f, fmt, args.cls,
+                                 args.jobs, args.chunk)
+    except (OSError, ValueError, TypeError) as e:
+        print("** {} **".format(e), file=sys.stderr)
+        return 1
+    print("Imported {objects} objects in {seconds:.2f}s "
+          "({per_second:,.0f} objects/s)".format(**report), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,11 @@
 """cmd module to make command interpreter."""
 import cmd
 import re
+from ast import literal_eval
+from math import isfinite
 from shlex import split
 from models import storage
-from models.base_model import BaseModel
+from models.base_model import BaseModel, classes, read_only
 from models.user import User
 from models.state import State
 from models.city import City
@@ -32,13 +34,36 @@ def parse(arg):
         return retl
 
 
+def parse_value(arg):
+    """Return the Python literal written in arg, or None if it is not one."""
+    try:
+        return literal_eval(arg)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def parse_numbers(args, n):
+    """Return the list of the n numbers written in args.
+    Return None if there are fewer than n arguments, or an empty list if
+    one of them is not a finite number."""
+    if len(args) < n:
+        return None
+    try:
+        numbers = [float(a) for a in args[:n]]
+    except ValueError:
+        return []
+    return numbers if all(isfinite(x) for x in numbers) else []
+
+
 class HBNBCommand(cmd.Cmd):
     """Defines the HolbertonBnB command interpreter.
     Attributes:
         prompt (str): The command prompt.
+        page_size (int): The number of matches shown by search per page.
     """
 
     prompt = "(hbnb) "
+    page_size = 10
     __classes = {
         "BaseModel",
         "User",
@@ -60,7 +85,10 @@ class HBNBCommand(cmd.Cmd):
             "show": self.do_show,
             "destroy": self.do_destroy,
             "count": self.do_count,
-            "update": self.do_update
+            "update": self.do_update,
+            "near": self.do_near,
+            "within": self.do_within,
+            "search": self.do_search
         }
         match = re.search(r"\.", arg)
         if match is not None:
@@ -76,11 +104,13 @@ class HBNBCommand(cmd.Cmd):
 
     def do_quit(self, arg):
         """Quit command to exit the program."""
+        storage.flush()
         return True
 
     def do_EOF(self, arg):
         """EOF signal to exit the program."""
         print("")
+        storage.flush()
         return True
 
     def do_create(self, arg):
@@ -93,7 +123,7 @@ class HBNBCommand(cmd.Cmd):
         elif argl[0] not in HBNBCommand.__classes:
             print("** class doesn't exist **")
         else:
-            print(eval(argl[0])().id)
+            print(classes[argl[0]]().id)
             storage.save()
 
     def do_show(self, arg):
@@ -127,7 +157,7 @@ class HBNBCommand(cmd.Cmd):
         elif "{}.{}".format(argl[0], argl[1]) not in objdict.keys():
             print("** no instance found **")
         else:
-            del objdict["{}.{}".format(argl[0], argl[1])]
+            storage.delete(objdict["{}.{}".format(argl[0], argl[1])])
             storage.save()
 
     def do_all(self, arg):
@@ -137,24 +167,80 @@ class HBNBCommand(cmd.Cmd):
         argl = parse(arg)
         if len(argl) > 0 and argl[0] not in HBNBCommand.__classes:
             print("** class doesn't exist **")
+        elif len(argl) > 0:
+            print([obj.__str__() for obj in storage.query(argl[0])])
         else:
-            objl = []
-            for obj in storage.all().values():
-                if len(argl) > 0 and argl[0] == obj.__class__.__name__:
-                    objl.append(obj.__str__())
-                elif len(argl) == 0:
-                    objl.append(obj.__str__())
-            print(objl)
+            print([obj.__str__() for obj in storage.query()])
 
     def do_count(self, arg):
         """Usage: count <class> or <class>.count()
         Retrieve the number of instances of a given class."""
         argl = parse(arg)
-        count = 0
-        for obj in storage.all().values():
-            if argl[0] == obj.__class__.__name__:
-                count += 1
-        print(count)
+        print(storage.query(argl[0]).count())
+
+    def do_near(self, arg):
+        """Usage: near <class> <latitude> <longitude> <km> or
+       <class>.near(<latitude>, <longitude>, <km>)
+        Display string representations of the instances of a given class
+        within <km> kilometers of a point, nearest first."""
+        argl = parse(arg)
+        if len(argl) == 0:
+            print("** class name missing **")
+        elif argl[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        else:
+            point = parse_numbers(argl[1:], 3)
+            if point is None:
+                print("** coordinates missing **")
+            elif len(point) == 0:
+                print("** invalid coordinates **")
+            else:
+                print([obj.__str__()
+                       for obj in storage.near(argl[0], *point)])
+
+    def do_within(self, arg):
+        """Usage: within <class> <south> <west> <north> <east> or
+       <class>.within(<south>, <west>, <north>, <east>)
+        Display string representations of the instances of a given class
+        inside a latitude/longitude bounding box."""
+        argl = parse(arg)
+        if len(argl) == 0:
+            print("** class name missing **")
+        elif argl[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        else:
+            box = parse_numbers(argl[1:], 4)
+            if box is None:
+                print("** coordinates missing **")
+            elif len(box) == 0:
+                print("** invalid coordinates **")
+            else:
+                print([obj.__str__()
+                       for obj in storage.within(argl[0], *box)])
+
+    def do_search(self, arg):
+        """Usage: search <class> <words>... [page=<n>] or
+       <class>.search(<words>[, page=<n>])
+        Display string representations of the instances of a given class
+        whose text or description holds the words, best match first,
+        one page of matches at a time."""
+        argl = parse(arg)
+        page = 1
+        if len(argl) > 1 and argl[-1].startswith("page="):
+            page = argl.pop()[len("page="):]
+            page = int(page) if page.isdigit() else 0
+        if len(argl) == 0:
+            print("** class name missing **")
+        elif argl[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        elif len(argl) == 1:
+            print("** search words missing **")
+        elif page < 1:
+            print("** invalid page **")
+        else:
+            size = HBNBCommand.page_size
+            print([obj.__str__() for obj in storage.search(
+                " ".join(argl[1:]), argl[0], size, (page - 1) * size)])
 
     def do_update(self, arg):
         """Usage: update <class> <id> <attribute_name> <attribute_value> or
@@ -180,29 +266,37 @@ class HBNBCommand(cmd.Cmd):
         if len(argl) == 2:
             print("** attribute name missing **")
             return False
-        if len(argl) == 3:
-            try:
-                type(eval(argl[2])) != dict
-            except NameError:
-                print("** value missing **")
-                return False
-
-        if len(argl) == 4:
-            obj = objdict["{}.{}".format(argl[0], argl[1])]
-            if argl[2] in obj.__class__.__dict__.keys():
-                valtype = type(obj.__class__.__dict__[argl[2]])
-                obj.__dict__[argl[2]] = valtype(argl[3])
-            else:
-                obj.__dict__[argl[2]] = argl[3]
-        elif type(eval(argl[2])) == dict:
-            obj = objdict["{}.{}".format(argl[0], argl[1])]
-            for k, v in eval(argl[2]).items():
-                if (k in obj.__class__.__dict__.keys() and
-                        type(obj.__class__.__dict__[k]) in {str, int, float}):
-                    valtype = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = valtype(v)
+        if len(argl) == 3 and parse_value(argl[2]) is None:
+            print("** value missing **")
+            return False
+
+        attrs = parse_value(argl[2])
+        attrs = attrs if type(attrs) == dict else [argl[2]]
+        if any(read_only(classes[argl[0]], k) for k in attrs):
+            print("** attribute is read-only **")
+            return False
+
+        try:
+            if len(argl) == 4:
+                obj = objdict["{}.{}".format(argl[0], argl[1])]
+                valtype = type(getattr(obj.__class__, argl[2], None))
+                if valtype in {str, int, float}:
+                    setattr(obj, argl[2], valtype(argl[3]))
                 else:
-                    obj.__dict__[k] = v
+                    setattr(obj, argl[2], argl[3])
+                storage.touch(obj)
+            elif type(parse_value(argl[2])) == dict:
+                obj = objdict["{}.{}".format(argl[0], argl[1])]
+                for k, v in parse_value(argl[2]).items():
+                    valtype = type(getattr(obj.__class__, k, None))
+                    if valtype in {str, int, float}:
+                        setattr(obj, k, valtype(v))
+                    else:
+                        setattr(obj, k, v)
+                storage.touch(obj)
+        except ValueError:
+            print("** invalid value **")
+            return False
         storage.save()
 
 
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""Convert a storage file between the JSON, JSON Lines and binary formats.
+Usage: ./convert.py <source> <destination> [--format json|jsonl|binary]
+The format of <source> is detected from its content, as FileStorage does
+on reload. <destination> is written in the given format, by default
+binary for a JSON or JSON Lines source and json for a binary one, so
+    ./convert.py file.json file.json
+switches file.json to the binary format and back. The destination is
+replaced atomically, and may be the source itself.
+The converter only needs the class registry of the models, which it
+imports once the arguments are parsed, and never uses models.storage,
+so the storage of the working directory is not loaded.
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def read_file(path):
+    """Return the format of the file path and the dictionary of the
+    to_dict() dictionaries it stores, by key. JSON Lines are applied in
+    order and read up to their first invalid line, such as one torn by an
+    interrupted append.
+    """
+    from models.engine import binary
+
+    with open(path, "rb") as f:
+        data = f.read()
+    if binary.is_binary(data):
+        return "binary", dict(binary.load(data))
+    text = data.decode()
+    if text.lstrip()[:1] != "[":
+        return "json", json.loads(text) if text.strip() != "" else {}
+    objs = {}
+    for line in text.splitlines():
+        try:
+            key, o = json.loads(line)
+        except ValueError:
+            break
+        if o is None:
+            objs.pop(key, None)
+        else:
+            objs[key] = o
+    return "jsonl", objs
+
+
+def write_file(path, objs, fmt):
+    """Replace the file path with the objects objs written in fmt.
+    Return its size in bytes.
+    Raises:
+        ValueError: If an object is of an unknown class.
+    """
+    if fmt == "binary":
+        # the model modules register their classes in classes
+        from models import amenity, city, place, review, state, user
+        from models.base_model import classes
+        from models.engine import binary
+
+        packer = binary.Packer(classes)
+        try:
+            data = packer.dump([packer.row(o) for o in objs.values()])
+        except KeyError as e:
+            raise ValueError("unknown class: {}".format(e.args[0])) from None
+    elif fmt == "jsonl":
+        data = "".join(json.dumps([key, o]) + "\n"
+                       for key, o in objs.items()).encode()
+    else:
+        data = json.dumps(objs).encode()
+    tmp = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return len(data)
+
+
+def main(argv=None):
+    """Run the conversion of argv, return the exit status."""
+    parser = argparse.ArgumentParser(
+        description="Convert a storage file between formats.")
+    parser.add_argument("source", help="the file to read")
+    parser.add_argument("destination", help="the file to write")
+    parser.add_argument("--format", choices=("json", "jsonl", "binary"),
+                        help="the format to write, by default binary for "
+                        "a JSON source and json for a binary one")
+    args = parser.parse_args(argv)
+    try:
+        size = os.path.getsize(args.source)
+        source, objs = read_file(args.source)
+        fmt = args.format or ("json" if source == "binary" else "binary")
+        written = write_file(args.destination, objs, fmt)
+    except (OSError, ValueError) as e:
+        print("** {} **".format(e), file=sys.stderr)
+        return 1
+    print("Converted {} objects from {} to {}: {:,} bytes to {:,}".format(
+        len(objs), source, fmt, size, written), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
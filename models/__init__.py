@@ -1,7 +1,46 @@
 #!/usr/bin/python3
-"""__init__ majic method for models directory"""
-from models.engine.file_storage import FileStorage
+"""__init__ majic method for models directory
+The storage engine is created and reloaded when models.storage is first
+used, so tools that only need the model classes, such as convert.py, can
+import them without loading the storage of the working directory.
+"""
+from os import getenv
 
 
-storage = FileStorage()
-storage.reload()
+def _getenv_int(name):
+    """Return the integer value of the environment variable name or None."""
+    value = getenv(name)
+    return None if value is None else int(value)
+
+
+def __getattr__(name):
+    """Create and reload storage on its first use. Should the reload
+    fail, the next use tries again."""
+    global storage
+    if name != "storage":
+        raise AttributeError("module {!r} has no attribute {!r}".format(
+            __name__, name))
+    if getenv("HBNB_TYPE_STORAGE") == "db":
+        from models.engine.db_storage import DBStorage
+        engine = DBStorage(path=getenv("HBNB_DB_PATH"))
+    else:
+        from models.engine.file_storage import FileStorage
+        engine = FileStorage(
+            journal=getenv("HBNB_FILE_JOURNAL") == "1",
+            flush_interval=_getenv_int("HBNB_FLUSH_INTERVAL"),
+            flush_every=_getenv_int("HBNB_FLUSH_EVERY"),
+            durability=getenv("HBNB_FILE_DURABILITY", "file"),
+            lazy=getenv("HBNB_FILE_LAZY") == "1",
+            sharded=getenv("HBNB_FILE_SHARDED") == "1",
+            shard_prefix=_getenv_int("HBNB_FILE_SHARD_PREFIX") or 0,
+            file_format=getenv("HBNB_FILE_FORMAT", "json"))
+    engine.reload()
+    storage = engine
+    return storage
+
+
+if getenv("HBNB_COMPACT_MODELS"):
+    from models.base_model import classes
+    from models.compact import compact
+    for name in getenv("HBNB_COMPACT_MODELS").split(","):
+        compact(classes[name.strip()])
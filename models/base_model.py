@@ -5,8 +5,165 @@ from uuid import uuid4
 from datetime import datetime
 
 
+tform = "%Y-%m-%dT%H:%M:%S.%f"
+classes = {}
+"""dict: Every model class by name, filled in as the classes are defined."""
+_MISSING = object()
+
+
+def parse_datetime(text):
+    """Return the datetime written in text by datetime.isoformat().
+    datetime.fromisoformat() is tried first as it is much faster than
+    datetime.strptime(), which remains the fallback for any string in
+    the tform format that fromisoformat() rejects.
+    """
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return datetime.strptime(text, tform)
+
+
+class _Timestamp:
+    """Represent a datetime attribute that may still hold the string it
+    was loaded from, which is only decoded when the attribute is read."""
+
+    def __set_name__(self, owner, name):
+        """Remember the name of the attribute."""
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        """Return the datetime of obj, decoding it on first access.
+        The other timestamp of obj is set to the same datetime if it
+        holds the same string.
+        """
+        if obj is None:
+            return self
+        try:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if type(value) is str:
+            text, value = value, parse_datetime(value)
+            for name in ("created_at", "updated_at"):
+                if obj.__dict__.get(name) == text:
+                    obj.__dict__[name] = value
+        return value
+
+    def __set__(self, obj, value):
+        """Set the datetime of obj, decoding a string value at once so
+        that one that is not a timestamp is rejected.
+        Raises:
+            ValueError: If value is a string that is not a timestamp.
+        """
+        if type(value) is str:
+            value = parse_datetime(value)
+        obj.__dict__[self.name] = value
+
+
+class _TrackedList(list):
+    """Represent the list held by a list attribute of a model instance.
+    Every change made in place sets the attribute again, so storage is
+    told the instance changed.
+    """
+
+    __slots__ = ("owner", "name")
+
+    def __init__(self, iterable=(), owner=None, name=None):
+        """Initialize a new _TrackedList.
+        Args:
+            iterable (iterable): The initial items.
+            owner (BaseModel): The instance holding the list.
+            name (str): The name of the attribute holding the list.
+        """
+        super().__init__(iterable)
+        self.owner = owner
+        self.name = name
+
+    def __reduce_ex__(self, protocol):
+        """Pickle and copy the list as a plain list, which the attribute
+        wraps again when it is read."""
+        return list, (list(self),)
+
+
+def _tracked(name):
+    """Return the list method name made to report its changes."""
+    method = getattr(list, name)
+
+    def tracked(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self.owner is not None:
+            setattr(self.owner, self.name, self)
+        return result
+    tracked.__name__ = name
+    tracked.__doc__ = method.__doc__
+    return tracked
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear",
+              "sort", "reverse", "__setitem__", "__delitem__", "__iadd__",
+              "__imul__"):
+    setattr(_TrackedList, _name, _tracked(_name))
+
+
+class _ListAttribute:
+    """Represent a list class attribute, whose default is copied into a
+    _TrackedList for every instance instead of being shared by all.
+    Reading the attribute does not set it; the list is only stored in
+    the instance once it is changed.
+    """
+
+    def __init__(self, default):
+        """Initialize a new _ListAttribute.
+        Args:
+            default (list): The items of the default list.
+        """
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        """Remember the name of the attribute."""
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        """Return the list of obj, or a copy of the default."""
+        if obj is None:
+            return list(self.default)
+        value = obj.__dict__.get(self.name, _MISSING)
+        if value is _MISSING:
+            return _TrackedList(self.default, obj, self.name)
+        if type(value) is list or \
+                (type(value) is _TrackedList and value.owner is not obj):
+            value = obj.__dict__[self.name] = \
+                _TrackedList(value, obj, self.name)
+        return value
+
+    def __set__(self, obj, value):
+        """Set the list of obj."""
+        obj.__dict__[self.name] = value
+
+
 class BaseModel:
-    """Represents the BaseModel of the HBnB project."""
+    """Represents the BaseModel of the HBnB project.
+    Attributes:
+        created_at (datetime): When the instance was created.
+        updated_at (datetime): When the instance was last saved.
+    Instances rebuilt by from_dict() keep both timestamps as strings
+    until they are read, so to_dict() can return them unchanged.
+    List class attributes of subclasses, such as Place.amenity_ids, are
+    replaced by descriptors giving each instance its own list.
+    """
+
+    created_at = _Timestamp()
+    updated_at = _Timestamp()
+
+    def __init_subclass__(cls, **kwargs):
+        """Register a new model class in classes."""
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if type(value) is list and not name.startswith("_"):
+                attribute = _ListAttribute(value)
+                attribute.__set_name__(cls, name)
+                setattr(cls, name, attribute)
+        classes[cls.__name__] = cls
 
     def __init__(self, *args, **kwargs):
         """Initialize a new BaseModel.
@@ -14,36 +171,100 @@ class BaseModel:
             *args (any): Unused.
             **kwargs (dict): Key/value pairs of attributes.
         """
-        tform = "%Y-%m-%dT%H:%M:%S.%f"
         self.id = str(uuid4())
         self.created_at = datetime.today()
         self.updated_at = datetime.today()
         if len(kwargs) != 0:
             for k, v in kwargs.items():
                 if k == "created_at" or k == "updated_at":
-                    self.__dict__[k] = datetime.strptime(v, tform)
+                    self.__dict__[k] = parse_datetime(v)
                 else:
                     self.__dict__[k] = v
         else:
             models.storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Set an attribute and mark the instance as changed in storage."""
+        super().__setattr__(name, value)
+        models.storage.touch(self)
+
     def save(self):
         """Update updated_at with the current datetime."""
         self.updated_at = datetime.today()
         models.storage.save()
 
+    @classmethod
+    def from_dict(cls, o):
+        """Return an instance rebuilt from the dictionary o of to_dict().
+        Unlike cls(**o), an id or timestamps are only generated when o
+        lacks them, the timestamps are decoded when first read, and the
+        instance is not added to storage.
+        """
+        obj = cls.__new__(cls)
+        odict = obj.__dict__
+        if "id" not in o or "created_at" not in o or "updated_at" not in o:
+            now = datetime.today()
+            odict.update(id=str(uuid4()), created_at=now, updated_at=now)
+        odict.update(o)
+        odict.pop("__class__", None)
+        return obj
+
     def to_dict(self):
         """Return the dictionary of the BaseModel instance.
         Includes the key/value pair __class__ representing
         the class name of the object.
         """
         rdict = self.__dict__.copy()
-        rdict["created_at"] = self.created_at.isoformat()
-        rdict["updated_at"] = self.updated_at.isoformat()
+        for k in ("created_at", "updated_at"):
+            if type(rdict[k]) is not str:
+                rdict[k] = rdict[k].isoformat()
         rdict["__class__"] = self.__class__.__name__
         return rdict
 
     def __str__(self):
         """Return the print/str representation of the BaseModel instance."""
+        self.created_at  # decode the timestamps shown in __dict__
+        self.updated_at
         clname = self.__class__.__name__
         return "[{}] ({}) {}".format(clname, self.id, self.__dict__)
+
+
+classes["BaseModel"] = BaseModel
+
+
+def read_only(cls, name):
+    """Return True if name is a property of cls without a setter, such as
+    the relationship properties of the models."""
+    attr = getattr(cls, name, None)
+    return isinstance(attr, property) and attr.fset is None
+
+
+def instantiate(item, now=None):
+    """Return the model instance item, or the instance built from the
+    dictionary item like those of to_dict(), without adding it to storage.
+    A missing id is generated and missing timestamps are set to now, an
+    isoformat() string defaulting to the current time.
+    Raises:
+        TypeError: If item is neither a model instance nor a dictionary.
+        ValueError: If item names no known class or holds an invalid
+            timestamp.
+    """
+    if isinstance(item, BaseModel):
+        return item
+    if type(item) is not dict:
+        raise TypeError("not a model or dictionary: {!r}".format(item))
+    cls = classes.get(item.get("__class__"))
+    if cls is None:
+        raise ValueError("unknown class: {}".format(item.get("__class__")))
+    if "id" not in item or "created_at" not in item or \
+            "updated_at" not in item:
+        now = now or datetime.today().isoformat()
+        o = {"id": str(uuid4()), "created_at": now, "updated_at": now}
+        o.update(item)
+        item = o
+    for k in ("created_at", "updated_at"):
+        if type(item[k]) is str:
+            parse_datetime(item[k])
+        elif type(item[k]) is not datetime:
+            raise ValueError("invalid {}: {!r}".format(k, item[k]))
+    return cls.from_dict(item)
@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 """This module creates a City class"""
+import models
 from models.base_model import BaseModel
 
 
@@ -12,3 +13,13 @@ class City(BaseModel):
     """
     state_id = ""
     name = ""
+
+    @property
+    def state(self):
+        """State: The state of the city, or None."""
+        return models.storage.get("State", self.state_id)
+
+    @property
+    def places(self):
+        """list: The Place instances of the city."""
+        return models.storage.related("Place", "city_id", self.id)
@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+"""Defines compact variants of the model classes."""
+import models
+from datetime import datetime
+from models.base_model import _TrackedList, parse_datetime
+from uuid import uuid4
+
+
+class _Field:
+    """Represent a model attribute kept in a slot of the instance.
+    Reading an unset field returns the class default, and timestamps
+    stored as strings are decoded on first read. Lists are returned as
+    a _TrackedList of the instance, a copy of the default when unset.
+    """
+
+    def __init__(self, name, member, default, timestamp=False):
+        """Initialize a new _Field.
+        Args:
+            name (str): The name of the field.
+            member (member_descriptor): The slot holding the value.
+            default (any): The value of the field when it is unset.
+            timestamp (bool): Whether the field holds a datetime.
+        """
+        self.name = name
+        self.member = member
+        self.default = default
+        self.timestamp = timestamp
+
+    def __get__(self, obj, objtype=None):
+        """Return the value of the field, or its default."""
+        if obj is None:
+            return self.default
+        try:
+            value = self.member.__get__(obj)
+        except AttributeError:
+            if self.timestamp:
+                raise
+            if type(self.default) is list:
+                return _TrackedList(self.default, obj, self.name)
+            return self.default
+        if self.timestamp and type(value) is str:
+            value = parse_datetime(value)
+            self.member.__set__(obj, value)
+        elif type(value) is list or \
+                (type(value) is _TrackedList and value.owner is not obj):
+            value = _TrackedList(value, obj, self.name)
+            self.member.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        """Set the value of the field."""
+        self.member.__set__(obj, value)
+
+    def __delete__(self, obj):
+        """Unset the field."""
+        self.member.__delete__(obj)
+
+
+class _CompactModel:
+    """Provide the methods of compact model classes, which keep their
+    declared attributes in slots and any other attribute in the _extra
+    dictionary instead of an instance __dict__.
+    Attributes:
+        _fields (dict): The names of the attributes kept in slots.
+    """
+
+    __slots__ = ("_extra",)
+    _fields = {}
+
+    def __init__(self, *args, **kwargs):
+        """Initialize a new instance like BaseModel.__init__()."""
+        object.__setattr__(self, "_extra", None)
+        if len(kwargs) == 0:
+            super().__init__(*args)
+            return
+        self.__store("id", str(uuid4()))
+        self.__store("created_at", datetime.today())
+        self.__store("updated_at", datetime.today())
+        for k, v in kwargs.items():
+            if k != "__class__":
+                self.__store(k, v)
+
+    @classmethod
+    def from_dict(cls, o):
+        """Return an instance rebuilt from the dictionary o of to_dict()."""
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "_extra", None)
+        for k, v in o.items():
+            if k != "__class__":
+                obj.__store(k, v)
+        return obj
+
+    def __store(self, name, value):
+        """Set the attribute name without reporting it to storage."""
+        if name in self._fields:
+            object.__setattr__(self, name, value)
+        else:
+            if self._extra is None:
+                object.__setattr__(self, "_extra", {})
+            self._extra[name] = value
+
+    def __setattr__(self, name, value):
+        """Set an attribute and mark the instance as changed in storage.
+        Timestamps given as strings are decoded at once, as they are for
+        BaseModel instances."""
+        if name in ("created_at", "updated_at") and type(value) is str:
+            value = parse_datetime(value)
+        if name in self._fields:
+            super().__setattr__(name, value)
+        else:
+            self.__store(name, value)
+            models.storage.touch(self)
+
+    def __getattr__(self, name):
+        """Return an attribute that is not kept in a slot."""
+        if name != "_extra" and self._extra is not None and \
+                name in self._extra:
+            return self._extra[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            self.__class__.__name__, name))
+
+    def __delattr__(self, name):
+        """Delete an attribute."""
+        if name not in self._fields and self._extra is not None and \
+                name in self._extra:
+            del self._extra[name]
+        else:
+            super().__delattr__(name)
+
+    def attributes(self):
+        """Return the dictionary of the attributes set on the instance,
+        the compact counterpart of __dict__."""
+        odict = {}
+        for name in self._fields:
+            try:
+                odict[name] = getattr(type(self), "_v_" + name).__get__(self)
+            except AttributeError:
+                pass
+        if self._extra is not None:
+            odict.update(self._extra)
+        return odict
+
+    def to_dict(self):
+        """Return the dictionary of the instance, like BaseModel.to_dict()."""
+        rdict = self.attributes()
+        for k in ("created_at", "updated_at"):
+            if type(rdict[k]) is not str:
+                rdict[k] = rdict[k].isoformat()
+        rdict["__class__"] = self.__class__.__name__
+        return rdict
+
+    def __str__(self):
+        """Return the print/str representation of the instance."""
+        self.created_at  # decode the timestamps shown below
+        self.updated_at
+        clname = self.__class__.__name__
+        return "[{}] ({}) {}".format(clname, self.id, self.attributes())
+
+
+def compact(cls):
+    """Return the compact variant of the model class cls.
+    The variant is a subclass of cls with the same name that keeps id,
+    created_at, updated_at and the class attributes of cls in slots,
+    which takes much less memory than an instance __dict__. Its other
+    attributes are returned by attributes() rather than __dict__, so
+    they must be set with setattr(). Defining the variant
+    registers it in models.base_model.classes in place of cls, so
+    storage and the console create and reload compact instances.
+    """
+    if issubclass(cls, _CompactModel):
+        return cls
+    defaults = {k: getattr(cls, k) for k, v in vars(cls).items()
+                if not k.startswith("_") and not callable(v) and
+                not isinstance(v, property)}
+    fields = ("id", "created_at", "updated_at") + tuple(defaults)
+    namespace = {
+        "__slots__": tuple("_v_" + name for name in fields),
+        "__doc__": cls.__doc__,
+        "__module__": cls.__module__,
+        "_fields": dict.fromkeys(fields)
+    }
+    new_cls = type(cls.__name__, (_CompactModel, cls), namespace)
+    for name in fields:
+        member = new_cls.__dict__["_v_" + name]
+        setattr(new_cls, name, _Field(name, member, defaults.get(name),
+                                      name in ("created_at", "updated_at")))
+    return new_cls
@@ -0,0 +1,368 @@
+#!/usr/bin/python3
+"""Defines the binary file format of FileStorage.
+A file starts with MAGIC, the format VERSION and the schema of every
+class: its name, and the name and kind of each of its class attributes
+holding a string, an integer, a float or a list.
+The objects follow in one block per class, stored by column:
+    the index of the class in the schema and the number of objects,
+    their ids as UUIDs,
+    created_at and updated_at as int64 microseconds since EPOCH,
+    a uint64 bitmap per object of the schema attributes it holds,
+    one column per schema attribute holding the values of the objects
+    that hold it,
+    and a JSON object of the other attributes of objects, by position.
+Each column starts with its encoding, the number of its values and its
+size in bytes. Integers and floats are int64 and float64 arrays, strings
+are UUIDs if they all are and NUL-separated UTF-8 otherwise, and lists
+are uint32 lengths followed by their items if they all are UUIDs and JSON
+otherwise. UUIDs take 16 bytes, stored as the first byte of each UUID of
+the column, then the second, and so on. Numbers are little-endian.
+An id, timestamp or attribute whose value does not fit the schema is
+stored with the other attributes, which are applied last, so every
+to_dict() dictionary is read back as it was written.
+"""
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate, compress
+from struct import Struct, error as StructError
+import json
+import re
+import sys
+
+
+MAGIC = b"HBNB"
+VERSION = 1
+EPOCH = datetime(1970, 1, 1)
+KINDS = {str: "s", int: "q", float: "d", list: "j"}
+"""dict: The kind of each class attribute type in the schema."""
+_HEADER = Struct("<4sBH")
+_BLOCK = Struct("<HI")
+_COLUMN = Struct("<cII")
+_LENGTH = Struct("<I")
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-"
+                   r"[0-9a-f]{12}")
+_GROUPS = ((0, 4), (4, 6), (6, 8), (8, 10), (10, 16))
+_NIL = bytes(16)
+_US = timedelta(microseconds=1)
+_SWAP = sys.byteorder != "little"
+_SLICE = 4096
+
+
+def schema(cls):
+    """Return the list of (name, kind) pairs of the class attributes of
+    cls that the format stores, at most 64."""
+    found = []
+    for name, value in vars(cls).items():
+        if name.startswith("_") or callable(value) or \
+                isinstance(value, property):
+            continue
+        kind = KINDS.get(type(getattr(cls, name)))
+        if kind is not None:
+            found.append((name, kind))
+    return found[:64]
+
+
+def is_binary(head):
+    """Return True if the bytes head start a file of this format."""
+    return head[:len(MAGIC)] == MAGIC
+
+
+def _text(data):
+    """Return the length-prefixed UTF-8 bytes of the string data."""
+    data = data.encode()
+    return _LENGTH.pack(len(data)) + data
+
+
+def _read_text(data, pos):
+    """Return the string at pos in data and the position after it."""
+    size = _LENGTH.unpack_from(data, pos)[0]
+    pos += _LENGTH.size
+    return str(data[pos:pos + size], "utf-8"), pos + size
+
+
+def _pack_array(kind, values):
+    """Return the little-endian bytes of the array of values."""
+    values = array(kind, values)
+    if _SWAP:
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack_array(kind, data):
+    """Return the list of the little-endian array in data."""
+    values = array(kind)
+    values.frombytes(data)
+    if _SWAP:
+        values.byteswap()
+    return values.tolist()
+
+
+def _microseconds(value):
+    """Return the microseconds since EPOCH of the naive datetime value,
+    or of the string of its isoformat(), or None if it would not be read
+    back as it is."""
+    try:
+        stamp = value if type(value) is datetime else \
+            datetime.fromisoformat(value)
+        if stamp.tzinfo is not None or \
+                (type(value) is str and stamp.isoformat() != value):
+            return None
+    except (TypeError, ValueError):
+        return None
+    return (stamp - EPOCH) // _US
+
+
+def _uuid(value):
+    """Return the 16 bytes of value if it is the string of a UUID, as
+    uuid4() writes them, or None."""
+    if type(value) is str and _UUID.fullmatch(value):
+        return bytes.fromhex(value.replace("-", ""))
+    return None
+
+
+def _pack_uuids(values):
+    """Return the bytes of the 16-byte UUIDs values, stored as the first
+    byte of every UUID, then the second, and so on."""
+    data = b"".join(values)
+    return b"".join(data[n::16] for n in range(16))
+
+
+def _unpack_uuids(data):
+    """Return the list of the UUID strings of the bytes data. Each group
+    of their hex digits is gathered from the bytes at once."""
+    count, groups = len(data) // 16, []
+    for start, end in _GROUPS:
+        size = end - start
+        group = bytearray(size * count)
+        for n in range(size):
+            group[n::size] = data[(start + n) * count:(start + n + 1) * count]
+        groups.append(group.hex(" ", size).split())
+    return list(map("-".join, zip(*groups)))
+
+
+def _unpack_stamps(data):
+    """Return the list of the isoformat() strings of the timestamps in
+    data. The text of each second is only built once."""
+    values = _unpack_array("q", data)
+    seconds = {second: (EPOCH + timedelta(seconds=second)).isoformat()
+               for second in {us // 1000000 for us in values}}
+    return ["%s.%06d" % (seconds[us // 1000000], us % 1000000)
+            if us % 1000000 else seconds[us // 1000000] for us in values]
+
+
+def _pack_column(kind, values):
+    """Return the encoding and bytes of a column of row values of kind,
+    where UUIDs are bytes and lists of UUIDs tuples of bytes."""
+    if kind in ("q", "d"):
+        return kind, _pack_array(kind, values)
+    if kind == "s":
+        if all(type(value) is bytes for value in values):
+            return "u", _pack_uuids(values)
+        return "s", "\0".join(
+            value if type(value) is str else _unpack_uuids(value)[0]
+            for value in values).encode()
+    if all(type(value) is tuple for value in values):
+        return "U", _pack_array("I", map(len, values)) + \
+            _pack_uuids([item for value in values for item in value])
+    return "j", json.dumps(
+        [value if type(value) is list else
+         [_unpack_uuids(item)[0] for item in value]
+         for value in values]).encode()
+
+
+def _unpack_column(code, count, data):
+    """Return the list of the count values of the column data."""
+    if code in ("q", "d"):
+        return _unpack_array(code, data)
+    if code == "u":
+        return _unpack_uuids(data)
+    if code == "s":
+        return str(data, "utf-8").split("\0")
+    if code == "j":
+        return json.loads(data)
+    lengths = _unpack_array("I", data[:4 * count])
+    items = _unpack_uuids(data[4 * count:])
+    return [items[end - n:end]
+            for n, end in zip(lengths, accumulate(lengths))]
+
+
+class Packer:
+    """Represent the writer of files of the schema of a set of classes.
+    Objects are first converted to rows, which may be kept and written
+    again as long as the header does not change.
+    Attributes:
+        header (bytes): The magic, version and schema of the file.
+    """
+
+    def __init__(self, classes):
+        """Initialize a new Packer.
+        Args:
+            classes (dict): The model classes to write, by name.
+        """
+        self.__index = {}
+        self.__schemas = []
+        self.__types = []
+        types = {kind: cls for cls, kind in KINDS.items()}
+        parts = [_HEADER.pack(MAGIC, VERSION, len(classes))]
+        for cls_name, cls in classes.items():
+            attrs = schema(cls)
+            self.__index[cls_name] = len(self.__schemas)
+            self.__schemas.append(attrs)
+            self.__types.append([(1 << bit, name, types[kind])
+                                 for bit, (name, kind) in enumerate(attrs)])
+            parts.append(_text(cls_name) + bytes([len(attrs)]))
+            for name, kind in attrs:
+                parts.append(_text(name) + kind.encode())
+        self.header = b"".join(parts)
+
+    def row(self, o):
+        """Return the row of the to_dict() dictionary o: the index of its
+        class, its id, timestamps, attribute bitmap, the tuple of its
+        schema attributes, None where missing, and the dictionary of its
+        other attributes, or None. UUIDs are held as their 16 bytes.
+        Raises:
+            KeyError: If the class of o is not in the schema.
+        """
+        o = dict(o)
+        index = self.__index[o.pop("__class__")]
+        oid = o.pop("id", None)
+        packed = _uuid(oid)
+        if packed is None:
+            o["id"], packed = oid, _NIL
+        stamps = []
+        for name in ("created_at", "updated_at"):
+            value = o.pop(name, None)
+            stamps.append(_microseconds(value))
+            if stamps[-1] is None:
+                o[name], stamps[-1] = value, 0
+        bitmap, values = 0, []
+        for bit, name, kind in self.__types[index]:
+            value = o.get(name)
+            if type(value) is not kind or \
+                    kind is str and "\0" in value or \
+                    kind is int and not -2 ** 63 <= value < 2 ** 63:
+                values.append(None)
+                continue
+            del o[name]
+            bitmap |= bit
+            if kind is str:
+                value = _uuid(value) or value
+            elif kind is list:
+                items = tuple(map(_uuid, value))
+                if None not in items:
+                    value = items
+            values.append(value)
+        return (index, packed, stamps[0], stamps[1], bitmap, tuple(values),
+                o if len(o) != 0 else None)
+
+    def dump(self, rows):
+        """Return the bytes of the file holding rows."""
+        blocks = {}
+        for row in rows:
+            blocks.setdefault(row[0], []).append(row)
+        parts = [self.header]
+        for index, rows in blocks.items():
+            parts.append(_BLOCK.pack(index, len(rows)))
+            parts.append(_pack_uuids([row[1] for row in rows]))
+            parts.append(_pack_array("q", [row[2] for row in rows]))
+            parts.append(_pack_array("q", [row[3] for row in rows]))
+            parts.append(_pack_array("Q", [row[4] for row in rows]))
+            for n, (name, kind) in enumerate(self.__schemas[index]):
+                values = [row[5][n] for row in rows if row[5][n] is not None]
+                code, data = _pack_column(kind, values)
+                parts.append(_COLUMN.pack(code.encode(), len(values),
+                                          len(data)) + data)
+            others = {n: row[6] for n, row in enumerate(rows)
+                      if row[6] is not None}
+            parts.append(_text(json.dumps(others) if len(others) else ""))
+        return b"".join(parts)
+
+
+def load(data):
+    """Yield the (key, to_dict() dictionary) pairs of the objects in data,
+    the bytes of a file of this format. Timestamps are read back as the
+    strings of their isoformat().
+    Raises:
+        ValueError: If data is not a whole file of this version.
+    """
+    try:
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a version {} HBNB file".format(VERSION))
+        pos = _HEADER.size
+        schemas = []
+        for _ in range(count):
+            cls_name, pos = _read_text(data, pos)
+            attrs, pos = [], pos + 1
+            for bit in range(data[pos - 1]):
+                name, pos = _read_text(data, pos)
+                attrs.append((1 << bit, name))
+                pos += 1
+            schemas.append((cls_name, attrs))
+        blocks = []
+        while pos < len(data):
+            index, count = _BLOCK.unpack_from(data, pos)
+            cls_name, attrs = schemas[index]
+            pos, block = _read_block(data, pos + _BLOCK.size, count, attrs)
+            blocks.append((cls_name, block))
+        if pos > len(data):
+            raise IndexError
+    except (StructError, IndexError):
+        raise ValueError("truncated HBNB file") from None
+    for cls_name, block in blocks:
+        yield from _objects(cls_name, *block)
+
+
+def _read_block(data, pos, count, attrs):
+    """Return the position after the block of count objects with the
+    schema attrs at pos in data, and the tuple of its columns."""
+    ids = _unpack_uuids(data[pos:pos + 16 * count])
+    pos += 16 * count
+    created = _unpack_stamps(data[pos:pos + 8 * count])
+    pos += 8 * count
+    updated = _unpack_stamps(data[pos:pos + 8 * count])
+    pos += 8 * count
+    bitmaps = _unpack_array("Q", data[pos:pos + 8 * count])
+    pos += 8 * count
+    columns = []
+    for bit, name in attrs:
+        code, n, size = _COLUMN.unpack_from(data, pos)
+        pos += _COLUMN.size
+        if n != 0:
+            values = _unpack_column(code.decode(), n, data[pos:pos + size])
+            columns.append((bit, name, values))
+        pos += size
+    others, pos = _read_text(data, pos)
+    others = {int(n): o for n, o in json.loads(others).items()} \
+        if others else {}
+    return pos, (ids, created, updated, bitmaps, columns, others)
+
+
+def _objects(cls_name, ids, created, updated, bitmaps, columns, others):
+    """Yield the (key, dictionary) pairs of the columns of a block.
+    Objects are built a slice at a time, one column after the other, so
+    only the dictionaries of a slice are held at once."""
+    starts = [0] * len(columns)
+    for low in range(0, len(ids), _SLICE):
+        high = low + _SLICE
+        objs = [{"id": oid, "created_at": created_at,
+                 "updated_at": updated_at} for oid, created_at, updated_at
+                in zip(ids[low:high], created[low:high], updated[low:high])]
+        for n, (bit, name, values) in enumerate(columns):
+            if len(values) == len(ids):
+                held, start, end = objs, low, high
+            else:
+                mask = [bitmap & bit for bitmap in bitmaps[low:high]]
+                held = compress(objs, mask)
+                start = starts[n]
+                end = starts[n] = start + len(mask) - mask.count(0)
+            for o, value in zip(held, values[start:end]):
+                o[name] = value
+        for o in objs:
+            o["__class__"] = cls_name
+        keys = ids[low:high]
+        if len(others) != 0:
+            for n, o in enumerate(objs, low):
+                o.update(others.get(n, ()))
+            keys = [o["id"] for o in objs]
+        yield from zip([cls_name + "." + oid for oid in keys], objs)
@@ -0,0 +1,312 @@
+#!/usr/bin/python3
+"""Defines the DBStorage engine."""
+from models.base_model import BaseModel, classes, instantiate, read_only
+from models.user import User
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.amenity import Amenity
+from models.review import Review
+from models.engine.index import TextIndex, distance
+from models.engine.query import Query
+from datetime import datetime
+from math import inf
+import json
+import sqlite3
+import time
+
+
+_MISSING = object()
+
+
+class DBStorage:
+    """Represent a storage engine backed by a SQLite database.
+    Every class has its own table with a column for id, created_at,
+    updated_at and each str, int or float class attribute. Any other
+    attribute is kept as JSON in the extra column.
+    Attributes:
+        __db_path (str): The name of the SQLite database file.
+    """
+
+    __db_path = "hbnb.db"
+
+    def __init__(self, *, path=None):
+        """Initialize a new DBStorage.
+        Args:
+            path (str): The database file to use instead of __db_path.
+        """
+        self.__conn = sqlite3.connect(path or DBStorage.__db_path)
+        self.__objects = {}
+        self.__buckets = {name: {} for name in classes}
+        self.__dirty = {}
+        self.__columns = {}
+        self.__insert = {}
+        self.__select = {}
+        with self.__conn:
+            for cls_name, cls in classes.items():
+                self.__create_table(cls_name, cls)
+
+    def __create_table(self, cls_name, cls):
+        """Create or extend the table of cls to match its attributes."""
+        columns = [k for k in vars(cls) if not k.startswith("_") and
+                   type(getattr(cls, k)) in (str, int, float)]
+        self.__columns[cls_name] = columns
+        self.__conn.execute(
+            'CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY KEY, '
+            'created_at TEXT, updated_at TEXT, extra TEXT)'.format(cls_name))
+        info = 'PRAGMA table_info("{}")'.format(cls_name)
+        existing = {row[1] for row in self.__conn.execute(info)}
+        for column in columns:
+            if column not in existing:
+                self.__conn.execute('ALTER TABLE "{}" ADD COLUMN "{}"'.format(
+                    cls_name, column))
+        names = ["id", "created_at", "updated_at", "extra"] + columns
+        names = ", ".join('"{}"'.format(c) for c in names)
+        marks = ", ".join("?" * (4 + len(columns)))
+        self.__insert[cls_name] = 'INSERT OR REPLACE INTO "{}" ({}) ' \
+            'VALUES ({})'.format(cls_name, names, marks)
+        self.__select[cls_name] = 'SELECT {} FROM "{}"'.format(names, cls_name)
+
+    def all(self, cls=None):
+        """Return the dictionary of all loaded objects, or only of those
+        of cls.
+        Args:
+            cls (type or str): The class, or class name, to select.
+        """
+        if cls is None:
+            return self.__objects
+        return self.__buckets.get(cls if type(cls) is str else cls.__name__,
+                                  {})
+
+    def count(self, cls=None):
+        """Return the number of objects, or of objects of cls."""
+        return len(self.all(cls))
+
+    def dicts(self, cls=None):
+        """Yield the to_dict() dictionary of every loaded object, or of
+        every instance of cls, one at a time."""
+        for obj in list(self.all(cls).values()):
+            yield obj.to_dict()
+
+    def query(self, cls=None):
+        """Return a Query over the objects of cls, or over all objects."""
+        return Query(self, cls)
+
+    def find(self, cls, **kwargs):
+        """Return the list of cls instances whose attributes equal kwargs."""
+        return [obj for obj in self.all(cls).values()
+                if all(getattr(obj, attr, _MISSING) == value
+                       for attr, value in kwargs.items())]
+
+    def get(self, cls, id):
+        """Return the loaded instance of cls with the given id, or None."""
+        return self.__objects.get("{}.{}".format(
+            cls if type(cls) is str else cls.__name__, id))
+
+    def related(self, cls, attr, value):
+        """Return the list of cls instances whose foreign-key attribute
+        attr equals value, e.g. related(City, "state_id", state.id)."""
+        return sorted(self.find(cls, **{attr: value}), key=lambda obj: obj.id)
+
+    def scan(self, cls, **ranges):
+        """Return the list of cls instances whose attributes lie in ranges,
+        which map attributes to (low, high) bounds, both inclusive, None
+        leaving a side unbounded."""
+        bounds = [(attr, -inf if low is None else low,
+                   inf if high is None else high)
+                  for attr, (low, high) in ranges.items()]
+        return [obj for obj in self.all(cls).values()
+                if all(type(getattr(obj, attr, None)) in (int, float) and
+                       low <= getattr(obj, attr) <= high
+                       for attr, low, high in bounds)]
+
+    def having(self, cls, **kwargs):
+        """Return the list of cls instances whose list attributes hold
+        every item of kwargs, e.g. having(Place, amenity_ids=[a, b])."""
+        return [obj for obj in self.all(cls).values()
+                if all(isinstance(getattr(obj, attr, None), (list, tuple)) and
+                       all(item in getattr(obj, attr) for item in items)
+                       for attr, items in kwargs.items())]
+
+    def search(self, text, cls=None, limit=None, offset=0):
+        """Return the list of objects whose text or description attributes
+        hold words of text, best match first, optionally only instances
+        of cls, skipping offset matches and returning at most limit."""
+        index = TextIndex()
+        for key, obj in self.all(cls).items():
+            values = [getattr(obj, attr, None)
+                      for attr in ("text", "description")]
+            index.add(key, " ".join(value for value in values
+                                    if type(value) is str))
+        stop = None if limit is None else offset + limit
+        objs = self.__objects if cls is None else self.all(cls)
+        return [objs[key] for _, key in index.search(text)[offset:stop]]
+
+    def near(self, cls, lat, lon, km):
+        """Return the list of cls instances whose latitude and longitude
+        are within km kilometers of the point (lat, lon), nearest first.
+        """
+        found = []
+        for obj in self.__located(cls):
+            d = distance(lat, lon, obj.latitude, obj.longitude)
+            if d <= km:
+                found.append((d, obj))
+        found.sort(key=lambda pair: pair[0])
+        return [obj for _, obj in found]
+
+    def within(self, cls, south, west, north, east):
+        """Return the list of cls instances whose latitude and longitude
+        lie in the bounding box, edges included. A box with west greater
+        than east crosses the antimeridian.
+        """
+        return [obj for obj in self.__located(cls)
+                if south <= obj.latitude <= north and
+                (west <= obj.longitude <= east if west <= east else
+                 obj.longitude >= west or obj.longitude <= east)]
+
+    def __located(self, cls):
+        """Return the list of cls instances with a numeric latitude and
+        longitude."""
+        return [obj for obj in self.all(cls).values()
+                if type(getattr(obj, "latitude", None)) in (int, float) and
+                type(getattr(obj, "longitude", None)) in (int, float)]
+
+    def new(self, obj):
+        """Set in the loaded objects obj with key <obj_class_name>.id"""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        self.__objects[key] = obj
+        self.__buckets.setdefault(obj.__class__.__name__, {})[key] = obj
+        self.__dirty[key] = obj
+
+    def touch(self, obj):
+        """Mark obj as changed so the next save writes it."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        if self.__objects.get(key) is obj:
+            self.__dirty[key] = obj
+
+    def delete(self, obj=None):
+        """Delete obj from the loaded objects if it is inside."""
+        if obj is None:
+            return
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        if self.__objects.pop(key, None) is not None:
+            self.__buckets[obj.__class__.__name__].pop(key, None)
+            self.__dirty[key] = None
+
+    def bulk_new(self, objs):
+        """Add many objects and write them in one transaction.
+        Args:
+            objs (iterable): Model instances, or dictionaries like those
+                of to_dict(), whose "__class__" names the class to build.
+        Return:
+            The dictionary of the number of objects added, the seconds
+            taken and the resulting objects per second.
+        Raises:
+            TypeError: If an item is neither a model nor a dictionary.
+            ValueError: If a dictionary names no known class, or holds
+                an invalid timestamp.
+        """
+        start = time.perf_counter()
+        now = datetime.today().isoformat()
+        built = [instantiate(item, now) for item in objs]
+        for obj in built:
+            self.new(obj)
+        self.save()
+        return self.__report(len(built), start)
+
+    def bulk_update(self, changes):
+        """Update many loaded objects and write them in one transaction.
+        Every change is checked before any is applied.
+        Args:
+            changes (iterable): Dictionaries holding the "__class__" and
+                "id" of a loaded object and the attributes to set on it.
+        Return:
+            The dictionary of the number of objects updated, the seconds
+            taken and the resulting objects per second.
+        Raises:
+            ValueError: If a change names no loaded object or a read-only
+                attribute.
+        """
+        start = time.perf_counter()
+        found = []
+        for change in changes:
+            key = "{}.{}".format(change.get("__class__"), change.get("id"))
+            if key not in self.__objects:
+                raise ValueError("no instance found: {}".format(key))
+            for attr in change:
+                if read_only(type(self.__objects[key]), attr):
+                    raise ValueError("read-only attribute: {}".format(attr))
+            found.append((self.__objects[key], change))
+        now = datetime.today()
+        for obj, change in found:
+            for attr, value in change.items():
+                if attr not in ("__class__", "id"):
+                    setattr(obj, attr, value)
+            obj.updated_at = now
+            self.touch(obj)
+        self.save()
+        return self.__report(len(found), start)
+
+    def __report(self, n, start):
+        """Return the throughput of a bulk operation on n objects."""
+        seconds = time.perf_counter() - start
+        return {"objects": n, "seconds": seconds,
+                "per_second": n / seconds if seconds > 0 else inf}
+
+    def save(self):
+        """Write the objects changed since the last save in one
+        transaction."""
+        rows, deleted = {}, {}
+        for key, obj in self.__dirty.items():
+            cls_name, _, oid = key.partition(".")
+            if obj is None:
+                deleted.setdefault(cls_name, []).append((oid,))
+            else:
+                rows.setdefault(cls_name, []).append(self.__row(obj))
+        with self.__conn:
+            for cls_name, ids in deleted.items():
+                self.__conn.executemany(
+                    'DELETE FROM "{}" WHERE id = ?'.format(cls_name), ids)
+            for cls_name, values in rows.items():
+                self.__conn.executemany(self.__insert[cls_name], values)
+        self.__dirty = {}
+
+    def flush(self):
+        """Do nothing, every save is written immediately."""
+        pass
+
+    def reload(self):
+        """Load every object stored in the database."""
+        for cls_name, cls in classes.items():
+            columns = self.__columns[cls_name]
+            for row in self.__conn.execute(self.__select[cls_name]):
+                o = json.loads(row[3]) if row[3] is not None else {}
+                o["id"], o["created_at"], o["updated_at"] = row[:3]
+                for column, value in zip(columns, row[4:]):
+                    if value is not None:
+                        o[column] = value
+                key = "{}.{}".format(cls_name, row[0])
+                obj = cls.from_dict(o)
+                self.__objects[key] = self.__buckets[cls_name][key] = obj
+        self.__dirty = {}
+
+    def close(self):
+        """Close the connection to the database."""
+        self.__conn.close()
+
+    def __row(self, obj):
+        """Return the values of the table row of obj.
+        Values that do not fit the column of a class attribute are kept
+        in the extra column with the other attributes.
+        """
+        o = obj.to_dict()
+        cls_name = o.pop("__class__")
+        row = [o.pop("id"), o.pop("created_at"), o.pop("updated_at")]
+        values = []
+        for column in self.__columns[cls_name]:
+            if type(o.get(column)) in (str, int, float):
+                values.append(o.pop(column))
+            else:
+                values.append(None)
+        row.append(json.dumps(o) if len(o) != 0 else None)
+        return row + values
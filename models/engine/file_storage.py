@@ -1,13 +1,154 @@
 #!/usr/bin/python3
-from models.base_model import BaseModel
+from models.base_model import BaseModel, classes, instantiate, read_only
 from models.user import User
 from models.state import State
 from models.city import City
 from models.place import Place
 from models.amenity import Amenity
 from models.review import Review
+from models.engine import binary
+from models.engine.index import ColumnStore, GridIndex, HashIndex, \
+    InvertedIndex, SortedIndex, TextIndex
+from models.engine.query import Query
+from collections.abc import Hashable
+from datetime import datetime
+from math import inf
+import io
 import os.path
+import re
 import json
+import atexit
+import gc
+import threading
+import time
+import traceback
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_MISSING = object()
+
+
+def _iter_json_object(f, chunk_size=65536):
+    """Yield the (key, value) pairs of the JSON object read from f.
+    Only one pair is decoded at a time, so the whole document is never
+    held in memory.
+    Raises:
+        ValueError: If f does not hold a JSON object of objects.
+    """
+    decode = json.JSONDecoder().raw_decode
+    buf, pos, eof = "", 0, False
+    size = chunk_size
+    expect, key = "{", None
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos < len(buf):
+            c = buf[pos]
+            if expect in ("{", ":", ","):
+                if c == "}" and expect == ",":
+                    return
+                if c != expect:
+                    raise ValueError("expecting '{}' at {}".format(expect, c))
+                pos += 1
+                expect = "value" if expect == ":" else "key"
+                continue
+            if c == "}" and expect == "key" and key is None:
+                return
+            try:
+                value, end = decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                pos, size = end, chunk_size
+                if expect == "key":
+                    if type(value) is not str:
+                        raise ValueError("expecting a string key")
+                    key, expect = value, ":"
+                else:
+                    if type(value) is not dict:
+                        raise ValueError("expecting an object for " + key)
+                    yield key, value
+                    expect = ","
+                continue
+        elif eof:
+            raise ValueError("unexpected end of JSON object")
+        chunk = f.read(size)
+        buf, pos, eof = buf[pos:] + chunk, 0, chunk == ""
+        size *= 2
+
+
+class _LazyObjects(dict):
+    """Dictionary of objects that are instantiated on first access.
+    Values that are still plain dictionaries hold the stored attributes,
+    including __class__, of an object that was not built yet. Every way
+    of reading a value builds it, including copies and merges, which
+    __iter__ being overridden routes through __getitem__.
+    """
+
+    def __init__(self, objects=(), parent=None):
+        """Initialize a new _LazyObjects.
+        Args:
+            objects (dict): The initial objects.
+            parent (_LazyObjects): If set, objects are built by looking
+                them up in parent, so both hold the same instance.
+        """
+        super().__init__(objects)
+        self.__parent = parent
+
+    def __getitem__(self, key):
+        """Return the object stored under key, building it if needed."""
+        obj = dict.__getitem__(self, key)
+        if type(obj) is dict:
+            if self.__parent is not None:
+                obj = self.__parent[key]
+            else:
+                obj = classes[obj["__class__"]].from_dict(obj)
+            dict.__setitem__(self, key, obj)
+        return obj
+
+    def __iter__(self):
+        """Return an iterator over the keys."""
+        return dict.__iter__(self)
+
+    def __or__(self, other):
+        """Return a dictionary of the objects merged with other."""
+        return self.copy() | other
+
+    def get(self, key, default=None):
+        """Return the object stored under key or default."""
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        """Return the object stored under key, storing default first if
+        key is missing."""
+        if key not in self:
+            dict.__setitem__(self, key, default)
+        return self[key]
+
+    def copy(self):
+        """Return a dictionary of all objects."""
+        return dict(self.items())
+
+    def pop(self, key, *default):
+        """Remove key and return its object, or default if missing."""
+        if key not in self:
+            return dict.pop(self, key, *default)
+        obj = self[key]
+        dict.__delitem__(self, key)
+        return obj
+
+    def popitem(self):
+        """Remove the last key and return it with its object."""
+        key = next(reversed(self.keys()))
+        return key, self.pop(key)
+
+    def values(self):
+        """Return the list of all objects."""
+        return [self[key] for key in self]
+
+    def items(self):
+        """Return the list of all (key, object) pairs."""
+        return [(key, self[key]) for key in self]
 
 
 class FileStorage:
@@ -15,35 +156,1235 @@ class FileStorage:
     Attributes:
         __file_path (str): The name of the file to save objects to.
         __objects (dict): A dictionary of instantiated objects.
+        __dirty (dict): Keys changed since the last save, mapped to the
+            changed object, or to None when the object was deleted.
+        __cache (dict): The JSON text last written for each unchanged key.
+        __cached (dict): The __objects dictionary __cache belongs to.
+        __packed (dict): The binary row last written for each unchanged
+            key, reset with __cache.
+        __packer (Packer): The writer of the binary rows of __packed.
+        __lock (RLock): Serializes changes with background flushes.
+        __muted (bool): Whether touch() ignores changes, set while a bulk
+            update sets attributes and tracks the objects itself.
+        __index_attrs (tuple): The attributes indexed by find().
+        __indexes (dict): The HashIndex of each class and indexed attribute.
+        __indexed (dict): The __objects dictionary __indexes belong to.
+        __joins (dict): The sorted keys of the objects returned by
+            related() for each class, foreign-key attribute and value,
+            dropped when an object joins or leaves them.
+        __joined (dict): The __objects dictionary __joins belong to.
+        __list_attrs (tuple): The list attributes indexed by having().
+        __inverted (dict): The InvertedIndex of each class and list
+            attribute.
+        __inverted_for (dict): The __objects dictionary __inverted belong
+            to.
+        __text_attrs (tuple): The attributes indexed by search().
+        __text (TextIndex): The words of the text attributes of every
+            object, saved to __file_path + ".text" by compact(), flush()
+            and on exit.
+        __texted (dict): The __objects dictionary __text belongs to.
+        __range_attrs (tuple): The numeric attributes with sorted indexes.
+        __sorted (dict): The SortedIndex of each class and range attribute.
+        __sorted_for (dict): The __objects dictionary __sorted belong to.
+        __buckets (dict): The objects of __objects by class name.
+        __bucketed (dict): The __objects dictionary __buckets belong to.
+        __columns (dict): The ColumnStore of the numeric class attributes
+            of each class that has some.
+        __columned (dict): The __objects dictionary __columns belong to.
+        __grids (dict): The GridIndex of the latitude and longitude of
+            each class that has both attributes.
+        __gridded (dict): The __objects dictionary __grids belong to.
     """
 
     __file_path = "file.json"
     __objects = {}
+    __dirty = {}
+    __cache = {}
+    __cached = None
+    __packed = {}
+    __packer = None
+    __lock = threading.RLock()
+    __muted = False
+    __index_attrs = ("city_id", "state_id", "place_id", "user_id")
+    __indexes = None
+    __indexed = None
+    __joins = None
+    __joined = None
+    __list_attrs = ("amenity_ids",)
+    __inverted = None
+    __inverted_for = None
+    __text_attrs = ("text", "description")
+    __text = None
+    __texted = None
+    __range_attrs = ("price_by_night", "max_guest", "number_rooms")
+    __sorted = None
+    __sorted_for = None
+    __buckets = None
+    __bucketed = None
+    __columns = None
+    __columned = None
+    __grids = None
+    __gridded = None
+
+    def __init__(self, *, journal=False, compact_every=1000,
+                 flush_interval=None, flush_every=None, durability="file",
+                 lazy=False, sharded=False, shard_prefix=0,
+                 file_format="json"):
+        """Initialize a new FileStorage.
+        Args:
+            journal (bool): Append changes to __file_path + ".log" instead
+                of rewriting __file_path on every save.
+            compact_every (int): Number of journal records after which the
+                log is folded back into __file_path.
+            flush_interval (int): If set, saves are written by a background
+                thread at most once every flush_interval milliseconds.
+            flush_every (int): If set, saves are written once every
+                flush_every calls to save().
+            durability (str): "none" to leave writes in the OS cache,
+                "file" to fsync written files, "dir" to also fsync the
+                directory holding a replaced file.
+            lazy (bool): Keep reloaded objects as their stored dictionaries
+                and only instantiate them when they are first accessed.
+            sharded (bool): Store each class in its own file next to
+                __file_path, e.g. file.User.json, and only rewrite the
+                files of classes that changed.
+            shard_prefix (int): If set, further split each class file by
+                the first shard_prefix characters of the ids.
+            file_format (str): "json" to write __file_path as one JSON
+                object, "jsonl" to write it as JSON Lines, one
+                [key, object] array per line, appending the changes of
+                each save, "binary" to write it in the format of
+                models/engine/binary.py. Every format is read whatever
+                the option.
+        Raises:
+            ValueError: If durability or file_format is not known, or if
+                the jsonl format is combined with journal or sharded, or
+                the binary format with sharded.
+        """
+        if durability not in ("none", "file", "dir"):
+            raise ValueError("unknown durability: {}".format(durability))
+        if file_format not in ("json", "jsonl", "binary"):
+            raise ValueError("unknown file format: {}".format(file_format))
+        if file_format == "jsonl" and (journal or sharded):
+            raise ValueError("the jsonl format is already append-only and "
+                             "cannot be sharded")
+        if file_format == "binary" and sharded:
+            raise ValueError("the binary format cannot be sharded")
+        self.journal = journal
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.durability = durability
+        self.lazy = lazy
+        self.sharded = sharded
+        self.shard_prefix = shard_prefix
+        self.file_format = file_format
+        self.__lined = None
+        self.__stale = None
+        self.__loaded = None
+        self.__records = 0
+        self.__pending = 0
+        self.__flusher = None
+        atexit.register(self.__close)
+
+    def all(self, cls=None):
+        """Return the dictionary __objects, or only the objects of cls.
+        Args:
+            cls (type or str): The class, or class name, to select.
+        """
+        if cls is None:
+            return FileStorage.__objects
+        with FileStorage.__lock:
+            return self.__class_buckets().get(self.__name(cls), {})
+
+    def count(self, cls=None):
+        """Return the number of objects, or of objects of cls."""
+        return len(self.all(cls))
 
-    def all(self):
-        """returns the dictionary __objects"""
-        return FileStorage.__objects
+    def dicts(self, cls=None):
+        """Yield the to_dict() dictionary of every object, or of every
+        instance of cls, one at a time. Objects not built yet in lazy
+        mode are not built to be exported.
+        """
+        objs = FileStorage.__objects
+        with FileStorage.__lock:
+            keys = list(objs if cls is None else self.all(cls))
+        for key in keys:
+            obj = dict.get(objs, key)
+            if obj is not None:
+                yield dict(obj) if type(obj) is dict else obj.to_dict()
 
     def new(self, obj):
         """Set in __objects obj with key <obj_class_name>.id"""
         ocname = obj.__class__.__name__
-        FileStorage.__objects["{}.{}".format(ocname, obj.id)] = obj
+        key = "{}.{}".format(ocname, obj.id)
+        with FileStorage.__lock:
+            FileStorage.__objects[key] = obj
+            FileStorage.__dirty[key] = obj
+            self.__track(key, obj)
+
+    def touch(self, obj):
+        """Mark obj as changed so the next save records it.
+        Objects that are not in __objects are ignored.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with FileStorage.__lock:
+            if not FileStorage.__muted and \
+                    FileStorage.__objects.get(key) is obj:
+                FileStorage.__dirty[key] = obj
+                self.__track(key, obj)
+
+    def delete(self, obj=None):
+        """Delete obj from __objects if it is inside."""
+        if obj is None:
+            return
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with FileStorage.__lock:
+            if FileStorage.__objects.pop(key, None) is not None:
+                FileStorage.__dirty[key] = None
+                self.__track(key, None)
+
+    def bulk_new(self, objs):
+        """Add many objects and write them at once.
+        Every item is checked before any is added, the indexes are
+        updated in one pass, and the objects are written with a single
+        write whatever the flush policy.
+        Args:
+            objs (iterable): Model instances, or dictionaries like those
+                of to_dict(), whose "__class__" names the class to build;
+                missing ids and timestamps are generated.
+        Return:
+            The dictionary of the number of objects added, the seconds
+            taken and the resulting objects per second.
+        Raises:
+            TypeError: If an item is neither a model nor a dictionary.
+            ValueError: If a dictionary names no known class, or holds
+                an invalid timestamp.
+        """
+        start = time.perf_counter()
+        now = datetime.today().isoformat()
+        built = [instantiate(item, now) for item in objs]
+        with FileStorage.__lock:
+            batch = {}
+            for obj in built:
+                key = "{}.{}".format(obj.__class__.__name__, obj.id)
+                batch[key] = FileStorage.__objects[key] = obj
+                FileStorage.__dirty[key] = obj
+            self.__track_batch(batch)
+            self.__write_batch(len(batch))
+        return self.__report(len(batch), start)
+
+    def bulk_update(self, changes):
+        """Update many stored objects and write them at once.
+        Every change is checked to name a stored object and attributes
+        that can be set before any is applied, the indexes are updated in
+        one pass, and the objects are written with a single write
+        whatever the flush policy. Should setting an attribute still
+        fail, the objects changed so far are tracked and left to the
+        next save.
+        Args:
+            changes (iterable): Dictionaries holding the "__class__" and
+                "id" of a stored object and the attributes to set on it.
+        Return:
+            The dictionary of the number of objects updated, the seconds
+            taken and the resulting objects per second.
+        Raises:
+            ValueError: If a change names no known class, no stored
+                object or a read-only attribute.
+        """
+        start = time.perf_counter()
+        with FileStorage.__lock:
+            found = []
+            for change in changes:
+                key = "{}.{}".format(change.get("__class__"), change.get("id"))
+                obj = FileStorage.__objects.get(key)
+                if obj is None:
+                    raise ValueError("no instance found: {}".format(key))
+                for attr in change:
+                    if read_only(type(obj), attr):
+                        raise ValueError("read-only attribute: {}".format(
+                            attr))
+                found.append((key, obj, change))
+            now = datetime.today()
+            batch = {}
+            FileStorage.__muted = True
+            try:
+                for key, obj, change in found:
+                    batch[key] = FileStorage.__dirty[key] = obj
+                    for attr, value in change.items():
+                        if attr not in ("__class__", "id"):
+                            setattr(obj, attr, value)
+                    obj.updated_at = now
+            finally:
+                FileStorage.__muted = False
+                self.__track_batch(batch)
+            self.__write_batch(len(batch))
+        return self.__report(len(batch), start)
+
+    def __track_batch(self, batch):
+        """Update the buckets and indexes for the objects of batch.
+        A batch larger than a quarter of __objects makes the buckets and
+        indexes be rebuilt in a single pass when next used instead.
+        """
+        if len(batch) * 4 < len(FileStorage.__objects):
+            for key, obj in batch.items():
+                self.__track(key, obj)
+            return
+        FileStorage.__bucketed = FileStorage.__indexed = None
+        FileStorage.__joined = FileStorage.__inverted_for = None
+        FileStorage.__texted = FileStorage.__sorted_for = None
+        FileStorage.__columned = FileStorage.__gridded = None
+
+    def __write_batch(self, n):
+        """Write n changed objects, appending them to the journal or the
+        JSON Lines unless they would make it due for compaction anyway."""
+        if (self.journal or self.file_format == "jsonl") and \
+                self.__records + n < self.__limit():
+            self.__write()
+        else:
+            self.__pending = 0
+            self.compact()
+
+    def __report(self, n, start):
+        """Return the throughput of a bulk operation on n objects."""
+        seconds = time.perf_counter() - start
+        return {"objects": n, "seconds": seconds,
+                "per_second": n / seconds if seconds > 0 else inf}
+
+    def find(self, cls, **kwargs):
+        """Return the list of cls instances whose attributes equal kwargs.
+        Foreign-key attributes are looked up in hash indexes, whose
+        matches are returned in key order; without one, every instance
+        of cls is compared.
+        """
+        cls_name = self.__name(cls)
+        with FileStorage.__lock:
+            indexes = self.__hash_indexes().get(cls_name, {})
+            keys = None
+            for attr, value in kwargs.items():
+                if attr in indexes:
+                    found = indexes[attr].get(value)
+                    keys = set(found) if keys is None else keys & found
+            if keys is None:
+                keys = self.__class_buckets().get(cls_name, {})
+            else:
+                keys = sorted(keys)
+            objs = [FileStorage.__objects[key] for key in keys]
+        return [obj for obj in objs
+                if all(getattr(obj, attr, _MISSING) == value
+                       for attr, value in kwargs.items())]
+
+    def get(self, cls, id):
+        """Return the instance of cls with the given id, or None."""
+        return FileStorage.__objects.get("{}.{}".format(self.__name(cls), id))
+
+    def related(self, cls, attr, value):
+        """Return the list of cls instances whose foreign-key attribute
+        attr equals value, e.g. related(City, "state_id", state.id).
+        The keys of the list are cached until an object joins or leaves
+        it, so repeated traversals cost the size of the result.
+        Attributes without a hash index fall back to find().
+        """
+        cls_name = self.__name(cls)
+        join = (cls_name, attr, value)
+        with FileStorage.__lock:
+            index = self.__hash_indexes().get(cls_name, {}).get(attr)
+            if index is None or not isinstance(value, Hashable):
+                return self.find(cls_name, **{attr: value})
+            if FileStorage.__joined is not FileStorage.__objects:
+                FileStorage.__joins = {}
+                FileStorage.__joined = FileStorage.__objects
+            keys = FileStorage.__joins.get(join)
+            if keys is None:
+                keys = FileStorage.__joins[join] = sorted(index.get(value))
+            return [FileStorage.__objects[key] for key in keys]
+
+    def having(self, cls, **kwargs):
+        """Return the list of cls instances whose list attributes hold
+        every item of kwargs, e.g. having(Place, amenity_ids=[a, b]).
+        Attributes with an InvertedIndex are looked up there, and their
+        matches returned in key order; others are checked on every
+        instance of cls.
+        """
+        cls_name = self.__name(cls)
+        with FileStorage.__lock:
+            indexes = self.__inverted_indexes().get(cls_name, {})
+            keys = None
+            for attr, items in kwargs.items():
+                if attr in indexes and len(items) != 0:
+                    found = indexes[attr].get_all(items)
+                    keys = found if keys is None else keys & found
+            if keys is None:
+                keys = self.__class_buckets().get(cls_name, {})
+            else:
+                keys = sorted(keys)
+            objs = [FileStorage.__objects[key] for key in keys]
+        return [obj for obj in objs
+                if all(self.__holds(getattr(obj, attr, None), items)
+                       for attr, items in kwargs.items())]
+
+    def __holds(self, value, items):
+        """Return True if value is a list or tuple holding every item."""
+        return isinstance(value, (list, tuple)) and \
+            all(item in value for item in items)
+
+    def search(self, text, cls=None, limit=None, offset=0):
+        """Return the list of objects whose text attributes hold words of
+        text, best match first.
+        Args:
+            text (str): The words to look for.
+            cls (type or str): If set, only return instances of cls.
+            limit (int): The maximum number of objects to return.
+            offset (int): The number of best matches to skip.
+        """
+        prefix = None if cls is None else self.__name(cls) + "."
+        with FileStorage.__lock:
+            keys = [key for _, key in self.__text_index().search(text)
+                    if prefix is None or key.startswith(prefix)]
+            stop = None if limit is None else offset + limit
+            objs = [FileStorage.__objects.get(key)
+                    for key in keys[offset:stop]]
+        return [obj for obj in objs if obj is not None]
+
+    def query(self, cls=None):
+        """Return a Query over the objects of cls, or over all objects."""
+        return Query(self, cls)
+
+    def scan(self, cls, **ranges):
+        """Return the list of cls instances whose attributes lie in ranges.
+        Each keyword maps an attribute to its (low, high) bounds, both
+        inclusive, None leaving a side unbounded. When some attributes
+        have a SortedIndex, the candidates are looked up in the one
+        holding the fewest matches. Otherwise numeric class attributes are
+        filtered by a scan of their ColumnStore. Remaining attributes are
+        compared on every candidate.
+        """
+        cls_name = self.__name(cls)
+        with FileStorage.__lock:
+            indexes = self.__sorted_indexes().get(cls_name, {})
+            counts = {attr: indexes[attr].count(*bounds)
+                      for attr, bounds in ranges.items() if attr in indexes}
+            store = self.__column_stores().get(cls_name)
+            if len(counts) != 0:
+                attr = min(counts, key=counts.get)
+                keys = indexes[attr].range(*ranges[attr])
+                done = {attr}
+            else:
+                done = {attr for attr in ranges
+                        if store is not None and attr in store.attrs}
+                if len(done) != 0:
+                    keys = store.select({attr: ranges[attr] for attr in done})
+                else:
+                    keys = self.__class_buckets().get(cls_name, {})
+            objs = [FileStorage.__objects[key] for key in keys]
+        others = [(attr, -inf if low is None else low,
+                   inf if high is None else high)
+                  for attr, (low, high) in ranges.items()
+                  if attr not in done]
+        if len(others) == 0:
+            return objs
+        return [obj for obj in objs
+                if all(self.__within(getattr(obj, attr, None), low, high)
+                       for attr, low, high in others)]
+
+    def near(self, cls, lat, lon, km):
+        """Return the list of cls instances whose latitude and longitude
+        are within km kilometers of the point (lat, lon), nearest first.
+        """
+        with FileStorage.__lock:
+            grid = self.__spatial_grids().get(self.__name(cls))
+            if grid is None:
+                return []
+            return [FileStorage.__objects[key]
+                    for _, key in grid.near(lat, lon, km)]
+
+    def within(self, cls, south, west, north, east):
+        """Return the list of cls instances whose latitude and longitude
+        lie in the bounding box, edges included. A box with west greater
+        than east crosses the antimeridian.
+        """
+        with FileStorage.__lock:
+            grid = self.__spatial_grids().get(self.__name(cls))
+            if grid is None:
+                return []
+            return [FileStorage.__objects[key]
+                    for key in grid.box(south, west, north, east)]
+
+    def __within(self, value, low, high):
+        """Return True if value is a number between low and high."""
+        return type(value) in (int, float) and low <= value <= high
+
+    def __name(self, cls):
+        """Return the name of cls, which may already be a class name.
+        In sharded mode, the shards of a class left out of the classes
+        given to reload() are loaded first, so that it can be read.
+        """
+        cls_name = cls if type(cls) is str else cls.__name__
+        if self.__loaded is not None and cls_name not in self.__loaded:
+            with FileStorage.__lock:
+                self.__load_class(cls_name)
+        return cls_name
+
+    def __class_buckets(self):
+        """Return __buckets, building them if __objects was replaced or
+        reloaded since they were built."""
+        if FileStorage.__bucketed is not FileStorage.__objects:
+            FileStorage.__buckets = {}
+            FileStorage.__bucketed = FileStorage.__objects
+            for key, obj in dict.items(FileStorage.__objects):
+                self.__rebucket(key, obj)
+        return FileStorage.__buckets
+
+    def __rebucket(self, key, obj):
+        """Update the bucket of the class of key, obj is None when the
+        object was deleted."""
+        if FileStorage.__bucketed is not FileStorage.__objects:
+            return
+        cls_name = key.partition(".")[0]
+        bucket = FileStorage.__buckets.get(cls_name)
+        if obj is None:
+            if bucket is not None:
+                bucket.pop(key, None)
+            return
+        if bucket is None:
+            if type(FileStorage.__objects) is _LazyObjects:
+                bucket = _LazyObjects(parent=FileStorage.__objects)
+            else:
+                bucket = {}
+            FileStorage.__buckets[cls_name] = bucket
+        dict.__setitem__(bucket, key, obj)
+
+    def __track(self, key, obj):
+        """Update the buckets and indexes for the object under key.
+        obj is None when the object was deleted, or the stored dictionary
+        of an object not built yet.
+        """
+        self.__rebucket(key, obj)
+        self.__reindex(key, obj)
+        self.__reinvert(key, obj)
+        self.__retext(key, obj)
+        self.__resort(key, obj)
+        self.__recolumn(key, obj)
+        self.__regrid(key, obj)
+
+    def __hash_indexes(self):
+        """Return the foreign-key indexes of __objects, building them if
+        __objects was replaced or reloaded since they were built."""
+        if FileStorage.__indexed is not FileStorage.__objects:
+            FileStorage.__indexes = {}
+            FileStorage.__indexed = FileStorage.__objects
+            for key, obj in dict.items(FileStorage.__objects):
+                self.__reindex(key, obj)
+        return FileStorage.__indexes
+
+    def __reindex(self, key, obj):
+        """Update the foreign-key indexes for the object under key.
+        obj is None when the object was deleted, or the stored dictionary
+        of an object not built yet.
+        """
+        if FileStorage.__indexed is not FileStorage.__objects:
+            return
+        cls_name = key.partition(".")[0]
+        indexes = FileStorage.__indexes.get(cls_name)
+        if obj is None:
+            for attr, index in (indexes or {}).items():
+                self.__unjoin(cls_name, attr, index.value(key))
+                index.discard(key)
+            return
+        if indexes is None:
+            cls = classes[cls_name]
+            indexes = FileStorage.__indexes[cls_name] = {
+                attr: HashIndex(attr) for attr in FileStorage.__index_attrs
+                if hasattr(cls, attr)}
+        for attr, index in indexes.items():
+            if type(obj) is dict:
+                value = obj.get(attr, getattr(classes[cls_name], attr))
+            else:
+                value = getattr(obj, attr)
+            old = index.value(key, _MISSING)
+            if old is _MISSING or old != value:
+                self.__unjoin(cls_name, attr, old)
+                self.__unjoin(cls_name, attr, value)
+            index.add(key, value)
+
+    def __unjoin(self, cls_name, attr, value):
+        """Drop the cached related() objects of cls_name whose attr
+        equals value."""
+        if FileStorage.__joined is FileStorage.__objects and \
+                isinstance(value, Hashable):
+            FileStorage.__joins.pop((cls_name, attr, value), None)
+
+    def __inverted_indexes(self):
+        """Return the inverted indexes of __objects, building them if
+        __objects was replaced or reloaded since they were built."""
+        if FileStorage.__inverted_for is not FileStorage.__objects:
+            FileStorage.__inverted = {}
+            FileStorage.__inverted_for = FileStorage.__objects
+            for key, obj in dict.items(FileStorage.__objects):
+                self.__reinvert(key, obj)
+        return FileStorage.__inverted
+
+    def __reinvert(self, key, obj):
+        """Update the inverted indexes for the object under key.
+        obj is None when the object was deleted, or the stored dictionary
+        of an object not built yet.
+        """
+        if FileStorage.__inverted_for is not FileStorage.__objects:
+            return
+        cls_name = key.partition(".")[0]
+        indexes = FileStorage.__inverted.get(cls_name)
+        if obj is None:
+            for index in (indexes or {}).values():
+                index.discard(key)
+            return
+        if indexes is None:
+            cls = classes[cls_name]
+            indexes = FileStorage.__inverted[cls_name] = {
+                attr: InvertedIndex(attr) for attr in FileStorage.__list_attrs
+                if hasattr(cls, attr)}
+        for attr, index in indexes.items():
+            if type(obj) is dict:
+                index.add(key, obj.get(attr, ()))
+            else:
+                index.add(key, getattr(obj, attr, None))
+
+    def __text_index(self):
+        """Return the text index of __objects, building it if __objects
+        was replaced or reloaded since it was built."""
+        if FileStorage.__texted is not FileStorage.__objects:
+            FileStorage.__text = TextIndex()
+            FileStorage.__texted = FileStorage.__objects
+            for key, obj in dict.items(FileStorage.__objects):
+                self.__retext(key, obj)
+        return FileStorage.__text
+
+    def __retext(self, key, obj):
+        """Update the text index for the object under key.
+        obj is None when the object was deleted, or the stored dictionary
+        of an object not built yet.
+        """
+        if FileStorage.__texted is not FileStorage.__objects:
+            return
+        if obj is None:
+            FileStorage.__text.discard(key)
+            return
+        cls = classes[key.partition(".")[0]]
+        attrs = [attr for attr in FileStorage.__text_attrs
+                 if hasattr(cls, attr)]
+        if len(attrs) == 0:
+            return
+        if type(obj) is dict:
+            values = [obj.get(attr, getattr(cls, attr)) for attr in attrs]
+        else:
+            values = [getattr(obj, attr, None) for attr in attrs]
+        FileStorage.__text.add(key, " ".join(value for value in values
+                                             if type(value) is str))
+
+    def __save_text(self):
+        """Write the text index if it was built for __objects, every
+        object is loaded and no change is left unsaved."""
+        if FileStorage.__texted is not FileStorage.__objects or \
+                len(FileStorage.__dirty) != 0 or not self.__fully_loaded():
+            return
+        self.__write_text()
+
+    def __write_text(self):
+        """Write the text index to __file_path + ".text" along with the
+        size and modification time of the files it was built from."""
+        self.__replace(self.__text_path(), '{{"files": {}, "docs": {}}}'
+                       .format(json.dumps(self.__fingerprint()),
+                               FileStorage.__text.dumps()))
+
+    def __load_text(self):
+        """Use the text index saved last if the files it was built
+        from did not change since."""
+        if not self.__fully_loaded():
+            return
+        try:
+            with open(self.__text_path()) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if saved.get("files") != self.__fingerprint():
+            return
+        FileStorage.__text = TextIndex(saved["docs"])
+        FileStorage.__texted = FileStorage.__objects
+
+    def __fully_loaded(self):
+        """Return False if reload() left out the shards of some class."""
+        return self.__loaded is None or self.__loaded.issuperset(
+            shard.split(".")[0] for shard in self.__shard_paths())
+
+    def __fingerprint(self):
+        """Return the path, size and modification time of the files
+        holding the objects."""
+        paths = [FileStorage.__file_path]
+        if self.sharded:
+            paths.extend(sorted(self.__shard_paths().values()))
+        found = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            found.append([path, st.st_size, st.st_mtime_ns])
+        return found
+
+    def __text_path(self):
+        """Return the path of the saved text index for __file_path."""
+        return FileStorage.__file_path + ".text"
+
+    def __sorted_indexes(self):
+        """Return the sorted indexes of __objects, building them if
+        __objects was replaced or reloaded since they were built."""
+        if FileStorage.__sorted_for is not FileStorage.__objects:
+            FileStorage.__sorted = {}
+            FileStorage.__sorted_for = FileStorage.__objects
+            pending = {}
+            for key, obj in dict.items(FileStorage.__objects):
+                self.__resort(key, obj, pending)
+            for index, items in pending.items():
+                index.add_many(items)
+        return FileStorage.__sorted
+
+    def __resort(self, key, obj, pending=None):
+        """Update the sorted indexes for the object under key.
+        obj is None when the object was deleted, or the stored dictionary
+        of an object not built yet. If pending is set, the values are
+        collected there by index, to be added all at once.
+        """
+        if FileStorage.__sorted_for is not FileStorage.__objects:
+            return
+        cls_name = key.partition(".")[0]
+        indexes = FileStorage.__sorted.get(cls_name)
+        if obj is None:
+            for index in (indexes or {}).values():
+                index.discard(key)
+            return
+        if indexes is None:
+            cls = classes[cls_name]
+            indexes = FileStorage.__sorted[cls_name] = {
+                attr: SortedIndex(attr) for attr in FileStorage.__range_attrs
+                if hasattr(cls, attr)}
+        for attr, index in indexes.items():
+            if type(obj) is dict:
+                value = obj.get(attr, getattr(classes[cls_name], attr))
+            else:
+                value = getattr(obj, attr, None)
+            if pending is None:
+                index.add(key, value)
+            else:
+                pending.setdefault(index, []).append((key, value))
+
+    def __column_stores(self):
+        """Return the column stores of __objects, building them if
+        __objects was replaced or reloaded since they were built."""
+        if FileStorage.__columned is not FileStorage.__objects:
+            FileStorage.__columns = {}
+            FileStorage.__columned = FileStorage.__objects
+            pending = {}
+            for key, obj in dict.items(FileStorage.__objects):
+                self.__recolumn(key, obj, pending)
+            for store, items in pending.items():
+                store.add_many(items)
+        return FileStorage.__columns
+
+    def __recolumn(self, key, obj, pending=None):
+        """Update the column store for the object under key.
+        obj is None when the object was deleted, or the stored dictionary
+        of an object not built yet. If pending is set, the values are
+        collected there by store, to be added all at once.
+        """
+        if FileStorage.__columned is not FileStorage.__objects:
+            return
+        cls_name = key.partition(".")[0]
+        store = FileStorage.__columns.get(cls_name, _MISSING)
+        if store is _MISSING:
+            cls = classes[cls_name]
+            attrs = [k for k in vars(cls) if not k.startswith("_") and
+                     type(getattr(cls, k)) in (int, float)]
+            store = FileStorage.__columns[cls_name] = \
+                ColumnStore(attrs) if len(attrs) != 0 else None
+        if store is None:
+            return
+        if obj is None:
+            store.discard(key)
+            return
+        if type(obj) is dict:
+            cls = classes[cls_name]
+            values = {attr: obj.get(attr, getattr(cls, attr))
+                      for attr in store.attrs}
+        else:
+            values = {attr: getattr(obj, attr, None) for attr in store.attrs}
+        if pending is None:
+            store.add(key, values)
+        else:
+            pending.setdefault(store, []).append((key, values))
+
+    def __spatial_grids(self):
+        """Return the spatial indexes of __objects, building them if
+        __objects was replaced or reloaded since they were built."""
+        if FileStorage.__gridded is not FileStorage.__objects:
+            FileStorage.__grids = {}
+            FileStorage.__gridded = FileStorage.__objects
+            for key, obj in dict.items(FileStorage.__objects):
+                self.__regrid(key, obj)
+        return FileStorage.__grids
+
+    def __regrid(self, key, obj):
+        """Update the spatial index for the object under key.
+        obj is None when the object was deleted, or the stored dictionary
+        of an object not built yet.
+        """
+        if FileStorage.__gridded is not FileStorage.__objects:
+            return
+        cls_name = key.partition(".")[0]
+        grid = FileStorage.__grids.get(cls_name, _MISSING)
+        if grid is _MISSING:
+            cls = classes[cls_name]
+            grid = FileStorage.__grids[cls_name] = GridIndex() \
+                if hasattr(cls, "latitude") and hasattr(cls, "longitude") \
+                else None
+        if grid is None:
+            return
+        if obj is None:
+            grid.discard(key)
+        elif type(obj) is dict:
+            cls = classes[cls_name]
+            grid.add(key, obj.get("latitude", cls.latitude),
+                     obj.get("longitude", cls.longitude))
+        else:
+            grid.add(key, getattr(obj, "latitude", None),
+                     getattr(obj, "longitude", None))
 
     def save(self):
-        """Serialize __objects to the JSON file __file_path."""
-        odict = FileStorage.__objects
-        objdict = {obj: odict[obj].to_dict() for obj in odict.keys()}
-        with open(FileStorage.__file_path, "w") as f:
-            json.dump(objdict, f)
-
-    def reload(self):
-        """Deserialize the JSON file __file_path to __objects, if it exists"""
+        """Serialize __objects to the JSON file __file_path.
+        With a flush policy, saves are only counted here and written
+        together by flush().
+        """
+        if self.flush_interval is None and self.flush_every is None:
+            self.__write()
+            return
+        with FileStorage.__lock:
+            self.__pending += 1
+            due = (self.flush_every is not None and
+                   self.__pending >= self.flush_every)
+        if due:
+            self.flush()
+        elif self.flush_interval is not None and self.__flusher is None:
+            self.__flusher = threading.Thread(target=self.__run, daemon=True)
+            self.__flusher.start()
+
+    def flush(self):
+        """Write the saves still pending under the flush policy, and the
+        text index along with them."""
+        with FileStorage.__lock:
+            if self.__pending != 0:
+                self.__write()
+                self.__save_text()
+
+    def __close(self):
+        """Flush pending saves and write the text index on exit."""
+        self.flush()
+        with FileStorage.__lock:
+            self.__save_text()
+
+    def __run(self):
+        """Flush pending saves every flush_interval milliseconds.
+        A failed flush is tried again at the next interval, and reported
+        unless the previous one failed too.
+        """
+        failing = False
+        while True:
+            time.sleep(self.flush_interval / 1000)
+            try:
+                self.flush()
+            except Exception:
+                with FileStorage.__lock:
+                    self.__pending = max(self.__pending, 1)
+                if not failing:
+                    traceback.print_exc()
+                failing = True
+            else:
+                failing = False
+
+    def __write(self):
+        """Write the changes to the journal or the whole of __objects.
+        In journal mode only the changes since the last write are appended
+        to the log, which is compacted once it holds compact_every records.
+        In the jsonl format they are appended to __file_path itself, once
+        it is known to hold __objects, until it holds more appended
+        records than objects.
+        """
+        with FileStorage.__lock:
+            self.__pending = 0
+            if self.file_format == "jsonl":
+                if self.__lined is not FileStorage.__objects:
+                    self.compact()
+                    return
+                path = FileStorage.__file_path
+            elif not self.journal:
+                self.__compact()
+                return
+            else:
+                path = self.__log_path()
+            odict = FileStorage.__objects
+            lines = []
+            for key, obj in self.__flush_dirty().items():
+                if obj is None:
+                    lines.append(json.dumps([key, None]))
+                elif odict.get(key) is obj:
+                    lines.append("[{}, {}]".format(json.dumps(key),
+                                                   self.__encode(key, obj)))
+            if len(lines) == 0:
+                return
+            with open(path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+                if self.durability != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+            self.__records += len(lines)
+            if self.__records >= self.__limit():
+                self.compact()
+
+    def __limit(self):
+        """Return the number of records appended to the journal, or to
+        __file_path in the jsonl format, after which it is compacted."""
+        if self.file_format == "jsonl":
+            return max(self.compact_every, len(FileStorage.__objects))
+        return self.compact_every
+
+    def compact(self):
+        """Write every object to __file_path and discard the journal.
+        The snapshot is written before the log is removed; replaying a
+        stale log over a newer snapshot yields the same objects.
+        The snapshot itself is written to a temporary file that replaces
+        __file_path once complete, so readers never see a partial file.
+        In sharded mode only the shards holding changes are written.
+        In the jsonl format every object is written on its own line.
+        The text index built by search() is written too; saves that
+        rewrite __file_path without a journal leave it to flush() and
+        exit.
+        """
+        with FileStorage.__lock:
+            self.__compact()
+            self.__save_text()
+
+    def __compact(self):
+        """Write every object to __file_path and discard the journal, as
+        compact() does, without writing the text index."""
+        with FileStorage.__lock:
+            self.__flush_dirty()
+            if self.sharded:
+                self.__write_shards()
+            elif self.file_format == "jsonl":
+                lines = ["[{}, {}]\n".format(json.dumps(key),
+                                             self.__encode(key, obj))
+                         for key, obj in dict.items(FileStorage.__objects)]
+                self.__replace(FileStorage.__file_path, "".join(lines))
+                self.__lined = FileStorage.__objects
+            elif self.file_format == "binary":
+                self.__replace(FileStorage.__file_path, self.__pack())
+            else:
+                items = ["{}: {}".format(json.dumps(key),
+                                         self.__encode(key, obj))
+                         for key, obj in dict.items(FileStorage.__objects)]
+                self.__replace(FileStorage.__file_path,
+                               "{" + ", ".join(items) + "}")
+            self.__records = 0
+            try:
+                os.remove(self.__log_path())
+            except FileNotFoundError:
+                pass
+
+    def __write_shards(self):
+        """Write the stale shards, or all of them if __stale is None."""
+        stale = self.__stale
+        if stale is not None:
+            for cls_name in {shard.split(".")[0] for shard in stale}:
+                self.__load_class(cls_name)
+        buckets = self.__class_buckets()
+        if stale is None:
+            names = list(buckets)
+        else:
+            names = {shard.split(".")[0] for shard in stale}
+        groups = {}
+        for cls_name in names:
+            for key, obj in dict.items(buckets.get(cls_name, {})):
+                shard = self.__shard(key)
+                if stale is None or shard in stale:
+                    groups.setdefault(shard, []).append("{}: {}".format(
+                        json.dumps(key), self.__encode(key, obj)))
+        if stale is None:
+            stale = set(groups).union(self.__shard_paths())
+        for shard in stale:
+            if shard in groups:
+                self.__replace(self.__shard_path(shard),
+                               "{" + ", ".join(groups[shard]) + "}")
+            else:
+                try:
+                    os.remove(self.__shard_path(shard))
+                except FileNotFoundError:
+                    pass
+        if self.__stale is None:
+            try:
+                os.remove(FileStorage.__file_path)
+            except FileNotFoundError:
+                pass
+        self.__stale = set()
+
+    def reload(self, *, classes=None):
+        """Deserialize the JSON file __file_path to __objects, if it exists
+        and replay the journal written since the last compaction.
+        Args:
+            classes (iterable): In sharded mode, the names of the only
+                classes to load. Other classes are loaded when they are
+                first read by class or saved.
+        """
+        fresh = len(FileStorage.__objects) == 0
+        if self.lazy and type(FileStorage.__objects) is dict:
+            FileStorage.__objects = _LazyObjects(FileStorage.__objects)
+        if not self.sharded:
+            self.__load_file(FileStorage.__file_path)
+        elif os.path.exists(FileStorage.__file_path):
+            self.__load_file(FileStorage.__file_path)
+            self.__stale = self.__loaded = None
+        else:
+            shards = self.__shard_paths()
+            if classes is None:
+                classes = {shard.split(".")[0] for shard in shards}
+            self.__stale, self.__loaded = set(), set()
+            for cls_name in classes:
+                self.__load_class(cls_name)
+        if fresh and FileStorage.__texted is not FileStorage.__objects:
+            self.__load_text()
+        lined = self.file_format == "jsonl" and fresh and self.__lined is True
+        records = self.__records
+        self.__replay()
+        if lined and self.__records == 0:
+            self.__lined, self.__records = FileStorage.__objects, records
+        else:
+            self.__lined = None
+        FileStorage.__dirty = {}
+        FileStorage.__cache = {}
+        FileStorage.__cached = FileStorage.__objects
+        FileStorage.__packed = {}
+
+    def __load_file(self, path):
+        """Set in __objects every object stored in the file path, which
+        holds either one JSON object, JSON Lines or the binary format.
+        Sets __lined to True if the objects can be appended to path, and
+        __records to the number of its lines superseded by later ones."""
+        self.__lined, self.__records = True, 0
         try:
-            with open(FileStorage.__file_path) as f:
-                objdict = json.load(f)
-                for o in objdict.values():
-                    cls_name = o["__class__"]
-                    del o["__class__"]
-                    self.new(eval(cls_name)(**o))
+            raw = open(path, "rb")
         except FileNotFoundError:
             return
+        with raw:
+            if binary.is_binary(raw.read(len(binary.MAGIC))):
+                self.__lined = False
+                raw.seek(0)
+                self.__load_binary(raw.read())
+                return
+            raw.seek(0)
+            f = io.TextIOWrapper(raw)
+            first = f.read(64).lstrip()[:1]
+            f.seek(0)
+            if first == "[":
+                self.__load_lines(f)
+            else:
+                self.__lined = first == ""
+                for key, o in _iter_json_object(f):
+                    self.__load(key, o)
+
+    def __load_binary(self, data):
+        """Set in __objects every object of the binary file data.
+        The cyclic garbage collector is paused meanwhile: the columns of
+        the file are held until its objects are built, which otherwise
+        makes it traverse them, and every object loaded so far, many
+        times over without finding any cycle.
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for key, o in binary.load(data):
+                self.__load(key, o)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def __load_lines(self, f):
+        """Apply the [key, object] arrays of the JSON Lines of f.
+        An invalid line, such as one torn by an interrupted append, ends
+        the reading. It, or a last line missing its newline, sets __lined
+        to False so the next write rewrites the file.
+        """
+        decode = json.JSONDecoder().raw_decode
+        n = 0
+        for line in f:
+            try:
+                (key, o), end = decode(line)
+                if line[end:].strip() != "" or type(key) is not str or \
+                        type(o) not in (dict, type(None)):
+                    raise ValueError
+            except (ValueError, TypeError):
+                self.__lined = False
+                break
+            if not line.endswith("\n"):
+                self.__lined = False  # an append would extend this line
+            n += 1
+            if o is None:
+                dict.pop(FileStorage.__objects, key, None)
+                self.__track(key, None)
+            else:
+                self.__load(key, o)
+        self.__records = max(0, n - len(FileStorage.__objects))
+
+    def __load_class(self, cls_name):
+        """Load the shards of cls_name unless they were loaded already.
+        Objects already in __objects are kept as they are.
+        """
+        if self.__loaded is None or cls_name in self.__loaded:
+            return
+        self.__loaded.add(cls_name)
+        objs = FileStorage.__objects
+        for shard, path in self.__shard_paths().items():
+            if shard.split(".")[0] != cls_name:
+                continue
+            with open(path) as f:
+                for key, o in _iter_json_object(f):
+                    if key not in objs:
+                        self.__load(key, o)
+
+    def __shard(self, key):
+        """Return the name of the shard holding key."""
+        cls_name, _, oid = key.partition(".")
+        if self.shard_prefix:
+            return "{}.{}".format(cls_name, oid[:self.shard_prefix])
+        return cls_name
+
+    def __shard_path(self, shard):
+        """Return the path of the file of shard."""
+        root, ext = os.path.splitext(FileStorage.__file_path)
+        return "{}.{}{}".format(root, shard, ext)
+
+    def __shard_paths(self):
+        """Return the dictionary of the shard files found on disk."""
+        root, ext = os.path.splitext(FileStorage.__file_path)
+        dirname, base = os.path.split(root)
+        pattern = re.compile(r"{}\.(\w+(?:\.[\w-]+)?){}$".format(
+            re.escape(base), re.escape(ext)))
+        paths = {}
+        for name in os.listdir(dirname or "."):
+            match = pattern.match(name)
+            if match is not None:
+                paths[match.group(1)] = os.path.join(dirname, name)
+        return paths
+
+    def __replay(self):
+        """Apply the records of the journal to __objects."""
+        self.__records = 0
+        try:
+            f = open(self.__log_path())
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    key, o = json.loads(line)
+                except ValueError:
+                    break  # torn record left by an interrupted append
+                self.__records += 1
+                if self.sharded and self.__stale is not None:
+                    self.__load_class(key.partition(".")[0])
+                    self.__stale.add(self.__shard(key))
+                if o is None:
+                    dict.pop(FileStorage.__objects, key, None)
+                    self.__track(key, None)
+                else:
+                    self.__load(key, o)
+
+    def __load(self, key, o):
+        """Set in __objects the object stored as the dictionary o."""
+        if self.lazy:
+            dict.__setitem__(FileStorage.__objects, key, o)
+        else:
+            o = classes[o["__class__"]].from_dict(o)
+            FileStorage.__objects[key] = o
+        self.__track(key, o)
+
+    def __flush_dirty(self):
+        """Forget the cached JSON of changed keys and reset __dirty.
+        Return the changes that were pending.
+        """
+        if FileStorage.__cached is not FileStorage.__objects:
+            FileStorage.__cache = {}
+            FileStorage.__cached = FileStorage.__objects
+            FileStorage.__packed = {}
+            self.__stale = None
+        cache, packed = FileStorage.__cache, FileStorage.__packed
+        dirty = FileStorage.__dirty
+        for key in dirty:
+            cache.pop(key, None)
+            packed.pop(key, None)
+            if self.__stale is not None:
+                self.__stale.add(self.__shard(key))
+        FileStorage.__dirty = {}
+        return dirty
+
+    def __encode(self, key, obj):
+        """Return the JSON text of obj, serializing it only if it changed.
+        obj may also be the stored dictionary of an object not built yet.
+        """
+        text = FileStorage.__cache.get(key)
+        if text is None:
+            if type(obj) is not dict:
+                obj = obj.to_dict()
+            text = FileStorage.__cache[key] = json.dumps(obj)
+        return text
+
+    def __pack(self):
+        """Return the binary file of __objects, converting to rows only
+        the objects that changed since the last one written with the same
+        schema."""
+        packer = binary.Packer(classes)
+        if FileStorage.__packer is None or \
+                FileStorage.__packer.header != packer.header:
+            FileStorage.__packed, FileStorage.__packer = {}, packer
+        packer, packed = FileStorage.__packer, FileStorage.__packed
+        rows = []
+        for key, obj in dict.items(FileStorage.__objects):
+            row = packed.get(key)
+            if row is None:
+                row = packed[key] = packer.row(
+                    obj if type(obj) is dict else obj.to_dict())
+            rows.append(row)
+        return packer.dump(rows)
+
+    def __replace(self, path, text):
+        """Atomically replace the content of path with text, a string or
+        bytes."""
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp, "wb" if type(text) is bytes else "w") as f:
+                f.write(text)
+                if self.durability != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        if self.durability == "dir":
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def __log_path(self):
+        """Return the path of the journal for __file_path."""
+        return FileStorage.__file_path + ".log"
@@ -0,0 +1,588 @@
+#!/usr/bin/python3
+"""Defines the in-memory indexes maintained by the storage engines."""
+from array import array
+from bisect import bisect_left, bisect_right
+from math import asin, cos, floor, inf, isfinite, log, nan, radians, sin, \
+    sqrt
+import json
+import re
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class HashIndex:
+    """Represent an index from the values of one attribute to the keys
+    of the objects holding them.
+    Attributes:
+        attr (str): The name of the indexed attribute.
+    """
+
+    def __init__(self, attr):
+        """Initialize a new HashIndex.
+        Args:
+            attr (str): The name of the indexed attribute.
+        """
+        self.attr = attr
+        self.__keys = {}
+        self.__values = {}
+
+    def add(self, key, value):
+        """Index key under value, moving it if it had another value.
+        Unhashable values are not indexed.
+        """
+        if key in self.__values:
+            if self.__values[key] == value:
+                return
+            self.discard(key)
+        try:
+            self.__keys.setdefault(value, set()).add(key)
+        except TypeError:
+            return
+        self.__values[key] = value
+
+    def discard(self, key):
+        """Remove key from the index if it is inside."""
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        keys = self.__keys[value]
+        keys.discard(key)
+        if len(keys) == 0:
+            del self.__keys[value]
+
+    def value(self, key, default=None):
+        """Return the value key is indexed under, or default."""
+        return self.__values.get(key, default)
+
+    def get(self, value):
+        """Return the set of keys indexed under value."""
+        try:
+            return self.__keys.get(value, set())
+        except TypeError:
+            return set()
+
+    def __len__(self):
+        """Return the number of indexed keys."""
+        return len(self.__values)
+
+
+class InvertedIndex:
+    """Represent an index from the items of a list attribute to the keys
+    of the objects whose list holds them.
+    Attributes:
+        attr (str): The name of the indexed attribute.
+    """
+
+    def __init__(self, attr):
+        """Initialize a new InvertedIndex.
+        Args:
+            attr (str): The name of the indexed attribute.
+        """
+        self.attr = attr
+        self.__keys = {}
+        self.__items = {}
+
+    def add(self, key, items):
+        """Index key under each of items, a list or tuple, moving it from
+        the items it no longer holds. Unhashable items are not indexed,
+        and a value that is not a list or tuple holds no items.
+        """
+        new = set()
+        if isinstance(items, (list, tuple)):
+            for item in items:
+                try:
+                    new.add(item)
+                except TypeError:
+                    pass
+        old = self.__items.get(key, frozenset())
+        if new == old:
+            return
+        for item in old - new:
+            keys = self.__keys[item]
+            keys.discard(key)
+            if len(keys) == 0:
+                del self.__keys[item]
+        for item in new - old:
+            self.__keys.setdefault(item, set()).add(key)
+        if len(new) != 0:
+            self.__items[key] = frozenset(new)
+        else:
+            self.__items.pop(key, None)
+
+    def discard(self, key):
+        """Remove key from the index if it is inside."""
+        self.add(key, ())
+
+    def get(self, item):
+        """Return the set of keys indexed under item."""
+        try:
+            return self.__keys.get(item, set())
+        except TypeError:
+            return set()
+
+    def get_all(self, items):
+        """Return the set of keys indexed under every one of items,
+        intersecting the smallest sets first."""
+        sets = sorted((self.get(item) for item in items), key=len)
+        if len(sets) == 0:
+            return set()
+        keys = set(sets[0])
+        for other in sets[1:]:
+            if len(keys) == 0:
+                break
+            keys &= other
+        return keys
+
+    def __len__(self):
+        """Return the number of keys holding at least one item."""
+        return len(self.__items)
+
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Return the list of the lowercase words of text."""
+    return _WORD.findall(text.lower())
+
+
+class TextIndex:
+    """Represent a full-text index from the words of documents to the
+    keys of the objects holding them, ranking matches with BM25.
+    Attributes:
+        k1 (float): The BM25 term frequency saturation.
+        b (float): The BM25 document length normalization.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, docs=None):
+        """Initialize a new TextIndex.
+        Args:
+            docs (dict): The words of each key, mapped to their number of
+                occurrences, as returned by docs().
+        """
+        self.__postings = {}
+        self.__docs = {}
+        self.__lengths = {}
+        self.__total = 0
+        self.__json = {}
+        for key, counts in (docs or {}).items():
+            self.__insert(key, counts)
+
+    def add(self, key, text):
+        """Index the words of text under key, replacing its former words.
+        A text that is not a string holds no words."""
+        counts = {}
+        if type(text) is str:
+            for word in tokenize(text):
+                counts[word] = counts.get(word, 0) + 1
+        if self.__docs.get(key, {}) == counts:
+            return
+        self.discard(key)
+        if len(counts) != 0:
+            self.__insert(key, counts)
+
+    def discard(self, key):
+        """Remove key from the index if it is inside."""
+        counts = self.__docs.pop(key, None)
+        if counts is None:
+            return
+        for word in counts:
+            keys = self.__postings[word]
+            del keys[key]
+            if len(keys) == 0:
+                del self.__postings[word]
+        self.__total -= self.__lengths.pop(key)
+        self.__json.pop(key, None)
+
+    def search(self, text):
+        """Return the list of (score, key) pairs of the keys holding any
+        word of text, best first."""
+        n = len(self.__docs)
+        if n == 0:
+            return []
+        average = self.__total / n
+        scores = {}
+        for word in set(tokenize(text)):
+            keys = self.__postings.get(word)
+            if keys is None:
+                continue
+            idf = log(1 + (n - len(keys) + 0.5) / (len(keys) + 0.5))
+            for key, count in keys.items():
+                norm = 1 - self.b + self.b * self.__lengths[key] / average
+                scores[key] = scores.get(key, 0) + idf * count * \
+                    (self.k1 + 1) / (count + self.k1 * norm)
+        return sorted(((score, key) for key, score in scores.items()),
+                      key=lambda pair: (-pair[0], pair[1]))
+
+    def docs(self):
+        """Return the dictionary of the words of each key."""
+        return self.__docs
+
+    def dumps(self):
+        """Return the JSON text of docs(), only serializing the documents
+        changed since the last call."""
+        items = []
+        for key, counts in self.__docs.items():
+            text = self.__json.get(key)
+            if text is None:
+                text = self.__json[key] = "{}: {}".format(json.dumps(key),
+                                                          json.dumps(counts))
+            items.append(text)
+        return "{" + ", ".join(items) + "}"
+
+    def __insert(self, key, counts):
+        """Index key under the words of counts."""
+        self.__docs[key] = counts
+        for word, count in counts.items():
+            self.__postings.setdefault(word, {})[key] = count
+        length = sum(counts.values())
+        self.__lengths[key] = length
+        self.__total += length
+
+    def __len__(self):
+        """Return the number of indexed keys."""
+        return len(self.__docs)
+
+
+class SortedIndex:
+    """Represent an index of the keys of objects sorted by the numeric
+    value of one attribute, answering range lookups in O(log n + k).
+    Entries are ordered by value, then by key so every key has one
+    position, and split into blocks of about load entries, each a
+    sorted list of values with a parallel list of keys. Updates only
+    shift the entries of one block.
+    Attributes:
+        attr (str): The name of the indexed attribute.
+        load (int): The number of entries of a block.
+    """
+
+    def __init__(self, attr, load=1000):
+        """Initialize a new SortedIndex.
+        Args:
+            attr (str): The name of the indexed attribute.
+            load (int): The number of entries of a block.
+        """
+        self.attr = attr
+        self.load = load
+        self.__values = []
+        self.__keys = []
+        self.__maxes = []
+        self.__of = {}
+
+    def add(self, key, value):
+        """Index key under value, moving it if it had another value.
+        Values that are not numbers are not indexed.
+        """
+        if key in self.__of:
+            if self.__of[key] == value and type(value) in (int, float):
+                return
+            self.discard(key)
+        if type(value) not in (int, float) or value != value:
+            return
+        self.__of[key] = value
+        if len(self.__maxes) == 0:
+            self.__values.append([value])
+            self.__keys.append([key])
+            self.__maxes.append((value, key))
+            return
+        b = min(bisect_left(self.__maxes, (value, key)), len(self.__maxes) - 1)
+        values, keys = self.__values[b], self.__keys[b]
+        i = self.__position(values, keys, key, value)
+        values.insert(i, value)
+        keys.insert(i, key)
+        self.__maxes[b] = (values[-1], keys[-1])
+        if len(values) > 2 * self.load:
+            self.__values[b:b + 1] = [values[:self.load],
+                                      values[self.load:]]
+            self.__keys[b:b + 1] = [keys[:self.load], keys[self.load:]]
+            self.__maxes[b:b + 1] = [(values[self.load - 1],
+                                      keys[self.load - 1]), self.__maxes[b]]
+
+    def add_many(self, items):
+        """Index every (key, value) pair of items with a single sort.
+        Keys already inside are moved.
+        """
+        of = self.__of
+        for key, value in items:
+            if type(value) in (int, float) and value == value:
+                of[key] = value
+            else:
+                of.pop(key, None)
+        pairs = sorted((value, key) for key, value in of.items())
+        blocks = [pairs[i:i + self.load]
+                  for i in range(0, len(pairs), self.load)]
+        self.__values = [[value for value, _ in block] for block in blocks]
+        self.__keys = [[key for _, key in block] for block in blocks]
+        self.__maxes = [block[-1] for block in blocks]
+
+    def discard(self, key):
+        """Remove key from the index if it is inside."""
+        if key not in self.__of:
+            return
+        value = self.__of.pop(key)
+        b = bisect_left(self.__maxes, (value, key))
+        values, keys = self.__values[b], self.__keys[b]
+        i = self.__position(values, keys, key, value)
+        del values[i]
+        del keys[i]
+        if len(values) == 0:
+            del self.__values[b]
+            del self.__keys[b]
+            del self.__maxes[b]
+        else:
+            self.__maxes[b] = (values[-1], keys[-1])
+
+    def range(self, low=None, high=None):
+        """Return the list of keys whose value lies between low and high,
+        both inclusive, in ascending order of value. A bound of None is
+        unbounded."""
+        found = []
+        for keys, start, stop in self.__spans(low, high):
+            found.extend(keys[start:stop])
+        return found
+
+    def count(self, low=None, high=None):
+        """Return the number of keys whose value lies between low and
+        high."""
+        return sum(max(0, stop - start)
+                   for _, start, stop in self.__spans(low, high))
+
+    def __spans(self, low, high):
+        """Yield the (keys, start, stop) slices of the blocks holding the
+        values between low and high."""
+        b = 0 if low is None else bisect_left(self.__maxes, (low,))
+        while b < len(self.__maxes):
+            values = self.__values[b]
+            start = 0 if low is None else bisect_left(values, low)
+            stop = len(values) if high is None else \
+                bisect_right(values, high)
+            yield self.__keys[b], start, stop
+            if stop < len(values):
+                return
+            b += 1
+
+    def __position(self, values, keys, key, value):
+        """Return the position of key with value in a block."""
+        lo = bisect_left(values, value)
+        hi = bisect_right(values, value, lo)
+        return bisect_left(keys, key, lo, hi)
+
+    def __len__(self):
+        """Return the number of indexed keys."""
+        return len(self.__of)
+
+
+EARTH_RADIUS = 6371.0088  # mean radius in kilometers
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """Return the great-circle distance in kilometers between two points
+    given by their latitude and longitude in degrees."""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + \
+        cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(min(1, sqrt(a)))
+
+
+class GridIndex:
+    """Represent a spatial index of points given by their latitude and
+    longitude, bucketing keys by the cell of a grid of cell_size degrees
+    that holds their point. Queries only look at the cells overlapping
+    the searched area.
+    Attributes:
+        cell_size (float): The side of a cell in degrees.
+    """
+
+    def __init__(self, cell_size=0.1):
+        """Initialize a new GridIndex.
+        Args:
+            cell_size (float): The side of a cell in degrees.
+        """
+        self.cell_size = cell_size
+        self.__cells = {}
+        self.__points = {}
+
+    def add(self, key, lat, lon):
+        """Index key at the point (lat, lon), moving it if it was indexed
+        elsewhere. Keys whose coordinates are not finite numbers are
+        removed."""
+        self.discard(key)
+        if type(lat) not in (int, float) or type(lon) not in (int, float):
+            return
+        if not isfinite(lat) or not isfinite(lon):
+            return
+        cell = (floor(lat / self.cell_size), floor(lon / self.cell_size))
+        self.__cells.setdefault(cell, set()).add(key)
+        self.__points[key] = (lat, lon, cell)
+
+    def discard(self, key):
+        """Remove key from the index if it is inside."""
+        point = self.__points.pop(key, None)
+        if point is None:
+            return
+        keys = self.__cells[point[2]]
+        keys.discard(key)
+        if len(keys) == 0:
+            del self.__cells[point[2]]
+
+    def box(self, south, west, north, east):
+        """Return the list of keys inside the bounding box, edges included.
+        A box with west greater than east crosses the antimeridian, and
+        a box with an edge that is not finite holds no key.
+        """
+        if not all(isfinite(edge) for edge in (south, west, north, east)):
+            return []
+        if west > east:
+            return self.box(south, west, north, 180) + \
+                self.box(south, -180, north, east)
+        rows = range(floor(south / self.cell_size),
+                     floor(north / self.cell_size) + 1)
+        cols = range(floor(west / self.cell_size),
+                     floor(east / self.cell_size) + 1)
+        if len(rows) * len(cols) > len(self.__cells):
+            cells = [keys for (row, col), keys in self.__cells.items()
+                     if row in rows and col in cols]
+        else:
+            cells = [self.__cells[(row, col)] for row in rows for col in cols
+                     if (row, col) in self.__cells]
+        found = []
+        for keys in cells:
+            for key in keys:
+                lat, lon, _ = self.__points[key]
+                if south <= lat <= north and west <= lon <= east:
+                    found.append(key)
+        return found
+
+    def near(self, lat, lon, km):
+        """Return the list of (distance, key) pairs of the keys within km
+        kilometers of the point (lat, lon), nearest first."""
+        dlat = km / (EARTH_RADIUS * radians(1))
+        south, north = lat - dlat, lat + dlat
+        if south <= -90 or north >= 90:
+            west, east = -180, 180
+        else:
+            dlon = dlat / cos(radians(max(abs(south), abs(north))))
+            if dlon >= 180:
+                west, east = -180, 180
+            else:
+                west, east = lon - dlon, lon + dlon
+                if west < -180:
+                    west += 360
+                if east > 180:
+                    east -= 360
+        found = []
+        for key in self.box(max(south, -90), west, min(north, 90), east):
+            d = distance(lat, lon, *self.__points[key][:2])
+            if d <= km:
+                found.append((d, key))
+        found.sort()
+        return found
+
+    def __len__(self):
+        """Return the number of indexed keys."""
+        return len(self.__points)
+
+
+class ColumnStore:
+    """Represent the values of numeric attributes of a set of objects,
+    kept as one array of doubles per attribute with a row per key.
+    Rows are kept contiguous, so a filter is a scan over flat arrays
+    (vectorized with NumPy when it is installed) rather than over
+    objects. Values that are not numbers are stored as NaN, which
+    matches no range.
+    Attributes:
+        attrs (tuple): The names of the stored attributes.
+    """
+
+    def __init__(self, attrs):
+        """Initialize a new ColumnStore.
+        Args:
+            attrs (iterable): The names of the stored attributes.
+        """
+        self.attrs = tuple(attrs)
+        self.__columns = {attr: array("d") for attr in self.attrs}
+        self.__keys = []
+        self.__rows = {}
+
+    def add(self, key, values):
+        """Store the values of key, a dictionary of attribute values.
+        Missing attributes are stored as NaN.
+        """
+        row = self.__rows.get(key)
+        if row is None:
+            row = self.__rows[key] = len(self.__keys)
+            self.__keys.append(key)
+            for column in self.__columns.values():
+                column.append(nan)
+        for attr, column in self.__columns.items():
+            value = values.get(attr)
+            if type(value) in (int, float):
+                column[row] = value
+            else:
+                column[row] = nan
+
+    def add_many(self, items):
+        """Store the values of every (key, values) pair of items, adding
+        the rows of new keys column by column."""
+        rows = []
+        for key, values in items:
+            if key in self.__rows:
+                self.add(key, values)
+            else:
+                self.__rows[key] = len(self.__keys)
+                self.__keys.append(key)
+                rows.append(values)
+        for attr, column in self.__columns.items():
+            column.extend(value if type(value) in (int, float) else nan
+                          for value in (values.get(attr) for values in rows))
+
+    def discard(self, key):
+        """Remove key from the store if it is inside.
+        The last row is moved into the freed one.
+        """
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last = self.__keys.pop()
+        for column in self.__columns.values():
+            value = column.pop()
+            if last != key:
+                column[row] = value
+        if last != key:
+            self.__keys[row] = last
+            self.__rows[last] = row
+
+    def get(self, key, attr):
+        """Return the stored value of attr for key."""
+        return self.__columns[attr][self.__rows[key]]
+
+    def select(self, ranges):
+        """Return the list of keys whose values lie in every range.
+        Args:
+            ranges (dict): The (low, high) bounds of each attribute,
+                both inclusive. A bound of None is unbounded.
+        """
+        bounds = [(self.__columns[attr], -inf if low is None else low,
+                   inf if high is None else high)
+                  for attr, (low, high) in ranges.items()]
+        if numpy is not None and len(self.__keys) != 0:
+            mask = numpy.ones(len(self.__keys), dtype=bool)
+            for column, low, high in bounds:
+                values = numpy.frombuffer(column, dtype=numpy.float64)
+                mask &= (values >= low) & (values <= high)
+                del values  # release the buffer so the column can grow
+            return [self.__keys[row] for row in numpy.flatnonzero(mask)]
+        rows = range(len(self.__keys))
+        for column, low, high in bounds:
+            rows = [row for row in rows if low <= column[row] <= high]
+        return [self.__keys[row] for row in rows]
+
+    def __len__(self):
+        """Return the number of stored keys."""
+        return len(self.__keys)
@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+"""Defines the Query class returned by the query() method of storage."""
+from heapq import nlargest, nsmallest
+from itertools import islice
+import operator
+
+
+_MISSING = object()
+
+
+class Query:
+    """Represent a query over the objects of a storage engine.
+    Queries are built by chaining where(), order_by(), limit(), offset()
+    and values(), each returning a new Query, and run when iterated:
+        storage.query(Place).where(price_by_night__lt=100, city_id=cid)
+            .order_by("price_by_night").limit(50)
+    Equality on attributes indexed by storage.find(), items of lists
+    indexed by storage.having() and numeric ranges indexed by
+    storage.scan() select the candidates;
+    the other conditions are checked one object at a time, and objects
+    are yielded as they match unless the results must be sorted.
+    Attributes:
+        operators (dict): The comparison of each where() suffix.
+    """
+
+    operators = {
+        "": operator.eq,
+        "ne": operator.ne,
+        "lt": operator.lt,
+        "lte": operator.le,
+        "gt": operator.gt,
+        "gte": operator.ge,
+        "in": lambda value, values: value in values,
+        "contains": lambda values, items: isinstance(values, (list, tuple))
+        and all(item in values for item in items)
+    }
+
+    def __init__(self, storage, cls=None):
+        """Initialize a new Query.
+        Args:
+            storage (FileStorage or DBStorage): The storage to query.
+            cls (type or str): The class, or class name, to select. All
+                objects are selected when it is None.
+        """
+        self.__storage = storage
+        self.__cls = cls
+        self.__filters = ()
+        self.__order = ()
+        self.__limit = None
+        self.__offset = 0
+        self.__fields = None
+
+    def __copy(self, **changes):
+        """Return a copy of the query with the private attributes of
+        changes replaced."""
+        query = Query(self.__storage, self.__cls)
+        query.__dict__.update(self.__dict__)
+        for name, value in changes.items():
+            setattr(query, "_Query__" + name, value)
+        return query
+
+    def where(self, **kwargs):
+        """Return the query also selecting the objects matching kwargs.
+        Each keyword is an attribute name, optionally followed by two
+        underscores and one of the operators: ne, lt, lte, gt, gte, in,
+        or contains, which matches lists holding every given item.
+        Objects missing an attribute never match a condition on it.
+        Raises:
+            ValueError: If an operator is unknown.
+        """
+        filters = []
+        for name, value in kwargs.items():
+            attr, _, op = name.partition("__")
+            if op not in Query.operators:
+                raise ValueError("unknown operator: {}".format(op))
+            filters.append((attr, op, value))
+        return self.__copy(filters=self.__filters + tuple(filters))
+
+    def order_by(self, *attrs):
+        """Return the query sorting its results by attrs.
+        An attribute prefixed with "-" sorts in descending order. Objects
+        missing an attribute come after the others.
+        """
+        order = tuple((attr.lstrip("-"), attr.startswith("-"))
+                      for attr in attrs)
+        return self.__copy(order=order)
+
+    def limit(self, n):
+        """Return the query yielding at most n results."""
+        return self.__copy(limit=n)
+
+    def offset(self, n):
+        """Return the query skipping its first n results."""
+        return self.__copy(offset=n)
+
+    def values(self, *attrs):
+        """Return the query yielding, instead of objects, dictionaries of
+        their attributes attrs. Missing attributes are left out."""
+        return self.__copy(fields=attrs)
+
+    def __iter__(self):
+        """Run the query and return an iterator over its results."""
+        results = (obj for obj in self.__candidates() if self.__match(obj))
+        if len(self.__order) != 0:
+            results = self.__sorted(results)
+        stop = None if self.__limit is None else self.__offset + self.__limit
+        results = islice(results, self.__offset, stop)
+        if self.__fields is None:
+            return results
+        return (self.__project(obj) for obj in results)
+
+    def count(self):
+        """Return the number of results of the query."""
+        if len(self.__filters) == 0 and self.__limit is None and \
+                self.__offset == 0:
+            return self.__storage.count(self.__cls)
+        return sum(1 for _ in self)
+
+    def first(self):
+        """Return the first result of the query, or None."""
+        return next(iter(self.limit(1)), None)
+
+    def __candidates(self):
+        """Return the objects possibly matching the query, narrowed down
+        with the indexes of the storage."""
+        storage, cls = self.__storage, self.__cls
+        if cls is None:
+            return storage.all().values()
+        equal = {attr: value for attr, op, value in self.__filters
+                 if op == ""}
+        if len(equal) != 0:
+            return storage.find(cls, **equal)
+        held = {attr: value for attr, op, value in self.__filters
+                if op == "contains"}
+        if len(held) != 0:
+            return storage.having(cls, **held)
+        ranges = {}
+        for attr, op, value in self.__filters:
+            if op not in ("lt", "lte", "gt", "gte") or \
+                    type(value) not in (int, float):
+                continue
+            low, high = ranges.get(attr, (None, None))
+            if op in ("gt", "gte"):
+                low = value if low is None else max(low, value)
+            else:
+                high = value if high is None else min(high, value)
+            ranges[attr] = (low, high)
+        if len(ranges) != 0:
+            return storage.scan(cls, **ranges)
+        return storage.all(cls).values()
+
+    def __match(self, obj):
+        """Return True if obj satisfies every condition of the query."""
+        for attr, op, value in self.__filters:
+            found = getattr(obj, attr, _MISSING)
+            if found is _MISSING:
+                return False
+            try:
+                if not Query.operators[op](found, value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+    def __project(self, obj):
+        """Return the dictionary of the attributes of obj selected by
+        values()."""
+        odict = {}
+        for attr in self.__fields:
+            value = getattr(obj, attr, _MISSING)
+            if value is not _MISSING:
+                odict[attr] = value
+        return odict
+
+    def __sorted(self, objs):
+        """Return the list of objs in the order of the query."""
+        def key(attr, reverse):
+            def value(obj):
+                found = getattr(obj, attr, _MISSING)
+                if found is _MISSING:
+                    return (not reverse, 0)
+                return (reverse, found)
+            return value
+        if len(self.__order) == 1 and self.__limit is not None:
+            attr, reverse = self.__order[0]
+            select = nlargest if reverse else nsmallest
+            return select(self.__offset + self.__limit, objs,
+                          key=key(attr, reverse))
+        objs = list(objs)
+        for attr, reverse in reversed(self.__order):
+            objs.sort(key=key(attr, reverse), reverse=reverse)
+        return objs
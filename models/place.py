@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 """This module creates a Place class,Defines the Place class"""
+import models
 from models.base_model import BaseModel
 
 
@@ -19,3 +20,25 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @property
+    def city(self):
+        """City: The city of the place, or None."""
+        return models.storage.get("City", self.city_id)
+
+    @property
+    def owner(self):
+        """User: The owner of the place, or None."""
+        return models.storage.get("User", self.user_id)
+
+    @property
+    def reviews(self):
+        """list: The Review instances of the place."""
+        return models.storage.related("Review", "place_id", self.id)
+
+    @property
+    def amenities(self):
+        """list: The Amenity instances listed in amenity_ids."""
+        found = (models.storage.get("Amenity", amenity_id)
+                 for amenity_id in self.amenity_ids)
+        return [amenity for amenity in found if amenity is not None]
@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 """ Module to get the BaseModel"""
+import models
 from models.base_model import BaseModel
 
 
@@ -16,3 +17,13 @@ class Review(BaseModel):
     place_id = ""
     user_id = ""
     text = ""
+
+    @property
+    def place(self):
+        """Place: The reviewed place, or None."""
+        return models.storage.get("Place", self.place_id)
+
+    @property
+    def user(self):
+        """User: The author of the review, or None."""
+        return models.storage.get("User", self.user_id)
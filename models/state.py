@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 """ Module to get the BaseModel"""
+import models
 from models.base_model import BaseModel
 
 
@@ -12,3 +13,8 @@ class State(BaseModel):
     """
 
     name = ""
+
+    @property
+    def cities(self):
+        """list: The City instances of the state."""
+        return models.storage.related("City", "state_id", self.id)
@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 """ Module to get the BaseModel"""
+import models
 from models.base_model import BaseModel
 
 
@@ -17,3 +18,13 @@ class User(BaseModel):
     password = ""
     first_name = ""
     last_name = ""
+
+    @property
+    def places(self):
+        """list: The Place instances owned by the user."""
+        return models.storage.related("Place", "user_id", self.id)
+
+    @property
+    def reviews(self):
+        """list: The Review instances written by the user."""
+        return models.storage.related("Review", "user_id", self.id)
@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""Defines unittests for bulk.py.
+Unittest classes:
+    TestBulk_import
+    TestBulk_export
+    TestBulk_main
+"""
+import bulk
+import json
+import os
+import models
+import unittest
+from io import StringIO
+from models.base_model import classes
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from unittest.mock import patch
+
+
+class TestBulk_import(unittest.TestCase):
+    """Unittests for importing JSON Lines and CSV files."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.kinds = bulk.schema(classes)
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def load(self, text, fmt, **kwargs):
+        return bulk.import_file(models.storage, self.kinds, StringIO(text),
+                                fmt, **kwargs)
+
+    def test_schema(self):
+        self.assertEqual({"name": "str"}, self.kinds["State"])
+        self.assertEqual("int", self.kinds["Place"]["max_guest"])
+        self.assertEqual("float", self.kinds["Place"]["latitude"])
+        self.assertEqual("list", self.kinds["Place"]["amenity_ids"])
+        self.assertNotIn("reviews", self.kinds["Place"])
+
+    def test_jsonl(self):
+        pl = Place()
+        pl.name = "Loft"
+        odict = pl.to_dict()
+        FileStorage._FileStorage__objects = {}
+        text = json.dumps(odict) + "\n\n" + '{"name": "Texas"}\n'
+        report = self.load(text, "jsonl", cls_name="State")
+        self.assertEqual(2, report["objects"])
+        self.assertEqual(odict, models.storage.all()["Place." + pl.id]
+                         .to_dict())
+        self.assertEqual(1, len(models.storage.find(State, name="Texas")))
+        with open("file.json") as f:
+            self.assertEqual(2, len(json.load(f)))
+
+    def test_jsonl_chunks_in_processes(self):
+        text = "".join('{{"__class__": "State", "name": "s{}"}}\n'.format(i)
+                       for i in range(25))
+        self.load(text, "jsonl", jobs=2, size=4)
+        names = [st.name for st in models.storage.all(State).values()]
+        self.assertEqual(["s{}".format(i) for i in range(25)], names)
+
+    def test_jsonl_invalid_line(self):
+        text = '{"__class__": "State"}\n[1, 2]\n'
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            self.load(text, "jsonl")
+        with self.assertRaisesRegex(ValueError, "unknown class"):
+            self.load('{"name": "Texas"}\n', "jsonl")
+        self.assertEqual({}, models.storage.all())
+
+    def test_csv(self):
+        text = ("__class__,id,name,max_guest,latitude,amenity_ids,extra\n"
+                'Place,1,"Loft, sea view",4,1.5,"[""wifi""]",'
+                '"{""color"": ""blue""}"\n'
+                "State,2,Texas,,,,\n")
+        self.load(text, "csv")
+        pl = models.storage.get(Place, "1")
+        self.assertEqual("Loft, sea view", pl.name)
+        self.assertEqual(4, pl.max_guest)
+        self.assertEqual(1.5, pl.latitude)
+        self.assertEqual(["wifi"], pl.amenity_ids)
+        self.assertEqual("blue", pl.color)
+        self.assertEqual("Texas", models.storage.get(State, "2").name)
+
+    def test_csv_class_option(self):
+        self.load("name\nTexas\nOhio\n", "csv", cls_name="State")
+        self.assertEqual(2, models.storage.count(State))
+        with self.assertRaises(ValueError):
+            self.load("name\nTexas\n", "csv")
+
+    def test_csv_invalid_row(self):
+        text = "__class__,max_guest\nPlace,4\nPlace,many\n"
+        with self.assertRaisesRegex(ValueError, "line 3"):
+            self.load(text, "csv")
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            self.load("__class__,name\nState\n", "csv")
+
+
+class TestBulk_export(unittest.TestCase):
+    """Unittests for exporting JSON Lines and CSV files."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.kinds = bulk.schema(classes)
+        self.pl = Place()
+        self.pl.name = "Loft, sea view"
+        self.pl.amenity_ids = ["wifi"]
+        self.pl.color = "blue"
+        self.st = State()
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def dump(self, fmt, cls_name=None):
+        f = StringIO()
+        n = bulk.export_file(models.storage, self.kinds, f, fmt, cls_name)
+        return n, f.getvalue()
+
+    def test_jsonl(self):
+        n, text = self.dump("jsonl")
+        self.assertEqual(2, n)
+        self.assertEqual([self.pl.to_dict(), self.st.to_dict()],
+                         [json.loads(line) for line in text.splitlines()])
+
+    def test_jsonl_class(self):
+        n, text = self.dump("jsonl", "State")
+        self.assertEqual(1, n)
+        self.assertEqual(self.st.to_dict(), json.loads(text))
+
+    def test_csv_round_trip(self):
+        n, text = self.dump("csv")
+        self.assertEqual(2, n)
+        self.assertEqual(bulk.columns(self.kinds), text.split("\r\n")[0]
+                         .split(","))
+        odicts = [self.pl.to_dict(), self.st.to_dict()]
+        FileStorage._FileStorage__objects = {}
+        bulk.import_file(models.storage, self.kinds, StringIO(text), "csv")
+        self.assertEqual(odicts, list(models.storage.dicts()))
+
+    def test_csv_class_columns(self):
+        n, text = self.dump("csv", "State")
+        self.assertEqual("__class__,id,created_at,updated_at,name,extra",
+                         text.split("\r\n")[0])
+
+
+class TestBulk_main(unittest.TestCase):
+    """Unittests for the command line of bulk.py."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+        for path in ("file.json", "objects.csv"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_export_then_import(self):
+        st = State()
+        st.name = "Texas"
+        with patch("sys.stderr", new=StringIO()) as output:
+            self.assertEqual(0, bulk.main(["export", "objects.csv"]))
+            self.assertEqual("Exported 1 objects", output.getvalue().strip())
+        FileStorage._FileStorage__objects = {}
+        with patch("sys.stderr", new=StringIO()) as output:
+            self.assertEqual(0, bulk.main(["import", "objects.csv"]))
+            self.assertTrue(output.getvalue().startswith("Imported 1 objects"))
+        self.assertEqual("Texas", models.storage.get(State, st.id).name)
+
+    def test_stdout(self):
+        st = State()
+        with patch("sys.stdout", new=StringIO()) as output, \
+                patch("sys.stderr", new=StringIO()):
+            self.assertEqual(0, bulk.main(["export", "-", "--class", "State"]))
+            self.assertEqual(st.to_dict(), json.loads(output.getvalue()))
+
+    def test_errors(self):
+        with patch("sys.stderr", new=StringIO()) as output:
+            self.assertEqual(1, bulk.main(["export", "-", "--class", "Foo"]))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+        with patch("sys.stderr", new=StringIO()) as output:
+            self.assertEqual(1, bulk.main(["import", "missing.jsonl"]))
+            self.assertIn("No such file", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,12 +9,18 @@ Unittest classes:
     TestHBNBCommand_all
     TestHBNBCommand_destroy
     TestHBNBCommand_update
+    TestHBNBCommand_count
+    TestHBNBCommand_near
+    TestHBNBCommand_search
 """
 import os
 import sys
 import unittest
 from models import storage
+from models.base_model import BaseModel, classes
 from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
 from console import HBNBCommand
 from io import StringIO
 from unittest.mock import patch
@@ -98,7 +104,8 @@ class TestHBNBCommand_help(unittest.TestCase):
     def test_help(self):
         h = ("Documented commands (type help <topic>):\n"
              "========================================\n"
-             "EOF  all  count  create  destroy  help  quit  show  update")
+             "EOF  count   destroy  near  search  update\n"
+             "all  create  help     quit  show    within")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
             self.assertEqual(h, output.getvalue().strip())
@@ -150,6 +157,17 @@ class TestHBNBCommand_create(unittest.TestCase):
             self.assertFalse(HBNBCommand().onecmd("create MyModel"))
             self.assertEqual(correct, output.getvalue().strip())
 
+    def test_create_other_subclass(self):
+        class MyModel(BaseModel):
+            pass
+        correct = "** class doesn't exist **"
+        try:
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd("create MyModel"))
+                self.assertEqual(correct, output.getvalue().strip())
+        finally:
+            del classes["MyModel"]
+
     def test_create_invalid_syntax(self):
         correct = "*** Unknown syntax: MyModel.create()"
         with patch("sys.stdout", new=StringIO()) as output:
@@ -1499,6 +1517,43 @@ class TestHBNBCommand_update(unittest.TestCase):
         test_dict = storage.all()["Place.{}".format(testId)].__dict__
         self.assertEqual(9.8, test_dict["latitude"])
 
+    def test_update_read_only_attribute_space_notation(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            testId = output.getvalue().strip()
+        with patch("sys.stdout", new=StringIO()) as output:
+            cmd = "update Place {} city \"Paris\"".format(testId)
+            self.assertFalse(HBNBCommand().onecmd(cmd))
+            self.assertEqual("** attribute is read-only **",
+                             output.getvalue().strip())
+
+    def test_update_read_only_attribute_dot_notation(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            testId = output.getvalue().strip()
+        testCmd = "Place.update({}, ".format(testId)
+        testCmd += "{'name': 'Loft', 'city': 'Paris'})"
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(testCmd))
+            self.assertEqual("** attribute is read-only **",
+                             output.getvalue().strip())
+        test_dict = storage.all()["Place.{}".format(testId)].__dict__
+        self.assertNotIn("name", test_dict)
+
+    def test_update_invalid_timestamp(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            testId = output.getvalue().strip()
+        with patch("sys.stdout", new=StringIO()) as output:
+            cmd = "update Place {} created_at \"xx\"".format(testId)
+            self.assertFalse(HBNBCommand().onecmd(cmd))
+            self.assertEqual("** invalid value **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "show Place {}".format(testId)))
+            self.assertIn(testId, output.getvalue())
+
 
 class TestHBNBCommand_count(unittest.TestCase):
     """Unittests for testing count method of HBNB comand interpreter."""
@@ -1565,5 +1620,159 @@ class TestHBNBCommand_count(unittest.TestCase):
             self.assertEqual("1", output.getvalue().strip())
 
 
+class TestHBNBCommand_near(unittest.TestCase):
+    """Unittests for testing the near and within commands of the HBNB
+    command interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.sf = Place()
+        self.sf.latitude = 37.7749
+        self.sf.longitude = -122.4194
+        self.oak = Place()
+        self.oak.latitude = 37.8044
+        self.oak.longitude = -122.2712
+        self.la = Place()
+        self.la.latitude = 34.05
+        self.la.longitude = -118.24
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_near_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
+    def test_near_invalid_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near MyModel 0 0 1"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+
+    def test_near_missing_coordinates(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near Place 37.7 -122.4"))
+            self.assertEqual("** coordinates missing **",
+                             output.getvalue().strip())
+
+    def test_near_invalid_coordinates(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near Place 37.7 x 5"))
+            self.assertEqual("** invalid coordinates **",
+                             output.getvalue().strip())
+
+    def test_near_not_finite_coordinates(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near Place nan 0 5"))
+            self.assertEqual("** invalid coordinates **",
+                             output.getvalue().strip())
+
+    def test_near_space_notation(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "near Place 37.7749 -122.4194 20"))
+            self.assertEqual(str([self.sf.__str__(), self.oak.__str__()]),
+                             output.getvalue().strip())
+
+    def test_near_dot_notation(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "Place.near(37.8044, -122.2712, 5)"))
+            self.assertEqual(str([self.oak.__str__()]),
+                             output.getvalue().strip())
+
+    def test_within_space_notation(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "within Place 33 -120 35 -118"))
+            self.assertEqual(str([self.la.__str__()]),
+                             output.getvalue().strip())
+
+    def test_within_dot_notation(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "Place.within(0, 0, 1, 1)"))
+            self.assertEqual("[]", output.getvalue().strip())
+
+    def test_within_missing_coordinates(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("within Place 1 2 3"))
+            self.assertEqual("** coordinates missing **",
+                             output.getvalue().strip())
+
+    def test_within_not_finite_coordinates(self):
+        for arg in ("-inf -180 90 180", "0 0 nan 1"):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd("within Place " + arg))
+                self.assertEqual("** invalid coordinates **",
+                                 output.getvalue().strip())
+
+
+class TestHBNBCommand_search(unittest.TestCase):
+    """Unittests for testing the search command of the HBNB command
+    interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.rv1 = Review()
+        self.rv1.text = "Great loft, great host"
+        self.rv2 = Review()
+        self.rv2.text = "Cold loft"
+        self.pl = Place()
+        self.pl.description = "Sunny loft"
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+        HBNBCommand.page_size = 10
+
+    def test_search_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
+    def test_search_invalid_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search MyModel loft"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+
+    def test_search_missing_words(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search Review"))
+            self.assertEqual("** search words missing **",
+                             output.getvalue().strip())
+
+    def test_search_invalid_page(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search Review loft page=0"))
+            self.assertEqual("** invalid page **", output.getvalue().strip())
+
+    def test_search_space_notation(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search Review great loft"))
+            self.assertEqual(str([self.rv1.__str__(), self.rv2.__str__()]),
+                             output.getvalue().strip())
+
+    def test_search_dot_notation(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd('Place.search("loft")'))
+            self.assertEqual(str([self.pl.__str__()]),
+                             output.getvalue().strip())
+
+    def test_search_pages(self):
+        HBNBCommand.page_size = 1
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "Review.search(great loft, page=2)"))
+            self.assertEqual(str([self.rv2.__str__()]),
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search Review loft page=3"))
+            self.assertEqual("[]", output.getvalue().strip())
+
+
 if __name__ == "__main__":
     unittest.main()
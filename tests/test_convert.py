@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+"""Defines unittests for convert.py.
+Unittest classes:
+    TestConvert_files
+    TestConvert_main
+"""
+import convert
+import json
+import os
+import models
+import subprocess
+import sys
+import unittest
+from io import StringIO
+from models.engine import binary
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from unittest.mock import patch
+
+
+class TestConvert_files(unittest.TestCase):
+    """Unittests for reading and writing files of every format."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "source.json"
+        FileStorage._FileStorage__objects = {}
+        pl = Place()
+        pl.name = "Loft"
+        pl.amenity_ids = ["wifi"]
+        State().name = "Texas"
+        self.objs = {key: obj.to_dict()
+                     for key, obj in models.storage.all().items()}
+
+    def tearDown(self):
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+        for path in ("source.json", "converted.json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_round_trip(self):
+        for fmt in ("json", "jsonl", "binary"):
+            convert.write_file("converted.json", self.objs, fmt)
+            self.assertEqual((fmt, self.objs),
+                             convert.read_file("converted.json"))
+
+    def test_write_returns_size(self):
+        size = convert.write_file("converted.json", self.objs, "binary")
+        self.assertEqual(os.path.getsize("converted.json"), size)
+
+    def test_read_jsonl_applies_lines(self):
+        key = next(iter(self.objs))
+        with open("converted.json", "w") as f:
+            for key, o in self.objs.items():
+                f.write(json.dumps([key, o]) + "\n")
+            f.write(json.dumps([key, None]) + "\n")
+            f.write('["torn", {')
+        fmt, objs = convert.read_file("converted.json")
+        self.assertEqual(len(self.objs) - 1, len(objs))
+        self.assertNotIn(key, objs)
+
+    def test_read_empty_file(self):
+        open("converted.json", "w").close()
+        self.assertEqual(("json", {}), convert.read_file("converted.json"))
+
+    def test_unknown_class(self):
+        with self.assertRaisesRegex(ValueError, "Planet"):
+            convert.write_file("converted.json",
+                               {"Planet.1": {"__class__": "Planet"}},
+                               "binary")
+        self.assertFalse(os.path.exists("converted.json"))
+
+
+class TestConvert_main(unittest.TestCase):
+    """Unittests for the command line of convert.py."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "source.json"
+        FileStorage._FileStorage__objects = {}
+        Place().name = "Loft"
+        models.storage.save()
+        with open("source.json") as f:
+            self.objs = json.load(f)
+
+    def tearDown(self):
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+        for path in ("source.json", "converted.json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def main(self, *argv):
+        with patch("sys.stderr", new=StringIO()) as output:
+            status = convert.main(list(argv))
+        return status, output.getvalue()
+
+    def test_in_place_and_back(self):
+        status, output = self.main("source.json", "source.json")
+        self.assertEqual(0, status)
+        self.assertIn("Converted 1 objects from json to binary", output)
+        with open("source.json", "rb") as f:
+            self.assertTrue(binary.is_binary(f.read()))
+        self.main("source.json", "source.json")
+        with open("source.json") as f:
+            self.assertEqual(self.objs, json.load(f))
+
+    def test_format_option(self):
+        self.main("source.json", "converted.json", "--format", "jsonl")
+        with open("converted.json") as f:
+            self.assertEqual([json.loads(line) for line in f],
+                             [[key, o] for key, o in self.objs.items()])
+
+    def test_errors(self):
+        status, output = self.main("missing.json", "converted.json")
+        self.assertEqual(1, status)
+        self.assertIn("missing.json", output)
+        with open("converted.json", "w") as f:
+            f.write("{")
+        self.assertEqual(1, self.main("converted.json", "source.json")[0])
+
+    def test_script_does_not_load_storage(self):
+        with open("converted.json", "w") as f:
+            json.dump(self.objs, f)
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        try:
+            with open("file.json", "w") as f:
+                f.write("{")
+            result = subprocess.run(
+                [sys.executable, "convert.py", "converted.json",
+                 "converted.json"], capture_output=True, text=True)
+        finally:
+            os.remove("file.json")
+            try:
+                os.rename("tmp", "file.json")
+            except IOError:
+                pass
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertEqual(("binary", self.objs),
+                         convert.read_file("converted.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
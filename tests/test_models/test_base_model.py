@@ -4,13 +4,16 @@ Unittest classes:
     TestBaseModel_instantiation
     TestBaseModel_save
     TestBaseModel_to_dict
+    TestBaseModel_from_dict
+    TestBaseModel_classes
+    TestBaseModel_parse_datetime
 """
 import os
 import models
 import unittest
 from datetime import datetime
 from time import sleep
-from models.base_model import BaseModel
+from models.base_model import BaseModel, classes, parse_datetime
 
 
 class TestBaseModel_instantiation(unittest.TestCase):
@@ -210,5 +213,107 @@ class TestBaseModel_to_dict(unittest.TestCase):
             bm.to_dict(None)
 
 
+class TestBaseModel_from_dict(unittest.TestCase):
+    """Unittests for testing from_dict method of the BaseModel class."""
+
+    def test_from_dict_round_trip(self):
+        bm = BaseModel()
+        bm.name = "Holberton"
+        new = BaseModel.from_dict(bm.to_dict())
+        self.assertEqual(BaseModel, type(new))
+        self.assertEqual(bm.to_dict(), new.to_dict())
+        self.assertEqual(bm.created_at, new.created_at)
+        self.assertEqual(bm.updated_at, new.updated_at)
+        self.assertEqual(bm.__dict__, new.__dict__)
+        self.assertIsNot(bm, new)
+
+    def test_from_dict_not_stored(self):
+        dt = datetime.today().isoformat()
+        bm = BaseModel.from_dict({"id": "345", "created_at": dt,
+                                  "updated_at": dt})
+        self.assertNotIn(bm, models.storage.all().values())
+
+    def test_from_dict_does_not_change_dict(self):
+        dt = datetime.today().isoformat()
+        o = {"id": "345", "created_at": dt, "updated_at": dt,
+             "__class__": "BaseModel"}
+        BaseModel.from_dict(o)
+        self.assertEqual(dt, o["created_at"])
+        self.assertIn("__class__", o)
+
+    def test_from_dict_invalid_timestamps(self):
+        bm = BaseModel.from_dict({"id": "345", "created_at": "yesterday"})
+        with self.assertRaises(ValueError):
+            bm.created_at
+
+    def test_set_timestamp_string(self):
+        bm = BaseModel()
+        dt = datetime(2024, 5, 1, 12, 30)
+        bm.updated_at = dt.isoformat()
+        self.assertEqual(dt, bm.__dict__["updated_at"])
+        with self.assertRaises(ValueError):
+            bm.created_at = "xx"
+        self.assertEqual(datetime, type(bm.created_at))
+
+    def test_from_dict_defers_timestamps(self):
+        dt = datetime.today()
+        bm = BaseModel.from_dict({"id": "345", "created_at": dt.isoformat(),
+                                  "updated_at": dt.isoformat()})
+        self.assertEqual(str, type(bm.__dict__["created_at"]))
+        self.assertEqual(dt.isoformat(), bm.to_dict()["created_at"])
+        self.assertEqual(str, type(bm.__dict__["created_at"]))
+        self.assertEqual(dt, bm.created_at)
+        self.assertEqual(datetime, type(bm.__dict__["created_at"]))
+
+    def test_from_dict_str(self):
+        dt = datetime.today()
+        bm = BaseModel.from_dict({"id": "345", "created_at": dt.isoformat(),
+                                  "updated_at": dt.isoformat()})
+        self.assertIn("'created_at': " + repr(dt), str(bm))
+
+
+class TestBaseModel_classes(unittest.TestCase):
+    """Unittests for testing the registry of model classes."""
+
+    def test_classes(self):
+        self.assertEqual({"BaseModel", "User", "State", "City", "Place",
+                          "Amenity", "Review"}, set(classes))
+        self.assertIs(BaseModel, classes["BaseModel"])
+
+    def test_subclass_registered(self):
+        class MyModel(BaseModel):
+            pass
+        try:
+            self.assertIs(MyModel, classes["MyModel"])
+        finally:
+            del classes["MyModel"]
+
+
+class TestBaseModel_parse_datetime(unittest.TestCase):
+    """Unittests for testing the parse_datetime function."""
+
+    def test_parse_isoformat(self):
+        dt = datetime.today()
+        self.assertEqual(dt, parse_datetime(dt.isoformat()))
+
+    def test_parse_without_microseconds(self):
+        dt = datetime(2017, 9, 28, 21, 3, 54)
+        self.assertEqual(dt, parse_datetime(dt.isoformat()))
+
+    def test_parse_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_datetime("yesterday")
+
+    def test_parse_None(self):
+        with self.assertRaises(TypeError):
+            parse_datetime(None)
+
+    def test_from_dict_shares_equal_timestamps(self):
+        dt = datetime.today().isoformat()
+        bm = BaseModel.from_dict({"id": "1", "created_at": dt,
+                                  "updated_at": dt})
+        self.assertIs(bm.created_at, bm.updated_at)
+
+
 if __name__ == "__main__":
     unittest.main()
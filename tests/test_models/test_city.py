@@ -5,6 +5,7 @@ Unittest classes:
     TestCity_instantiation
     TestCity_save
     TestCity_to_dict
+    TestCity_relationships
 """
 import os
 import models
@@ -12,6 +13,8 @@ import unittest
 from datetime import datetime
 from time import sleep
 from models.city import City
+from models.place import Place
+from models.state import State
 
 
 class TestCity_instantiation(unittest.TestCase):
@@ -274,5 +277,23 @@ class TestCity_to_dict(unittest.TestCase):
             cy.to_dict(None)
 
 
+class TestCity_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the City class."""
+
+    def test_state(self):
+        st, cy = State(), City()
+        self.assertIsNone(cy.state)
+        cy.state_id = st.id
+        self.assertIs(st, cy.state)
+
+    def test_places(self):
+        cy, pl = City(), Place()
+        pl.city_id = cy.id
+        self.assertEqual([pl], cy.places)
+
+    def test_not_in_to_dict(self):
+        self.assertNotIn("places", City().to_dict())
+
+
 if __name__ == "__main__":
     unittest.main()
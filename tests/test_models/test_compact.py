@@ -0,0 +1,196 @@
+#!/usr/bin/python3
+"""Defines unittests for models/compact.py.
+Unittest classes:
+    TestCompact_instantiation
+    TestCompact_attributes
+    TestCompact_storage
+"""
+import json
+import os
+import tracemalloc
+import models
+import unittest
+from datetime import datetime
+from console import HBNBCommand
+from io import StringIO
+from unittest.mock import patch
+from models.base_model import classes
+from models.compact import compact
+from models.place import Place
+
+
+class TestCompact_instantiation(unittest.TestCase):
+    """Unittests for creating compact model classes."""
+
+    def setUp(self):
+        self.CompactPlace = compact(Place)
+
+    def tearDown(self):
+        classes["Place"] = Place
+
+    def test_subclass_with_same_name(self):
+        self.assertTrue(issubclass(self.CompactPlace, Place))
+        self.assertEqual("Place", self.CompactPlace.__name__)
+
+    def test_registered_in_place_of_class(self):
+        self.assertIs(self.CompactPlace, classes["Place"])
+
+    def test_compact_of_compact_class(self):
+        self.assertIs(self.CompactPlace, compact(self.CompactPlace))
+
+    def test_attributes_not_in_instance_dict(self):
+        cp = self.CompactPlace()
+        cp.name = "Loft"
+        cp.foo = "bar"
+        self.assertEqual({}, vars(cp))
+
+    def test_half_the_memory_when_reloaded(self):
+        def size(cls):
+            sizes = []
+            for _ in range(3):  # other threads may allocate meanwhile
+                dicts = [json.loads(text) for _ in range(1000)]
+                tracemalloc.start()
+                objs = [cls.from_dict(o) for o in dicts]
+                del dicts
+                for obj in objs:
+                    str(obj)
+                sizes.append(tracemalloc.get_traced_memory()[0])
+                tracemalloc.stop()
+                del objs
+            return min(sizes)
+        pl = Place()
+        pl.__dict__.update(city_id="c", user_id="u", name="Loft",
+                           description="Nice", number_rooms=2,
+                           number_bathrooms=1, max_guest=4,
+                           price_by_night=90, latitude=1.5,
+                           longitude=2.5, amenity_ids=[])
+        text = json.dumps(pl.to_dict())
+        self.assertLess(size(self.CompactPlace) * 2, size(Place))
+
+    def test_class_defaults(self):
+        cp = self.CompactPlace()
+        self.assertEqual("", cp.name)
+        self.assertEqual(0, cp.max_guest)
+        self.assertEqual("", self.CompactPlace.city_id)
+
+    def test_timestamps_are_datetime(self):
+        cp = self.CompactPlace()
+        self.assertEqual(datetime, type(cp.created_at))
+        self.assertEqual(datetime, type(cp.updated_at))
+
+
+class TestCompact_attributes(unittest.TestCase):
+    """Unittests for the attributes of compact instances."""
+
+    def setUp(self):
+        self.CompactPlace = compact(Place)
+
+    def tearDown(self):
+        classes["Place"] = Place
+
+    def test_invalid_timestamp(self):
+        cp = self.CompactPlace()
+        with self.assertRaises(ValueError):
+            cp.updated_at = "xx"
+        self.assertEqual(datetime, type(cp.updated_at))
+
+    def test_to_dict_matches_class(self):
+        cp = self.CompactPlace()
+        cp.name = "Loft"
+        cp.max_guest = 4
+        cp.foo = [1, 2]
+        pl = Place(**cp.to_dict())
+        self.assertEqual(pl.to_dict(), cp.to_dict())
+
+    def test_ad_hoc_attribute(self):
+        cp = self.CompactPlace()
+        cp.foo = "bar"
+        self.assertEqual("bar", cp.foo)
+        self.assertEqual("bar", cp.attributes()["foo"])
+        del cp.foo
+        with self.assertRaises(AttributeError):
+            cp.foo
+
+    def test_unset_fields_not_in_attributes(self):
+        cp = self.CompactPlace()
+        self.assertEqual({"id", "created_at", "updated_at"},
+                         set(cp.attributes()))
+
+    def test_list_attribute_not_shared(self):
+        cp1, cp2 = self.CompactPlace(), self.CompactPlace()
+        cp1.amenity_ids.append("wifi")
+        self.assertEqual(["wifi"], cp1.to_dict()["amenity_ids"])
+        self.assertEqual([], cp2.amenity_ids)
+        self.assertNotIn("amenity_ids", cp2.attributes())
+
+    def test_str(self):
+        cp = self.CompactPlace()
+        cp.name = "Loft"
+        self.assertEqual("[Place] ({}) {}".format(cp.id, cp.attributes()),
+                         str(cp))
+        self.assertIn("'name': 'Loft'", str(cp))
+
+    def test_from_dict(self):
+        cp = self.CompactPlace()
+        cp.number_rooms = 3
+        cp.foo = 1
+        other = self.CompactPlace.from_dict(cp.to_dict())
+        self.assertEqual(cp.to_dict(), other.to_dict())
+        self.assertEqual(datetime, type(other.updated_at))
+
+    def test_kwargs(self):
+        cp = self.CompactPlace()
+        cp.name = "Loft"
+        other = self.CompactPlace(**cp.to_dict())
+        self.assertEqual("Loft", other.name)
+        self.assertEqual(cp.created_at, other.created_at)
+
+
+class TestCompact_storage(unittest.TestCase):
+    """Unittests for compact instances in storage and the console."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        self.CompactPlace = compact(Place)
+
+    def tearDown(self):
+        classes["Place"] = Place
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_create_from_console(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            key = "Place." + output.getvalue().strip()
+        self.assertIs(self.CompactPlace, type(models.storage.all()[key]))
+
+    def test_update_from_console(self):
+        cp = self.CompactPlace()
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("update Place {} max_guest 4".format(cp.id))
+            HBNBCommand().onecmd("update Place {} color blue".format(cp.id))
+        self.assertEqual(4, cp.max_guest)
+        self.assertEqual("blue", cp.color)
+
+    def test_reload_builds_compact_instances(self):
+        cp = self.CompactPlace()
+        cp.name = "Loft"
+        models.storage.save()
+        models.storage.reload()
+        key = "Place." + cp.id
+        obj = models.storage.all()[key]
+        self.assertIs(self.CompactPlace, type(obj))
+        self.assertEqual("Loft", obj.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/binary.py.
+Unittest classes:
+    TestBinary_schema
+    TestBinary_packer
+"""
+import unittest
+from datetime import datetime
+from models.base_model import classes
+from models.engine import binary
+from models.place import Place
+from models.state import State
+from uuid import uuid4
+
+
+class TestBinary_schema(unittest.TestCase):
+    """Unittests for the schema derived from the model classes."""
+
+    def test_schema(self):
+        self.assertEqual([("name", "s")], binary.schema(State))
+        kinds = dict(binary.schema(Place))
+        self.assertEqual("q", kinds["max_guest"])
+        self.assertEqual("d", kinds["latitude"])
+        self.assertEqual("j", kinds["amenity_ids"])
+        self.assertNotIn("reviews", kinds)
+
+    def test_is_binary(self):
+        self.assertTrue(binary.is_binary(binary.Packer(classes).header))
+        self.assertFalse(binary.is_binary(b"{}"))
+
+
+class TestBinary_packer(unittest.TestCase):
+    """Unittests for writing and reading files."""
+
+    def setUp(self):
+        self.packer = binary.Packer(classes)
+
+    def dump(self, odicts):
+        return self.packer.dump([self.packer.row(o) for o in odicts])
+
+    def round_trip(self, odicts):
+        return [o for _, o in binary.load(self.dump(odicts))]
+
+    def odict(self, cls_name, **kwargs):
+        stamp = datetime(2024, 5, 1, 12, 30, 15, 123456).isoformat()
+        odict = {"id": str(uuid4()), "created_at": stamp,
+                 "updated_at": stamp, "__class__": cls_name}
+        odict.update(kwargs)
+        return odict
+
+    def test_empty(self):
+        self.assertEqual([], self.round_trip([]))
+        self.assertEqual(self.packer.header, self.dump([]))
+
+    def test_keys(self):
+        odict = self.odict("State", name="Texas")
+        data = self.dump([odict])
+        self.assertEqual([("State." + odict["id"], odict)],
+                         list(binary.load(data)))
+
+    def test_schema_attributes(self):
+        odicts = [self.odict("Place", name="Loft", max_guest=4,
+                             latitude=1.5, city_id=str(uuid4()),
+                             amenity_ids=[str(uuid4()), str(uuid4())]),
+                  self.odict("Place", name="Flat", amenity_ids=[]),
+                  self.odict("State")]
+        self.assertEqual(odicts, self.round_trip(odicts))
+
+    def test_values_not_fitting_schema(self):
+        odicts = [self.odict("Place", id="custom", name="a\0b",
+                             max_guest=2 ** 70, latitude=1,
+                             number_rooms=True, amenity_ids=["wifi"],
+                             city_id=None, color="blue"),
+                  self.odict("State", created_at="2024-05-01T12:30:15",
+                             updated_at="2024-05-01T12:30:15.000000+00:00"),
+                  self.odict("State", updated_at="yesterday")]
+        self.assertEqual(odicts, self.round_trip(odicts))
+
+    def test_timestamps(self):
+        odicts = [self.odict("State", created_at="1960-01-01T00:00:00",
+                             updated_at="2024-05-01T12:30:15.000001")]
+        self.assertEqual(odicts, self.round_trip(odicts))
+        odict = self.odict("State", updated_at=datetime(2024, 1, 2))
+        self.assertEqual("2024-01-02T00:00:00",
+                         self.round_trip([odict])[0]["updated_at"])
+
+    def test_uuids_take_16_bytes(self):
+        def size(n):
+            return len(self.dump([self.odict("State") for _ in range(n)]))
+        # id, created_at, updated_at and the attribute bitmap
+        self.assertEqual(10 * (16 + 8 + 8 + 8), size(20) - size(10))
+
+    def test_invalid_files(self):
+        data = bytearray(self.dump([self.odict("State")]))
+        with self.assertRaises(ValueError):
+            list(binary.load(bytes(data[:-1])))
+        with self.assertRaises(ValueError):
+            list(binary.load(bytes(data[:len(binary.MAGIC)])))
+        data[len(binary.MAGIC)] = binary.VERSION + 1
+        with self.assertRaises(ValueError):
+            list(binary.load(bytes(data)))
+
+    def test_unknown_class(self):
+        with self.assertRaises(KeyError):
+            self.packer.row(self.odict("Planet"))
+
+
+if __name__ == "__main__":
+    unittest.main()
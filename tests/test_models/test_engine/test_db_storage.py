@@ -0,0 +1,243 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/db_storage.py.
+Unittest classes:
+    TestDBStorage_instantiation
+    TestDBStorage_methods
+"""
+import os
+import sqlite3
+import unittest
+from datetime import datetime
+from models.engine.db_storage import DBStorage
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.review import Review
+
+
+class TestDBStorage_instantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the DBStorage class."""
+
+    def tearDown(self):
+        try:
+            os.remove("test.db")
+        except IOError:
+            pass
+
+    def test_DBStorage_instantiation_with_arg(self):
+        with self.assertRaises(TypeError):
+            DBStorage("test.db")
+
+    def test_creates_one_table_per_class(self):
+        DBStorage(path="test.db").close()
+        conn = sqlite3.connect("test.db")
+        tables = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        self.assertEqual({"BaseModel", "User", "State", "City", "Place",
+                          "Amenity", "Review"}, tables)
+
+    def test_adds_missing_columns(self):
+        conn = sqlite3.connect("test.db")
+        conn.execute('CREATE TABLE "User" (id TEXT PRIMARY KEY, '
+                     'created_at TEXT, updated_at TEXT, extra TEXT)')
+        conn.commit()
+        conn.close()
+        DBStorage(path="test.db").close()
+        conn = sqlite3.connect("test.db")
+        columns = {r[1] for r in conn.execute('PRAGMA table_info("User")')}
+        conn.close()
+        self.assertIn("email", columns)
+
+
+class TestDBStorage_methods(unittest.TestCase):
+    """Unittests for testing methods of the DBStorage class."""
+
+    def setUp(self):
+        self.db = DBStorage(path="test.db")
+
+    def tearDown(self):
+        self.db.close()
+        try:
+            os.remove("test.db")
+        except IOError:
+            pass
+
+    def reopen(self):
+        self.db.close()
+        self.db = DBStorage(path="test.db")
+        self.db.reload()
+        return self.db.all()
+
+    def test_all(self):
+        self.assertEqual(dict, type(self.db.all()))
+
+    def test_all_with_cls(self):
+        us = User()
+        self.db.new(us)
+        self.db.new(Place())
+        self.assertEqual({"User." + us.id: us}, self.db.all(User))
+        self.assertEqual({"User." + us.id: us}, self.db.all("User"))
+
+    def test_count(self):
+        self.db.new(User())
+        self.db.new(User())
+        self.db.new(Place())
+        self.db.save()
+        self.reopen()
+        self.assertEqual(3, self.db.count())
+        self.assertEqual(2, self.db.count(User))
+        self.assertEqual(0, self.db.count("MyModel"))
+
+    def test_new(self):
+        us = User()
+        self.db.new(us)
+        self.assertIs(us, self.db.all()["User." + us.id])
+
+    def test_save_reload(self):
+        us = User()
+        us.email = "betty@mail.com"
+        pl = Place()
+        pl.max_guest = 4
+        pl.amenity_ids = ["a", "b"]
+        pl.nickname = "Loft"
+        self.db.new(us)
+        self.db.new(pl)
+        self.db.save()
+        objs = self.reopen()
+        self.assertEqual("betty@mail.com", objs["User." + us.id].email)
+        self.assertEqual(us.created_at, objs["User." + us.id].created_at)
+        self.assertEqual(pl.to_dict(), objs["Place." + pl.id].to_dict())
+
+    def test_unset_attributes_stay_unset(self):
+        us = User()
+        self.db.new(us)
+        self.db.save()
+        objs = self.reopen()
+        self.assertNotIn("email", objs["User." + us.id].__dict__)
+
+    def test_touch(self):
+        rv = Review()
+        self.db.new(rv)
+        self.db.save()
+        rv.text = "Great"
+        self.db.touch(rv)
+        self.db.save()
+        objs = self.reopen()
+        self.assertEqual("Great", objs["Review." + rv.id].text)
+
+    def test_delete(self):
+        bm = BaseModel()
+        self.db.new(bm)
+        self.db.save()
+        self.db.delete(bm)
+        self.db.save()
+        self.assertNotIn("BaseModel." + bm.id, self.reopen())
+
+    def test_delete_None(self):
+        self.db.delete(None)
+        self.assertEqual({}, self.db.all())
+
+    def test_find(self):
+        rv1, rv2 = Review(), Review()
+        rv1.place_id = "p1"
+        self.db.new(rv1)
+        self.db.new(rv2)
+        self.assertEqual([rv1], self.db.find(Review, place_id="p1"))
+        self.assertEqual([], self.db.find(Review, text="Great"))
+
+    def test_scan(self):
+        pl1, pl2 = Place(), Place()
+        pl1.price_by_night = 80
+        pl2.price_by_night = 120
+        self.db.new(pl1)
+        self.db.new(pl2)
+        self.assertEqual([pl1], self.db.scan(Place, price_by_night=(0, 100)))
+        self.assertEqual([pl2], self.db.scan("Place",
+                                             price_by_night=(100, None)))
+
+    def test_query(self):
+        pl1, pl2 = Place(), Place()
+        pl1.price_by_night = 80
+        pl2.price_by_night = 120
+        self.db.new(pl1)
+        self.db.new(pl2)
+        query = self.db.query(Place).order_by("-price_by_night")
+        self.assertEqual([pl2, pl1], list(query))
+        self.assertEqual(1, query.where(price_by_night__lt=100).count())
+
+    def test_having(self):
+        pl1, pl2 = Place(), Place()
+        pl1.amenity_ids = ["wifi", "pool"]
+        pl2.amenity_ids.append("wifi")
+        self.db.new(pl1)
+        self.db.new(pl2)
+        self.assertEqual([pl1], self.db.having(Place, amenity_ids=["pool"]))
+        self.assertEqual(2, len(self.db.having(Place, amenity_ids=["wifi"])))
+
+    def test_near_within(self):
+        sf, oak = Place(), Place()
+        sf.latitude, sf.longitude = 37.7749, -122.4194
+        oak.latitude, oak.longitude = 37.8044, -122.2712
+        self.db.new(sf)
+        self.db.new(oak)
+        self.assertEqual([oak, sf], self.db.near(Place, 37.8, -122.27, 20))
+        self.assertEqual([sf], self.db.within(Place, 37, -123, 37.79, -122))
+        self.assertEqual([], self.db.within(Place, 37, 179, 38, -179))
+
+    def test_get_related(self):
+        st, cy = State(), City()
+        cy.state_id = st.id
+        self.db.new(st)
+        self.db.new(cy)
+        self.assertIs(st, self.db.get(State, st.id))
+        self.assertIsNone(self.db.get("State", cy.id))
+        self.assertEqual([cy], self.db.related(City, "state_id", st.id))
+
+    def test_search(self):
+        pl, rv = Place(), Review()
+        pl.description = "Sunny loft with a sea view"
+        rv.text = "Great loft, great host"
+        self.db.new(pl)
+        self.db.new(rv)
+        self.assertEqual([rv, pl], self.db.search("loft"))
+        self.assertEqual([pl], self.db.search("loft", Place))
+        self.assertEqual([pl], self.db.search("loft", offset=1, limit=1))
+        self.assertEqual([], self.db.search("castle"))
+
+    def test_bulk_new_and_update(self):
+        st = State()
+        report = self.db.bulk_new([st, {"__class__": "City",
+                                        "state_id": st.id}])
+        self.assertEqual(2, report["objects"])
+        cy = self.db.related(City, "state_id", st.id)[0]
+        self.db.bulk_update([{"__class__": "City", "id": cy.id,
+                              "name": "Austin"}])
+        other = DBStorage(path="test.db")
+        other.reload()
+        self.assertEqual("Austin", other.get(City, cy.id).name)
+        other.close()
+        with self.assertRaises(ValueError):
+            self.db.bulk_update([{"__class__": "City", "id": "missing"}])
+        with self.assertRaises(ValueError):
+            self.db.bulk_update([{"__class__": "City", "id": cy.id,
+                                  "name": "Dallas"},
+                                 {"__class__": "City", "id": cy.id,
+                                  "state": st}])
+        self.assertEqual("Austin", cy.name)
+        with self.assertRaises(ValueError):
+            self.db.bulk_new([{"__class__": "Foo"}])
+
+    def test_save_with_arg(self):
+        with self.assertRaises(TypeError):
+            self.db.save(None)
+
+    def test_reload_with_arg(self):
+        with self.assertRaises(TypeError):
+            self.db.reload(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,20 +3,41 @@
 Unittest classes:
     TestFileStorage_instantiation
     TestFileStorage_methods
+    TestFileStorage_journal
+    TestFileStorage_jsonl
+    TestFileStorage_binary
+    TestFileStorage_dirty
+    TestFileStorage_flush
+    TestFileStorage_durability
+    TestFileStorage_stream
+    TestFileStorage_lazy
+    TestFileStorage_sharded
+    TestFileStorage_find
+    TestFileStorage_related
+    TestFileStorage_scan
+    TestFileStorage_near
+    TestFileStorage_having
+    TestFileStorage_search
+    TestFileStorage_bulk
 """
+import io
 import os
 import json
 import models
 import unittest
 from datetime import datetime
+from time import sleep
 from models.base_model import BaseModel
-from models.engine.file_storage import FileStorage
+from models.engine import binary
+from models.engine.file_storage import FileStorage, _iter_json_object
 from models.user import User
 from models.state import State
 from models.place import Place
 from models.city import City
 from models.amenity import Amenity
 from models.review import Review
+from console import HBNBCommand
+from unittest.mock import patch
 
 
 class TestFileStorage_instantiation(unittest.TestCase):
@@ -64,9 +85,38 @@ class TestFileStorage_methods(unittest.TestCase):
     def test_all(self):
         self.assertEqual(dict, type(models.storage.all()))
 
-    def test_all_with_arg(self):
-        with self.assertRaises(TypeError):
-            models.storage.all(None)
+    def test_all_with_None(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
+
+    def test_all_with_cls(self):
+        us = User()
+        st = State()
+        self.assertEqual({"User." + us.id: us}, models.storage.all(User))
+        self.assertEqual({"State." + st.id: st}, models.storage.all("State"))
+        self.assertEqual({}, models.storage.all("MyModel"))
+
+    def test_all_with_cls_after_delete(self):
+        us = User()
+        models.storage.all(User)
+        models.storage.delete(us)
+        self.assertEqual({}, models.storage.all(User))
+
+    def test_all_with_cls_after_reload(self):
+        us = User()
+        models.storage.save()
+        models.storage.all(User)
+        models.storage.reload()
+        self.assertEqual(["User." + us.id], list(models.storage.all(User)))
+        self.assertIsNot(us, models.storage.all(User)["User." + us.id])
+
+    def test_count(self):
+        User()
+        User()
+        Place()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual(1, models.storage.count("Place"))
+        self.assertEqual(0, models.storage.count("MyModel"))
 
     def test_new(self):
         bm = BaseModel()
@@ -171,5 +221,1421 @@ class TestFileStorage_methods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorage_journal(unittest.TestCase):
+    """Unittests for testing the journal mode of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "journal.json"
+        FileStorage._FileStorage__objects = {}
+        self.fs = FileStorage(journal=True, compact_every=10)
+
+    def tearDown(self):
+        for path in ("journal.json", "journal.json.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def test_journal_instantiation_with_arg(self):
+        with self.assertRaises(TypeError):
+            FileStorage(True)
+
+    def test_save_appends_to_log(self):
+        us = User()
+        self.fs.save()
+        self.assertFalse(os.path.exists("journal.json"))
+        with open("journal.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(1, len(lines))
+        self.assertIn("User." + us.id, lines[0])
+
+    def test_save_only_appends_changes(self):
+        us = User()
+        st = State()
+        self.fs.save()
+        st.name = "California"
+        self.fs.touch(st)
+        self.fs.save()
+        with open("journal.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(3, len(lines))
+        self.assertIn("State." + st.id, lines[2])
+        self.assertNotIn("User." + us.id, lines[2])
+
+    def test_delete_is_replayed(self):
+        us = User()
+        self.fs.save()
+        self.fs.delete(us)
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload()
+        self.assertNotIn("User." + us.id, self.fs.all())
+
+    def test_reload_replays_log(self):
+        pl = Place()
+        self.fs.save()
+        pl.name = "Loft"
+        self.fs.touch(pl)
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload()
+        self.assertEqual("Loft", self.fs.all()["Place." + pl.id].name)
+
+    def test_reload_ignores_torn_record(self):
+        am = Amenity()
+        self.fs.save()
+        with open("journal.json.log", "a") as f:
+            f.write('["Amenity.1", {"id"')
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload()
+        self.assertIn("Amenity." + am.id, self.fs.all())
+        self.assertNotIn("Amenity.1", self.fs.all())
+
+    def test_compaction(self):
+        fs = FileStorage(journal=True, compact_every=3)
+        objs = []
+        for i in range(3):
+            objs.append(City())
+            fs.save()
+        self.assertFalse(os.path.exists("journal.json.log"))
+        with open("journal.json", "r") as f:
+            save_text = f.read()
+        for obj in objs:
+            self.assertIn("City." + obj.id, save_text)
+
+
+class TestFileStorage_jsonl(unittest.TestCase):
+    """Unittests for testing the jsonl format of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "lines.json"
+        FileStorage._FileStorage__objects = {}
+        self.fs = FileStorage(file_format="jsonl", compact_every=4)
+
+    def tearDown(self):
+        for path in ("lines.json", "lines.json.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def lines(self):
+        with open("lines.json") as f:
+            return [json.loads(line) for line in f]
+
+    def reload(self):
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload()
+        return models.storage.all()
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            FileStorage(file_format="xml")
+        with self.assertRaises(ValueError):
+            FileStorage(file_format="jsonl", journal=True)
+        with self.assertRaises(ValueError):
+            FileStorage(file_format="jsonl", sharded=True)
+
+    def test_save_one_object_per_line(self):
+        us, st = User(), State()
+        self.fs.save()
+        self.assertEqual([["User." + us.id, us.to_dict()],
+                          ["State." + st.id, st.to_dict()]], self.lines())
+
+    def test_save_appends_changes_after_reload(self):
+        us, st = User(), State()
+        self.fs.save()
+        objs = self.reload()
+        objs["State." + st.id].name = "Texas"
+        models.storage.delete(objs["User." + us.id])
+        self.fs.save()
+        lines = self.lines()
+        self.assertEqual(4, len(lines))
+        self.assertEqual("Texas", lines[2][1]["name"])
+        self.assertEqual(["User." + us.id, None], lines[3])
+        objs = self.reload()
+        self.assertEqual(["State." + st.id], list(objs))
+        self.assertEqual("Texas", objs["State." + st.id].name)
+
+    def test_compacted_after_many_appends(self):
+        st = State()
+        self.fs.save()
+        st = self.reload()["State." + st.id]
+        for name in ("a", "b", "c"):
+            st.name = name
+            self.fs.save()
+        self.assertEqual(4, len(self.lines()))
+        st.name = "d"
+        self.fs.save()
+        self.assertEqual([["State." + st.id, st.to_dict()]], self.lines())
+        st.name = "e"
+        self.fs.save()
+        self.assertEqual(2, len(self.lines()))
+
+    def test_migrates_json_object_file(self):
+        us = User()
+        FileStorage(journal=False).save()
+        with open("lines.json") as f:
+            self.assertEqual("{", f.read(1))
+        objs = self.reload()
+        self.assertIn("User." + us.id, objs)
+        State()
+        self.fs.save()
+        self.assertEqual(2, len(self.lines()))
+
+    def test_json_format_reads_lines(self):
+        us = User()
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        fs = FileStorage()
+        fs.reload()
+        self.assertIn("User." + us.id, models.storage.all())
+        fs.save()
+        with open("lines.json") as f:
+            self.assertIn("User." + us.id, json.load(f))
+
+    def test_torn_last_line(self):
+        us, st = User(), State()
+        self.fs.save()
+        with open("lines.json") as f:
+            text = f.read()
+        with open("lines.json", "w") as f:
+            f.write(text[:-10])
+        objs = self.reload()
+        self.assertEqual(["User." + us.id], list(objs))
+        State()
+        self.fs.save()
+        self.assertEqual(2, len(self.lines()))
+
+    def test_unterminated_last_line(self):
+        us = User()
+        self.fs.save()
+        with open("lines.json") as f:
+            text = f.read()
+        with open("lines.json", "w") as f:
+            f.write(text[:-1])
+        self.assertIn("User." + us.id, self.reload())
+        st = State()
+        self.fs.save()
+        self.assertEqual(2, len(self.lines()))
+
+    def test_lazy(self):
+        us = User()
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        fs = FileStorage(file_format="jsonl", lazy=True)
+        fs.reload()
+        objs = models.storage.all()
+        self.assertIs(dict, type(dict.get(objs, "User." + us.id)))
+        State()
+        fs.save()
+        self.assertEqual(2, len(self.lines()))
+        self.assertEqual(us.to_dict(), objs["User." + us.id].to_dict())
+
+    def test_bulk_new_appends(self):
+        User()
+        self.fs.save()
+        self.reload()
+        self.fs.bulk_new([{"__class__": "State"}])
+        self.assertEqual(2, len(self.lines()))
+        self.fs.bulk_new({"__class__": "City"} for _ in range(4))
+        self.assertEqual(6, len(self.lines()))
+        self.assertEqual(6, len(self.reload()))
+
+
+class TestFileStorage_binary(unittest.TestCase):
+    """Unittests for testing the binary format of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "packed.json"
+        FileStorage._FileStorage__objects = {}
+        self.fs = FileStorage(file_format="binary")
+
+    def tearDown(self):
+        for path in ("packed.json", "packed.json.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def reload(self, fs=None):
+        FileStorage._FileStorage__objects = {}
+        (fs or self.fs).reload()
+        return models.storage.all()
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            FileStorage(file_format="binary", sharded=True)
+
+    def test_save_writes_binary_file(self):
+        User()
+        self.fs.save()
+        with open("packed.json", "rb") as f:
+            self.assertTrue(binary.is_binary(f.read()))
+
+    def test_reload_round_trip(self):
+        pl = Place()
+        pl.name = "Loft"
+        pl.max_guest = 4
+        pl.latitude = 1.5
+        pl.amenity_ids = [str(Amenity().id), "wifi"]
+        pl.color = "blue"
+        st = State()
+        st.id = "custom"
+        odicts = [obj.to_dict() for obj in models.storage.all().values()]
+        self.fs.save()
+        objs = self.reload()
+        self.assertEqual(sorted(odicts, key=lambda o: o["id"]),
+                         sorted((obj.to_dict() for obj in objs.values()),
+                                key=lambda o: o["id"]))
+        self.assertIs(Place, type(objs["Place." + pl.id]))
+        self.assertIn("State.custom", objs)
+
+    def test_save_after_change(self):
+        st = State()
+        self.fs.save()
+        st = self.reload()["State." + st.id]
+        st.name = "Texas"
+        self.fs.save()
+        self.assertEqual("Texas", self.reload()["State." + st.id].name)
+        models.storage.delete(self.reload()["State." + st.id])
+        self.fs.save()
+        self.assertEqual({}, self.reload())
+
+    def test_smaller_than_json(self):
+        ci = City()
+        for i in range(100):
+            pl = Place()
+            pl.city_id = ci.id
+            pl.user_id = User().id
+            pl.name = "Place {}".format(i)
+            pl.amenity_ids = [Amenity().id]
+        FileStorage().save()
+        size = os.path.getsize("packed.json")
+        self.fs.save()
+        self.assertLess(os.path.getsize("packed.json") * 3, size)
+
+    def test_json_format_reads_binary(self):
+        us = User()
+        self.fs.save()
+        objs = self.reload(FileStorage())
+        self.assertEqual(us.to_dict(), objs["User." + us.id].to_dict())
+        FileStorage().save()
+        with open("packed.json") as f:
+            self.assertIn("User." + us.id, json.load(f))
+
+    def test_binary_format_reads_json(self):
+        us = User()
+        FileStorage().save()
+        self.assertIn("User." + us.id, self.reload())
+        self.fs.save()
+        with open("packed.json", "rb") as f:
+            self.assertTrue(binary.is_binary(f.read()))
+
+    def test_journal(self):
+        fs = FileStorage(file_format="binary", journal=True)
+        st = State()
+        fs.compact()
+        st.name = "Texas"
+        fs.save()
+        self.assertTrue(os.path.exists("packed.json.log"))
+        objs = self.reload(fs)
+        self.assertEqual("Texas", objs["State." + st.id].name)
+
+    def test_lazy(self):
+        us = User()
+        us.email = "a@b.c"
+        self.fs.save()
+        fs = FileStorage(file_format="binary", lazy=True)
+        objs = self.reload(fs)
+        odict = dict.get(objs, "User." + us.id)
+        self.assertIs(dict, type(odict))
+        self.assertEqual(us.to_dict(), json.loads(json.dumps(odict)))
+        State()
+        fs.save()
+        self.assertEqual(2, len(self.reload()))
+
+
+class TestFileStorage_dirty(unittest.TestCase):
+    """Unittests for testing the change tracking of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "dirty.json"
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("dirty.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def test_new_marks_dirty(self):
+        us = User()
+        self.assertIn("User." + us.id, FileStorage._FileStorage__dirty)
+
+    def test_setattr_marks_dirty(self):
+        us = User()
+        models.storage.save()
+        self.assertEqual({}, FileStorage._FileStorage__dirty)
+        us.first_name = "Betty"
+        self.assertIs(us, FileStorage._FileStorage__dirty["User." + us.id])
+
+    def test_setattr_unstored_object_not_dirty(self):
+        dt = datetime.today().isoformat()
+        us = User(id="1", created_at=dt, updated_at=dt)
+        us.first_name = "Betty"
+        self.assertNotIn("User.1", FileStorage._FileStorage__dirty)
+
+    def test_delete_marks_dirty(self):
+        us = User()
+        models.storage.save()
+        models.storage.delete(us)
+        self.assertIsNone(FileStorage._FileStorage__dirty["User." + us.id])
+
+    def test_save_reuses_unchanged_payloads(self):
+        us = User()
+        st = State()
+        models.storage.save()
+        us.__dict__["first_name"] = "untracked"
+        st.name = "California"
+        models.storage.save()
+        with open("dirty.json", "r") as f:
+            save_text = f.read()
+        self.assertNotIn("untracked", save_text)
+        self.assertIn("California", save_text)
+
+    def test_save_drops_deleted_objects(self):
+        us = User()
+        models.storage.save()
+        models.storage.delete(us)
+        models.storage.save()
+        with open("dirty.json", "r") as f:
+            self.assertEqual({}, json.load(f))
+
+
+class TestFileStorage_flush(unittest.TestCase):
+    """Unittests for testing the flush policies of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "flush.json"
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("flush.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def test_flush_every(self):
+        fs = FileStorage(flush_every=3)
+        us = User()
+        fs.save()
+        fs.save()
+        self.assertFalse(os.path.exists("flush.json"))
+        fs.save()
+        with open("flush.json", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+    def test_flush_writes_pending_saves(self):
+        fs = FileStorage(flush_every=100)
+        us = User()
+        fs.save()
+        fs.flush()
+        with open("flush.json", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+    def test_flush_without_pending_saves(self):
+        fs = FileStorage(flush_every=100)
+        User()
+        fs.flush()
+        self.assertFalse(os.path.exists("flush.json"))
+
+    def test_flush_interval(self):
+        fs = FileStorage(flush_interval=10)
+        pl = Place()
+        fs.save()
+        for i in range(100):
+            if os.path.exists("flush.json"):
+                break
+            sleep(0.01)
+        self.assertTrue(os.path.exists("flush.json"))
+        fs.flush()
+        with open("flush.json", "r") as f:
+            self.assertIn("Place." + pl.id, f.read())
+
+    def test_flush_interval_retries_failed_flush(self):
+        FileStorage._FileStorage__file_path = os.path.join("missing",
+                                                           "flush.json")
+        fs = FileStorage(flush_interval=10)
+        pl = Place()
+        with patch("sys.stderr", new=io.StringIO()) as output:
+            fs.save()
+            for i in range(100):
+                if "FileNotFoundError" in output.getvalue():
+                    break
+                sleep(0.01)
+            FileStorage._FileStorage__file_path = "flush.json"
+            for i in range(100):
+                if os.path.exists("flush.json"):
+                    break
+                sleep(0.01)
+        self.assertEqual(1, output.getvalue().count("FileNotFoundError:"))
+        self.assertTrue(os.path.exists("flush.json"))
+        with open("flush.json", "r") as f:
+            self.assertIn("Place." + pl.id, f.read())
+
+    def test_flush_with_arg(self):
+        with self.assertRaises(TypeError):
+            models.storage.flush(None)
+
+
+class TestFileStorage_durability(unittest.TestCase):
+    """Unittests for testing the atomic saves of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "durable.json"
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        for path in os.listdir("."):
+            if path.startswith("durable.json"):
+                os.remove(path)
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def test_invalid_durability(self):
+        with self.assertRaises(ValueError):
+            FileStorage(durability="always")
+
+    def test_save_each_durability(self):
+        for durability in ("none", "file", "dir"):
+            fs = FileStorage(durability=durability)
+            us = User()
+            fs.save()
+            with open("durable.json", "r") as f:
+                self.assertIn("User." + us.id, json.load(f))
+
+    def test_save_leaves_no_temporary_file(self):
+        User()
+        models.storage.save()
+        self.assertEqual(["durable.json"], [p for p in os.listdir(".")
+                                            if p.startswith("durable.json")])
+
+    def test_failed_save_keeps_previous_file(self):
+        us = User()
+        models.storage.save()
+        rv = Review()
+        rv.text = {1, 2}
+        with self.assertRaises(TypeError):
+            models.storage.save()
+        with open("durable.json", "r") as f:
+            self.assertEqual(["User." + us.id], list(json.load(f)))
+        self.assertEqual(["durable.json"], [p for p in os.listdir(".")
+                                            if p.startswith("durable.json")])
+
+
+class TestFileStorage_stream(unittest.TestCase):
+    """Unittests for testing the streaming reload of the FileStorage class."""
+
+    doc = {
+        "User.1": {"id": "1", "__class__": "User", "first_name": "B{e}tty"},
+        "Place.2": {"id": "2", "__class__": "Place", "amenity_ids": ["a"]},
+        "Review.3": {"id": "3", "__class__": "Review", "text": "\"}, \""}
+    }
+
+    def tearDown(self):
+        try:
+            os.remove("stream.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def test_iter_small_chunks(self):
+        text = json.dumps(self.doc)
+        for chunk_size in (1, 3, 64):
+            pairs = _iter_json_object(io.StringIO(text), chunk_size)
+            self.assertEqual(self.doc, dict(pairs))
+
+    def test_iter_indented(self):
+        text = json.dumps(self.doc, indent=4)
+        pairs = _iter_json_object(io.StringIO(text), 5)
+        self.assertEqual(list(self.doc.items()), list(pairs))
+
+    def test_iter_empty_object(self):
+        self.assertEqual([], list(_iter_json_object(io.StringIO(" {} "))))
+
+    def test_iter_invalid(self):
+        for text in ("", "{", '{"User.1": {}', '{"User.1": 1}', "[]"):
+            with self.assertRaises(ValueError):
+                list(_iter_json_object(io.StringIO(text), 2))
+
+    def test_reload_indented_file(self):
+        dt = datetime.today().isoformat()
+        doc = {"City.7": {"id": "7", "__class__": "City", "name": "Tunis",
+                          "created_at": dt, "updated_at": dt}}
+        with open("stream.json", "w") as f:
+            json.dump(doc, f, indent=2)
+        FileStorage._FileStorage__file_path = "stream.json"
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("Tunis", models.storage.all()["City.7"].name)
+
+    def test_reload_record_without_id_or_timestamps(self):
+        with open("stream.json", "w") as f:
+            json.dump({"City.7": {"__class__": "City", "name": "Tunis"}}, f)
+        FileStorage._FileStorage__file_path = "stream.json"
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        cy = models.storage.all()["City.7"]
+        self.assertIn("Tunis", str(cy))
+        self.assertEqual(datetime, type(cy.created_at))
+        models.storage.save()
+        with open("stream.json") as f:
+            self.assertEqual("Tunis", json.load(f)["City.7"]["name"])
+
+
+class TestFileStorage_lazy(unittest.TestCase):
+    """Unittests for testing the lazy reload of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "lazy.json"
+        FileStorage._FileStorage__objects = {}
+        self.us = User()
+        self.pl = Place()
+        self.pl.name = "Loft"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.fs = FileStorage(lazy=True)
+        self.fs.reload()
+
+    def tearDown(self):
+        try:
+            os.remove("lazy.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def raw(self, key):
+        return dict.__getitem__(self.fs.all(), key)
+
+    def test_reload_does_not_instantiate(self):
+        self.assertEqual(dict, type(self.raw("Place." + self.pl.id)))
+        self.assertIn("User." + self.us.id, self.fs.all())
+
+    def test_access_instantiates(self):
+        pl = self.fs.all()["Place." + self.pl.id]
+        self.assertEqual(Place, type(pl))
+        self.assertEqual("Loft", pl.name)
+        self.assertEqual(self.pl.created_at, pl.created_at)
+        self.assertIs(pl, self.raw("Place." + self.pl.id))
+        self.assertEqual(dict, type(self.raw("User." + self.us.id)))
+
+    def test_values_instantiates(self):
+        types = {type(obj) for obj in self.fs.all().values()}
+        self.assertEqual({User, Place}, types)
+
+    def test_copies_instantiate(self):
+        objs = self.fs.all()
+        copies = [objs.copy(), dict(objs), {**objs}, {} | objs, objs | {}]
+        for copy in copies:
+            self.assertEqual({User, Place},
+                             {type(obj) for obj in copy.values()})
+        key = "User." + self.us.id
+        self.assertEqual(User, type(objs.setdefault(key)))
+
+    def test_save_keeps_unaccessed_objects(self):
+        st = State()
+        self.fs.save()
+        self.assertEqual(dict, type(self.raw("User." + self.us.id)))
+        with open("lazy.json", "r") as f:
+            objs = json.load(f)
+        self.assertEqual("Loft", objs["Place." + self.pl.id]["name"])
+        self.assertIn("State." + st.id, objs)
+
+    def test_delete(self):
+        pl = self.fs.all()["Place." + self.pl.id]
+        self.fs.delete(pl)
+        self.assertNotIn("Place." + self.pl.id, self.fs.all())
+
+
+class TestFileStorage_sharded(unittest.TestCase):
+    """Unittests for testing the sharded layout of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "shard.json"
+        FileStorage._FileStorage__objects = {}
+        self.fs = FileStorage(sharded=True)
+
+    def tearDown(self):
+        for path in os.listdir("."):
+            if path.startswith("shard."):
+                os.remove(path)
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+
+    def shards(self):
+        return sorted(p for p in os.listdir(".") if p.startswith("shard."))
+
+    def test_save_one_file_per_class(self):
+        us = User()
+        rv = Review()
+        self.fs.save()
+        self.assertEqual(["shard.Review.json", "shard.User.json"],
+                         self.shards())
+        with open("shard.User.json", "r") as f:
+            self.assertEqual(["User." + us.id], list(json.load(f)))
+
+    def test_save_only_rewrites_changed_shards(self):
+        us = User()
+        rv = Review()
+        self.fs.save()
+        os.remove("shard.User.json")
+        rv.text = "Great"
+        self.fs.save()
+        self.assertEqual(["shard.Review.json"], self.shards())
+
+    def test_reload_all(self):
+        us = User()
+        rv = Review()
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload()
+        self.assertIn("User." + us.id, self.fs.all())
+        self.assertIn("Review." + rv.id, self.fs.all())
+
+    def test_reload_classes(self):
+        us = User()
+        rv = Review()
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload(classes=["Review"])
+        self.assertEqual(["Review." + rv.id], list(self.fs.all()))
+
+    def test_read_loads_missing_class(self):
+        us = User()
+        rv = Review()
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload(classes=["Review"])
+        self.assertEqual(1, self.fs.count("User"))
+        self.assertEqual(us.id, self.fs.get(User, us.id).id)
+        self.assertEqual(1, self.fs.query(User).count())
+        self.assertCountEqual(["User." + us.id, "Review." + rv.id],
+                              self.fs.all())
+
+    def test_save_loads_missing_class(self):
+        us = User()
+        rv = Review()
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload(classes=["Review"])
+        us2 = User()
+        self.fs.save()
+        with open("shard.User.json", "r") as f:
+            self.assertEqual({"User." + us.id, "User." + us2.id},
+                             set(json.load(f)))
+
+    def test_delete_last_object_removes_shard(self):
+        us = User()
+        rv = Review()
+        self.fs.save()
+        self.fs.delete(us)
+        self.fs.save()
+        self.assertEqual(["shard.Review.json"], self.shards())
+
+    def test_shard_prefix(self):
+        fs = FileStorage(sharded=True, shard_prefix=1)
+        us = User()
+        fs.save()
+        self.assertEqual(["shard.User.{}.json".format(us.id[0])],
+                         self.shards())
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        self.assertIn("User." + us.id, fs.all())
+
+    def test_reload_migrates_single_file(self):
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.fs.reload()
+        self.fs.save()
+        self.assertEqual(["shard.User.json"], self.shards())
+
+    def test_reload_with_arg(self):
+        with self.assertRaises(TypeError):
+            self.fs.reload(["User"])
+
+
+class TestFileStorage_find(unittest.TestCase):
+    """Unittests for testing the find method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.rv1 = Review()
+        self.rv1.place_id = self.pl.id
+        self.rv1.user_id = "u1"
+        self.rv2 = Review()
+        self.rv2.place_id = self.pl.id
+        self.rv2.user_id = "u2"
+        self.rv3 = Review()
+        self.rv3.place_id = "other"
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_find_indexed(self):
+        found = models.storage.find(Review, place_id=self.pl.id)
+        self.assertCountEqual([self.rv1, self.rv2], found)
+
+    def test_find_several_attributes(self):
+        found = models.storage.find(Review, place_id=self.pl.id,
+                                    user_id="u2")
+        self.assertEqual([self.rv2], found)
+
+    def test_find_not_indexed(self):
+        self.rv3.text = "Great"
+        self.assertEqual([self.rv3], models.storage.find(Review, text="Great"))
+
+    def test_find_no_match(self):
+        self.assertEqual([], models.storage.find(City, state_id="nowhere"))
+
+    def test_find_other_class(self):
+        us = User()
+        self.assertEqual([], models.storage.find(Place, user_id=us.id))
+
+    def test_find_after_update(self):
+        models.storage.find(Review, place_id=self.pl.id)
+        self.rv1.place_id = "other"
+        found = models.storage.find(Review, place_id="other")
+        self.assertCountEqual([self.rv1, self.rv3], found)
+        found = models.storage.find(Review, place_id=self.pl.id)
+        self.assertEqual([self.rv2], found)
+
+    def test_find_after_new_and_delete(self):
+        models.storage.find(Review, place_id=self.pl.id)
+        rv4 = Review(id="4", place_id=self.pl.id,
+                     created_at=datetime.today().isoformat(),
+                     updated_at=datetime.today().isoformat())
+        models.storage.new(rv4)
+        models.storage.delete(self.rv1)
+        found = models.storage.find(Review, place_id=self.pl.id)
+        self.assertCountEqual([self.rv2, rv4], found)
+
+    def test_find_after_objects_replaced(self):
+        models.storage.find(Review, place_id=self.pl.id)
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual([], models.storage.find(Review, place_id=self.pl.id))
+
+
+class TestFileStorage_related(unittest.TestCase):
+    """Unittests for testing the get and related methods of the
+    FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.st1, self.st2 = State(), State()
+        self.cy1, self.cy2, self.cy3 = City(), City(), City()
+        self.cy1.state_id = self.cy2.state_id = self.st1.id
+        self.cy3.state_id = self.st2.id
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def joins(self):
+        return FileStorage._FileStorage__joins
+
+    def test_get(self):
+        self.assertIs(self.st1, models.storage.get(State, self.st1.id))
+        self.assertIs(self.st1, models.storage.get("State", self.st1.id))
+        self.assertIsNone(models.storage.get(City, self.st1.id))
+
+    def test_related(self):
+        found = models.storage.related(City, "state_id", self.st1.id)
+        self.assertEqual(sorted([self.cy1, self.cy2], key=lambda c: c.id),
+                         found)
+        self.assertEqual([], models.storage.related("City", "state_id", "x"))
+
+    def test_related_cached(self):
+        models.storage.related(City, "state_id", self.st1.id)
+        self.assertIn(("City", "state_id", self.st1.id), self.joins())
+        found = models.storage.related(City, "state_id", self.st1.id)
+        found.clear()
+        self.assertEqual(2, len(models.storage.related(City, "state_id",
+                                                       self.st1.id)))
+
+    def test_related_invalidated_precisely(self):
+        models.storage.related(City, "state_id", self.st1.id)
+        models.storage.related(City, "state_id", self.st2.id)
+        self.cy3.name = "Oakland"
+        self.assertEqual(2, len(self.joins()))
+        self.cy3.state_id = "other"
+        self.assertEqual([("City", "state_id", self.st1.id)],
+                         list(self.joins()))
+        self.assertEqual([], models.storage.related(City, "state_id",
+                                                    self.st2.id))
+
+    def test_related_after_new_and_delete(self):
+        models.storage.related(City, "state_id", self.st1.id)
+        models.storage.delete(self.cy1)
+        cy = City(id="4", state_id=self.st1.id,
+                  created_at=datetime.today().isoformat(),
+                  updated_at=datetime.today().isoformat())
+        models.storage.new(cy)
+        self.assertCountEqual([self.cy2, cy], models.storage.related(
+            City, "state_id", self.st1.id))
+
+    def test_related_after_reload(self):
+        models.storage.save()
+        models.storage.related(City, "state_id", self.st1.id)
+        models.storage.reload()
+        found = models.storage.related(City, "state_id", self.st1.id)
+        self.assertCountEqual([self.cy1.id, self.cy2.id],
+                              [cy.id for cy in found])
+        for cy in found:
+            self.assertIs(models.storage.all()["City." + cy.id], cy)
+        os.remove("file.json")
+
+    def test_related_not_indexed(self):
+        self.cy1.name = "Paris"
+        self.assertEqual([self.cy1],
+                         models.storage.related(City, "name", "Paris"))
+
+    def test_related_lazy(self):
+        fs = FileStorage(lazy=True)
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        found = fs.related(City, "state_id", self.st2.id)
+        self.assertEqual([self.cy3.id], [cy.id for cy in found])
+        os.remove("file.json")
+
+
+class TestFileStorage_scan(unittest.TestCase):
+    """Unittests for testing the scan method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.pl1 = Place()
+        self.pl1.price_by_night = 80
+        self.pl1.max_guest = 4
+        self.pl2 = Place()
+        self.pl2.price_by_night = 120
+        self.pl2.max_guest = 6
+        self.pl3 = Place()
+        self.pl3.price_by_night = 95
+        self.pl3.max_guest = 2
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_scan_between(self):
+        found = models.storage.scan(Place, price_by_night=(80, 100))
+        self.assertCountEqual([self.pl1, self.pl3], found)
+
+    def test_scan_several_attributes(self):
+        found = models.storage.scan(Place, price_by_night=(80, 150),
+                                    max_guest=(4, None))
+        self.assertCountEqual([self.pl1, self.pl2], found)
+
+    def test_scan_unbounded(self):
+        found = models.storage.scan(Place, price_by_night=(None, 90))
+        self.assertEqual([self.pl1], found)
+
+    def test_scan_class_name(self):
+        found = models.storage.scan("Place", max_guest=(5, 6))
+        self.assertEqual([self.pl2], found)
+
+    def test_scan_not_numeric_attribute(self):
+        self.pl1.rating = 4.5
+        self.pl2.rating = "good"
+        found = models.storage.scan(Place, rating=(4, 5),
+                                    max_guest=(0, None))
+        self.assertEqual([self.pl1], found)
+
+    def test_scan_not_numeric_value(self):
+        self.pl1.price_by_night = "80"
+        found = models.storage.scan(Place, price_by_night=(0, None))
+        self.assertCountEqual([self.pl2, self.pl3], found)
+
+    def test_scan_class_without_columns(self):
+        us = User()
+        us.age = 30
+        self.assertEqual([us], models.storage.scan(User, age=(18, None)))
+
+    def test_scan_after_update_new_and_delete(self):
+        models.storage.scan(Place, price_by_night=(0, None))
+        self.pl1.price_by_night = 200
+        pl4 = Place(id="4", price_by_night=90,
+                    created_at=datetime.today().isoformat(),
+                    updated_at=datetime.today().isoformat())
+        models.storage.new(pl4)
+        models.storage.delete(self.pl3)
+        found = models.storage.scan(Place, price_by_night=(0, 100))
+        self.assertEqual([pl4], found)
+        found = models.storage.scan(Place, price_by_night=(150, None))
+        self.assertEqual([self.pl1], found)
+
+    def test_scan_column_attribute(self):
+        self.pl1.latitude = 12.5
+        found = models.storage.scan(Place, latitude=(10, 20),
+                                    price_by_night=(0, 100))
+        self.assertEqual([self.pl1], found)
+
+    def test_scan_after_console_update(self):
+        models.storage.scan(Place, price_by_night=(0, None))
+        with patch("sys.stdout", new=io.StringIO()):
+            HBNBCommand().onecmd("update Place {} price_by_night 300"
+                                 .format(self.pl3.id))
+        found = models.storage.scan(Place, price_by_night=(200, None))
+        self.assertEqual([self.pl3], found)
+
+    def test_scan_after_objects_replaced(self):
+        models.storage.scan(Place, price_by_night=(0, None))
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual([], models.storage.scan(Place,
+                                                 price_by_night=(0, None)))
+
+    def test_scan_lazy(self):
+        fs = FileStorage(lazy=True)
+        self.pl1.save()
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        found = fs.scan(Place, max_guest=(3, 5))
+        self.assertEqual([self.pl1.id], [obj.id for obj in found])
+        FileStorage._FileStorage__objects = {}
+        os.remove("file.json")
+
+
+class TestFileStorage_near(unittest.TestCase):
+    """Unittests for testing the near and within methods of the
+    FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.sf = Place()
+        self.sf.latitude = 37.7749
+        self.sf.longitude = -122.4194
+        self.oak = Place()
+        self.oak.latitude = 37.8044
+        self.oak.longitude = -122.2712
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_near(self):
+        found = models.storage.near(Place, 37.7749, -122.4194, 20)
+        self.assertEqual([self.sf, self.oak], found)
+        self.assertEqual([self.sf], models.storage.near("Place", 37.7749,
+                                                        -122.4194, 5))
+
+    def test_within(self):
+        found = models.storage.within(Place, 37.8, -123, 38, -122)
+        self.assertEqual([self.oak], found)
+
+    def test_class_without_coordinates(self):
+        User()
+        self.assertEqual([], models.storage.near(User, 0, 0, 100))
+        self.assertEqual([], models.storage.within(User, -90, -180, 90, 180))
+
+    def test_after_update_new_and_delete(self):
+        models.storage.near(Place, 0, 0, 1)
+        self.sf.latitude = 0.001
+        self.sf.longitude = 0.001
+        pl = Place(id="3", latitude=0.0, longitude=0.002,
+                   created_at=datetime.today().isoformat(),
+                   updated_at=datetime.today().isoformat())
+        models.storage.new(pl)
+        models.storage.delete(self.oak)
+        found = models.storage.near(Place, 0, 0, 1)
+        self.assertEqual([self.sf, pl], found)
+        self.assertEqual([], models.storage.near(Place, 37.8, -122.27, 10))
+
+    def test_default_coordinates(self):
+        pl = Place()
+        self.assertEqual([pl], models.storage.near(Place, 0, 0, 1))
+
+    def test_not_finite_coordinates(self):
+        models.storage.near(Place, 0, 0, 1)
+        self.sf.latitude = float("nan")
+        self.oak.longitude = float("inf")
+        self.assertEqual([], models.storage.near(Place, 37.8, -122.3, 20))
+        self.assertEqual([], models.storage.within(Place, -90, -180, 90, 180))
+
+    def test_lazy(self):
+        fs = FileStorage(lazy=True)
+        self.sf.save()
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        found = fs.near(Place, 37.8, -122.3, 20)
+        self.assertCountEqual([self.sf.id, self.oak.id],
+                              [obj.id for obj in found])
+        FileStorage._FileStorage__objects = {}
+        os.remove("file.json")
+
+
+class TestFileStorage_having(unittest.TestCase):
+    """Unittests for testing the having method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.pl1 = Place()
+        self.pl1.amenity_ids = ["wifi", "pool"]
+        self.pl2 = Place()
+        self.pl2.amenity_ids.append("wifi")
+        self.pl3 = Place()
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_having(self):
+        found = models.storage.having(Place, amenity_ids=["wifi"])
+        self.assertCountEqual([self.pl1, self.pl2], found)
+        found = models.storage.having("Place", amenity_ids=["wifi", "pool"])
+        self.assertEqual([self.pl1], found)
+        self.assertEqual([], models.storage.having(Place,
+                                                   amenity_ids=["gym"]))
+
+    def test_having_no_items(self):
+        found = models.storage.having(Place, amenity_ids=[])
+        self.assertCountEqual([self.pl1, self.pl2, self.pl3], found)
+
+    def test_having_not_indexed(self):
+        us = User()
+        us.tags = ["a", "b"]
+        self.assertEqual([us], models.storage.having(User, tags=["b"]))
+
+    def test_having_after_changes(self):
+        models.storage.having(Place, amenity_ids=["wifi"])
+        self.pl1.amenity_ids.remove("wifi")
+        self.pl3.amenity_ids += ["wifi", "gym"]
+        models.storage.delete(self.pl2)
+        found = models.storage.having(Place, amenity_ids=["wifi"])
+        self.assertEqual([self.pl3], found)
+
+    def test_having_lazy(self):
+        fs = FileStorage(lazy=True)
+        self.pl1.save()
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        found = fs.having(Place, amenity_ids=["pool"])
+        self.assertEqual([self.pl1.id], [obj.id for obj in found])
+        FileStorage._FileStorage__objects = {}
+        os.remove("file.json")
+
+
+class TestFileStorage_search(unittest.TestCase):
+    """Unittests for testing the search method of the FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "search.json"
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.pl.description = "Sunny loft with a sea view"
+        self.rv1 = Review()
+        self.rv1.text = "Great loft, great host"
+        self.rv2 = Review()
+        self.rv2.text = "Noisy street"
+
+    def tearDown(self):
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__objects = {}
+        for path in ("search.json", "search.json.text", "search.json.log"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_search(self):
+        self.assertEqual([self.rv1, self.pl], models.storage.search("loft"))
+        self.assertEqual([self.rv1], models.storage.search("GREAT"))
+        self.assertEqual([], models.storage.search("castle"))
+
+    def test_search_class(self):
+        self.assertEqual([self.pl], models.storage.search("loft", Place))
+        self.assertEqual([self.rv1],
+                         models.storage.search("loft", "Review"))
+        self.assertEqual([], models.storage.search("loft", User))
+
+    def test_search_limit_offset(self):
+        self.assertEqual([self.rv1], models.storage.search("loft", limit=1))
+        self.assertEqual([self.pl],
+                         models.storage.search("loft", offset=1, limit=1))
+        self.assertEqual([], models.storage.search("loft", offset=2))
+
+    def test_search_after_changes(self):
+        models.storage.search("loft")
+        self.pl.description = "Castle"
+        self.rv2.text = "Quiet loft"
+        models.storage.delete(self.rv1)
+        rv = Review(id="3", text="loft loft",
+                    created_at=datetime.today().isoformat(),
+                    updated_at=datetime.today().isoformat())
+        models.storage.new(rv)
+        self.assertCountEqual([self.rv2, rv], models.storage.search("loft"))
+        self.assertEqual([self.pl], models.storage.search("castle"))
+
+    def test_search_not_text_attribute(self):
+        self.pl.name = "Castle"
+        us = User()
+        us.text = "Castle"
+        self.assertEqual([], models.storage.search("castle"))
+
+    def test_compact_saves_index(self):
+        models.storage.search("loft")
+        models.storage.save()
+        models.storage.compact()
+        with open("search.json.text") as f:
+            saved = json.load(f)
+        self.assertEqual({"great": 2, "loft": 1, "host": 1},
+                         saved["docs"]["Review." + self.rv1.id])
+
+    def test_save_does_not_write_index(self):
+        models.storage.search("loft")
+        models.storage.save()
+        self.assertFalse(os.path.exists("search.json.text"))
+
+    def test_exit_saves_index(self):
+        models.storage.search("loft")
+        self.rv2.text = "Castle"
+        models.storage._FileStorage__close()
+        self.assertFalse(os.path.exists("search.json.text"))
+        models.storage.save()
+        models.storage._FileStorage__close()
+        with open("search.json.text") as f:
+            saved = json.load(f)
+        self.assertEqual({"castle": 1},
+                         saved["docs"]["Review." + self.rv2.id])
+
+    def test_journal_compaction_saves_index(self):
+        models.storage.save()
+        fs = FileStorage(journal=True, compact_every=2)
+        fs.search("loft")
+        self.rv2.text = "Castle"
+        fs.save()
+        self.assertFalse(os.path.exists("search.json.text"))
+        self.pl.description = "Castle"
+        fs.save()
+        self.assertTrue(os.path.exists("search.json.text"))
+
+    def test_reload_uses_saved_index(self):
+        models.storage.search("loft")
+        models.storage.save()
+        models.storage.compact()
+        with open("search.json.text") as f:
+            saved = json.load(f)
+        saved["docs"]["Review." + self.rv2.id] = {"castle": 1}
+        with open("search.json.text", "w") as f:
+            json.dump(saved, f)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        found = models.storage.search("castle")
+        self.assertEqual(["Review." + self.rv2.id],
+                         ["Review." + obj.id for obj in found])
+
+    def test_reload_ignores_stale_index(self):
+        models.storage.search("loft")
+        models.storage.save()
+        models.storage.compact()
+        with open("search.json.text") as f:
+            saved = json.load(f)
+        saved["docs"]["Review." + self.rv2.id] = {"castle": 1}
+        with open("search.json.text", "w") as f:
+            json.dump(saved, f)
+        os.utime("search.json", ns=(0, 0))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual([], models.storage.search("castle"))
+        self.assertEqual(2, len(models.storage.search("loft")))
+
+    def test_reload_replays_journal_into_saved_index(self):
+        models.storage.search("loft")
+        models.storage.save()
+        models.storage.compact()
+        self.rv2.text = "Castle"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        found = models.storage.search("castle")
+        self.assertEqual([self.rv2.id], [obj.id for obj in found])
+
+    def test_search_lazy(self):
+        fs = FileStorage(lazy=True)
+        self.pl.save()
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        found = fs.search("loft", Place)
+        self.assertEqual([self.pl.id], [obj.id for obj in found])
+
+
+class TestFileStorage_bulk(unittest.TestCase):
+    """Unittests for testing the bulk_new and bulk_update methods of the
+    FileStorage class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.fs = FileStorage()
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+        for path in ("file.json", "file.json.log"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def saved(self):
+        with open("file.json") as f:
+            return json.load(f)
+
+    def test_bulk_new(self):
+        us = User()
+        FileStorage._FileStorage__objects = {}
+        pl = Place()
+        odict = pl.to_dict()
+        FileStorage._FileStorage__objects = {}
+        report = self.fs.bulk_new([us, odict, {"__class__": "State",
+                                               "name": "Texas"}])
+        self.assertEqual(3, report["objects"])
+        self.assertGreater(report["per_second"], 0)
+        objs = models.storage.all()
+        self.assertIs(us, objs["User." + us.id])
+        self.assertEqual(odict, objs["Place." + pl.id].to_dict())
+        st = models.storage.find(State, name="Texas")[0]
+        self.assertEqual(datetime, type(st.created_at))
+        self.assertEqual({"User." + us.id, "Place." + pl.id,
+                          "State." + st.id}, set(self.saved()))
+
+    def test_bulk_new_indexed(self):
+        st = State()
+        models.storage.related(City, "state_id", st.id)
+        self.fs.bulk_new({"__class__": "City", "state_id": st.id}
+                         for _ in range(3))
+        self.assertEqual(3, len(st.cities))
+        self.assertEqual(3, models.storage.count(City))
+
+    def test_bulk_new_small_batch(self):
+        for _ in range(8):
+            Place()
+        models.storage.scan(Place, price_by_night=(None, None))
+        self.fs.bulk_new([{"__class__": "Place", "price_by_night": 50}])
+        self.assertEqual(1, len(models.storage.scan(Place,
+                                                    price_by_night=(40, 60))))
+
+    def test_bulk_new_invalid_items(self):
+        with self.assertRaises(ValueError):
+            self.fs.bulk_new([{"__class__": "State"}, {"__class__": "Foo"}])
+        with self.assertRaises(ValueError):
+            self.fs.bulk_new([{"name": "Texas"}])
+        with self.assertRaises(ValueError):
+            self.fs.bulk_new([{"__class__": "State", "created_at": "x"}])
+        with self.assertRaises(TypeError):
+            self.fs.bulk_new([State(), "State"])
+        self.assertEqual(1, len(models.storage.all()))
+        self.assertFalse(os.path.isfile("file.json"))
+
+    def test_bulk_new_journal(self):
+        fs = FileStorage(journal=True)
+        fs.bulk_new([{"__class__": "State"}, {"__class__": "City"}])
+        self.assertFalse(os.path.isfile("file.json"))
+        with open("file.json.log") as f:
+            self.assertEqual(2, len(f.readlines()))
+        fs = FileStorage(journal=True, compact_every=2)
+        fs.bulk_new([{"__class__": "State"}, {"__class__": "City"}])
+        self.assertEqual(4, len(self.saved()))
+        self.assertFalse(os.path.isfile("file.json.log"))
+
+    def test_dicts(self):
+        pl, st = Place(), State()
+        self.assertEqual([pl.to_dict(), st.to_dict()],
+                         list(self.fs.dicts()))
+        self.assertEqual([st.to_dict()], list(self.fs.dicts(State)))
+
+    def test_dicts_lazy_not_built(self):
+        st = State()
+        st.name = "Texas"
+        self.fs.save()
+        FileStorage._FileStorage__objects = {}
+        fs = FileStorage(lazy=True)
+        fs.reload()
+        self.assertEqual([st.to_dict()], list(fs.dicts("State")))
+        objs = models.storage.all()
+        self.assertIs(dict, type(dict.get(objs, "State." + st.id)))
+
+    def test_bulk_update(self):
+        pl1, pl2 = Place(), Place()
+        before = pl1.updated_at
+        report = self.fs.bulk_update([
+            {"__class__": "Place", "id": pl1.id, "max_guest": 4},
+            {"__class__": "Place", "id": pl2.id, "max_guest": 2,
+             "name": "Loft"}])
+        self.assertEqual(2, report["objects"])
+        self.assertEqual(4, pl1.max_guest)
+        self.assertEqual("Loft", pl2.name)
+        self.assertLess(before, pl1.updated_at)
+        self.assertEqual(pl1.updated_at, pl2.updated_at)
+        self.assertEqual("Loft", self.saved()["Place." + pl2.id]["name"])
+        self.assertEqual([pl1], models.storage.find(Place, max_guest=4))
+
+    def test_bulk_update_keeps_id(self):
+        pl = Place()
+        self.fs.bulk_update([{"__class__": "Place", "id": pl.id}])
+        self.assertIn("Place." + pl.id, models.storage.all())
+
+    def test_bulk_update_missing_object(self):
+        pl = Place()
+        with self.assertRaises(ValueError):
+            self.fs.bulk_update([
+                {"__class__": "Place", "id": pl.id, "name": "Loft"},
+                {"__class__": "Place", "id": "missing", "name": "Loft"}])
+        self.assertEqual("", pl.name)
+
+    def test_bulk_update_indexed(self):
+        pls = [Place() for _ in range(8)]
+        models.storage.scan(Place, max_guest=(None, None))
+        self.fs.bulk_update([{"__class__": "Place", "id": pls[0].id,
+                              "max_guest": 9}])
+        self.assertEqual([pls[0]], models.storage.scan(Place,
+                                                       max_guest=(9, 9)))
+
+    def test_bulk_update_read_only(self):
+        pl1, pl2 = Place(), Place()
+        with self.assertRaises(ValueError):
+            self.fs.bulk_update([
+                {"__class__": "Place", "id": pl1.id, "price_by_night": 99},
+                {"__class__": "Place", "id": pl2.id, "city": "Paris"}])
+        self.assertEqual(0, pl1.price_by_night)
+
+    def test_bulk_update_failure_keeps_indexes(self):
+        pls = [Place() for _ in range(8)]
+        models.storage.scan(Place, price_by_night=(None, None))
+
+        def fail(obj, value):
+            raise ValueError("invalid color")
+        with patch.object(Place, "color", property(None, fail), create=True):
+            with self.assertRaises(ValueError):
+                self.fs.bulk_update([
+                    {"__class__": "Place", "id": pls[0].id,
+                     "price_by_night": 99},
+                    {"__class__": "Place", "id": pls[1].id, "color": "red"}])
+        self.assertEqual(99, pls[0].price_by_night)
+        self.assertEqual([pls[0]], models.storage.scan(
+            Place, price_by_night=(50, None)))
+        self.assertEqual(1, models.storage.query(Place).where(
+            price_by_night__gte=50).count())
+
+
 if __name__ == "__main__":
     unittest.main()
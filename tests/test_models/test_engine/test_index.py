@@ -0,0 +1,343 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/index.py.
+Unittest classes:
+    TestHashIndex
+    TestInvertedIndex
+    TestTextIndex
+    TestSortedIndex
+    TestColumnStore
+    TestGridIndex
+"""
+import json
+import unittest
+from models.engine.index import ColumnStore, GridIndex, HashIndex, \
+    InvertedIndex, SortedIndex, TextIndex, distance, tokenize
+
+
+class TestHashIndex(unittest.TestCase):
+    """Unittests for testing the HashIndex class."""
+
+    def setUp(self):
+        self.index = HashIndex("place_id")
+        self.index.add("Review.1", "p1")
+        self.index.add("Review.2", "p1")
+        self.index.add("Review.3", "p2")
+
+    def test_attr(self):
+        self.assertEqual("place_id", self.index.attr)
+
+    def test_get(self):
+        self.assertEqual({"Review.1", "Review.2"}, self.index.get("p1"))
+        self.assertEqual(set(), self.index.get("p3"))
+
+    def test_add_moves_key(self):
+        self.index.add("Review.1", "p2")
+        self.assertEqual({"Review.2"}, self.index.get("p1"))
+        self.assertEqual({"Review.1", "Review.3"}, self.index.get("p2"))
+        self.assertEqual(3, len(self.index))
+
+    def test_discard(self):
+        self.index.discard("Review.3")
+        self.index.discard("Review.4")
+        self.assertEqual(set(), self.index.get("p2"))
+        self.assertEqual(2, len(self.index))
+
+    def test_unhashable_value(self):
+        self.index.add("Review.1", ["p1"])
+        self.assertEqual({"Review.2"}, self.index.get("p1"))
+        self.assertEqual(set(), self.index.get(["p1"]))
+        self.assertEqual(2, len(self.index))
+
+
+class TestInvertedIndex(unittest.TestCase):
+    """Unittests for testing the InvertedIndex class."""
+
+    def setUp(self):
+        self.index = InvertedIndex("amenity_ids")
+        self.index.add("Place.1", ["wifi", "pool"])
+        self.index.add("Place.2", ["wifi"])
+        self.index.add("Place.3", ["pool", "gym", "wifi"])
+
+    def test_attr(self):
+        self.assertEqual("amenity_ids", self.index.attr)
+
+    def test_get(self):
+        self.assertEqual({"Place.1", "Place.3"}, self.index.get("pool"))
+        self.assertEqual(set(), self.index.get("sauna"))
+        self.assertEqual(set(), self.index.get(["pool"]))
+
+    def test_get_all(self):
+        self.assertEqual({"Place.1", "Place.3"},
+                         self.index.get_all(["wifi", "pool"]))
+        self.assertEqual({"Place.3"}, self.index.get_all(("gym", "wifi")))
+        self.assertEqual(set(), self.index.get_all(["gym", "sauna"]))
+        self.assertEqual(set(), self.index.get_all([]))
+
+    def test_add_moves_key(self):
+        self.index.add("Place.1", ["gym"])
+        self.assertEqual({"Place.3"}, self.index.get("pool"))
+        self.assertEqual({"Place.1", "Place.3"}, self.index.get("gym"))
+        self.assertEqual(3, len(self.index))
+
+    def test_not_list_values(self):
+        self.index.add("Place.2", "wifi")
+        self.index.add("Place.4", [["wifi"], "sauna"])
+        self.assertEqual({"Place.1", "Place.3"}, self.index.get("wifi"))
+        self.assertEqual({"Place.4"}, self.index.get("sauna"))
+
+    def test_discard(self):
+        self.index.discard("Place.3")
+        self.index.discard("Place.5")
+        self.assertEqual(set(), self.index.get("gym"))
+        self.assertEqual(2, len(self.index))
+
+
+class TestTextIndex(unittest.TestCase):
+    """Unittests for testing the TextIndex class."""
+
+    def setUp(self):
+        self.index = TextIndex()
+        self.index.add("Review.1", "Great loft, great view")
+        self.index.add("Review.2", "Small room with a view of the sea")
+        self.index.add("Place.1", "Loft near the station")
+
+    def test_tokenize(self):
+        self.assertEqual(["great", "loft", "a_b", "42"],
+                         tokenize("Great LOFT! a_b, 42"))
+
+    def test_search_ranks_matches(self):
+        found = self.index.search("great view")
+        self.assertEqual(["Review.1", "Review.2"], [k for _, k in found])
+        self.assertGreater(found[0][0], found[1][0])
+
+    def test_search_any_word(self):
+        found = self.index.search("loft sea")
+        self.assertCountEqual(["Review.1", "Review.2", "Place.1"],
+                              [k for _, k in found])
+
+    def test_search_no_match(self):
+        self.assertEqual([], self.index.search("castle"))
+        self.assertEqual([], self.index.search(""))
+        self.assertEqual([], TextIndex().search("loft"))
+
+    def test_add_replaces_words(self):
+        self.index.add("Place.1", "Castle")
+        self.assertEqual(["Review.1"],
+                         [k for _, k in self.index.search("loft")])
+        self.assertEqual(["Place.1"],
+                         [k for _, k in self.index.search("castle")])
+
+    def test_add_not_string(self):
+        self.index.add("Place.1", None)
+        self.assertEqual(2, len(self.index))
+
+    def test_discard(self):
+        self.index.discard("Review.2")
+        self.index.discard("Review.3")
+        self.assertEqual(["Review.1"],
+                         [k for _, k in self.index.search("view")])
+        self.assertEqual(2, len(self.index))
+
+    def test_dumps_and_docs(self):
+        self.assertEqual({"great": 2, "loft": 1, "view": 1},
+                         self.index.docs()["Review.1"])
+        self.index.dumps()
+        self.index.add("Place.1", "Castle")
+        copy = TextIndex(json.loads(self.index.dumps()))
+        self.assertEqual(self.index.docs(), copy.docs())
+        self.assertEqual(self.index.search("castle view"),
+                         copy.search("castle view"))
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Unittests for testing the SortedIndex class."""
+
+    def setUp(self):
+        self.index = SortedIndex("price_by_night")
+        for key, value in (("Place.1", 80), ("Place.2", 120),
+                           ("Place.3", 95.5), ("Place.4", 80)):
+            self.index.add(key, value)
+
+    def test_attr(self):
+        self.assertEqual("price_by_night", self.index.attr)
+
+    def test_range(self):
+        self.assertEqual(["Place.1", "Place.4", "Place.3"],
+                         self.index.range(80, 100))
+        self.assertEqual(["Place.2"], self.index.range(100))
+        self.assertEqual(["Place.1", "Place.4"], self.index.range(None, 80))
+        self.assertEqual(4, len(self.index.range()))
+        self.assertEqual([], self.index.range(100, 90))
+
+    def test_count(self):
+        self.assertEqual(3, self.index.count(80, 100))
+        self.assertEqual(4, self.index.count())
+        self.assertEqual(0, self.index.count(200))
+        self.assertEqual(0, self.index.count(100, 90))
+
+    def test_add_moves_key(self):
+        self.index.add("Place.1", 130)
+        self.index.add("Place.2", 120)
+        self.assertEqual(["Place.2", "Place.1"], self.index.range(100))
+        self.assertEqual(4, len(self.index))
+
+    def test_discard(self):
+        self.index.discard("Place.4")
+        self.index.discard("Place.5")
+        self.assertEqual(["Place.1"], self.index.range(80, 80))
+        self.assertEqual(3, len(self.index))
+
+    def test_add_many(self):
+        self.index.add_many([("Place.2", 10), ("Place.5", 90),
+                             ("Place.1", None)])
+        self.assertEqual(["Place.2", "Place.4", "Place.5", "Place.3"],
+                         self.index.range())
+
+    def test_blocks(self):
+        index = SortedIndex("max_guest", load=2)
+        index.add_many([("Place.{}".format(i), i % 4) for i in range(10)])
+        for i in range(10, 20):
+            index.add("Place.{}".format(i), i % 4)
+        for i in range(0, 20, 3):
+            index.discard("Place.{}".format(i))
+        self.assertEqual(["Place.1", "Place.13", "Place.17", "Place.5",
+                          "Place.10", "Place.14", "Place.2"],
+                         index.range(1, 2))
+        self.assertEqual(3, index.count(None, 0))
+        self.assertEqual(13, len(index.range()))
+
+    def test_not_numeric_values(self):
+        self.index.add("Place.1", "80")
+        self.index.add("Place.5", None)
+        self.index.add("Place.6", float("nan"))
+        self.assertEqual(["Place.4", "Place.3", "Place.2"],
+                         self.index.range())
+
+
+class TestColumnStore(unittest.TestCase):
+    """Unittests for testing the ColumnStore class."""
+
+    def setUp(self):
+        self.store = ColumnStore(["price", "guests"])
+        self.store.add("Place.1", {"price": 80, "guests": 4})
+        self.store.add("Place.2", {"price": 120, "guests": 6})
+        self.store.add("Place.3", {"price": 95.5, "guests": 2})
+
+    def test_attrs(self):
+        self.assertEqual(("price", "guests"), self.store.attrs)
+
+    def test_get(self):
+        self.assertEqual(95.5, self.store.get("Place.3", "price"))
+
+    def test_select(self):
+        self.assertCountEqual(["Place.1", "Place.3"],
+                              self.store.select({"price": (80, 100)}))
+        self.assertEqual(["Place.2"], self.store.select(
+            {"price": (80, None), "guests": (5, None)}))
+        self.assertCountEqual(["Place.1", "Place.2", "Place.3"],
+                              self.store.select({}))
+
+    def test_add_replaces_values(self):
+        self.store.add("Place.1", {"price": 200, "guests": 4})
+        self.assertEqual(["Place.2"], self.store.select({"price": (100, 150)}))
+        self.assertEqual(3, len(self.store))
+
+    def test_missing_and_not_numeric_values(self):
+        self.store.add("Place.4", {"price": "cheap"})
+        self.assertEqual([], self.store.select({"guests": (None, 1)}))
+        self.assertNotIn("Place.4", self.store.select({"price": (None, None)}))
+
+    def test_discard(self):
+        self.store.discard("Place.1")
+        self.store.discard("Place.5")
+        self.assertEqual(2, len(self.store))
+        self.assertCountEqual(["Place.2", "Place.3"],
+                              self.store.select({"price": (None, None)}))
+        self.assertEqual(2, self.store.get("Place.3", "guests"))
+
+    def test_add_many(self):
+        self.store.add_many([("Place.4", {"price": 60}),
+                             ("Place.1", {"price": 70, "guests": 4})])
+        self.assertEqual(["Place.1", "Place.4"],
+                         sorted(self.store.select({"price": (None, 75)})))
+        self.assertEqual(4, len(self.store))
+
+    def test_discard_last(self):
+        self.store.discard("Place.3")
+        self.assertCountEqual(["Place.1", "Place.2"],
+                              self.store.select({"guests": (0, None)}))
+
+    def test_empty(self):
+        store = ColumnStore(["price"])
+        self.assertEqual([], store.select({"price": (0, None)}))
+        self.assertEqual(0, len(store))
+
+
+class TestGridIndex(unittest.TestCase):
+    """Unittests for testing the GridIndex class."""
+
+    def setUp(self):
+        self.grid = GridIndex()
+        self.grid.add("Place.sf", 37.7749, -122.4194)
+        self.grid.add("Place.oak", 37.8044, -122.2712)
+        self.grid.add("Place.la", 34.05, -118.24)
+
+    def test_distance(self):
+        self.assertAlmostEqual(13.43, distance(37.7749, -122.4194,
+                                               37.8044, -122.2712), 2)
+        self.assertEqual(0, distance(1, 2, 1, 2))
+
+    def test_near(self):
+        found = self.grid.near(37.7749, -122.4194, 20)
+        self.assertEqual(["Place.sf", "Place.oak"], [k for _, k in found])
+        self.assertAlmostEqual(13.43, found[1][0], 2)
+        found = self.grid.near(37.7749, -122.4194, 600)
+        self.assertEqual(3, len(found))
+
+    def test_box(self):
+        self.assertCountEqual(["Place.sf", "Place.oak"],
+                              self.grid.box(37, -123, 38, -122))
+        self.assertEqual([], self.grid.box(0, 0, 10, 10))
+
+    def test_large_box(self):
+        self.assertEqual(3, len(self.grid.box(-90, -180, 90, 180)))
+
+    def test_antimeridian(self):
+        self.grid.add("Place.fj", -17.7, 179.9)
+        self.grid.add("Place.ws", -17.7, -179.9)
+        self.assertCountEqual(["Place.fj", "Place.ws"],
+                              self.grid.box(-18, 179, -17, -179))
+        found = self.grid.near(-17.7, 180, 20)
+        self.assertCountEqual(["Place.fj", "Place.ws"], [k for _, k in found])
+
+    def test_near_pole(self):
+        self.grid.add("Place.n1", 89.9, 0)
+        self.grid.add("Place.n2", 89.9, 180)
+        found = self.grid.near(90, 0, 20)
+        self.assertCountEqual(["Place.n1", "Place.n2"], [k for _, k in found])
+
+    def test_add_moves_key(self):
+        self.grid.add("Place.la", 37.78, -122.42)
+        self.assertEqual(3, len(self.grid.near(37.7749, -122.4194, 20)))
+        self.assertEqual(3, len(self.grid))
+
+    def test_not_numeric_coordinates(self):
+        self.grid.add("Place.la", "34.05", -118.24)
+        self.assertEqual(2, len(self.grid))
+
+    def test_not_finite_coordinates(self):
+        self.grid.add("Place.la", float("nan"), -118.24)
+        self.grid.add("Place.oak", 37.8044, float("inf"))
+        self.assertEqual(1, len(self.grid))
+        self.assertEqual([], self.grid.box(-float("inf"), -180, 90, 180))
+        self.assertEqual([], self.grid.box(0, 0, float("nan"), 1))
+
+    def test_discard(self):
+        self.grid.discard("Place.oak")
+        self.grid.discard("Place.xx")
+        self.assertEqual(["Place.sf"],
+                         self.grid.box(37, -123, 38, -122))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/query.py.
+Unittest classes:
+    TestQuery_where
+    TestQuery_order
+    TestQuery_values
+"""
+import models
+import unittest
+from models.engine.file_storage import FileStorage
+from models.engine.query import Query
+from models.place import Place
+from models.user import User
+
+
+class TestQuery_where(unittest.TestCase):
+    """Unittests for testing the conditions of the Query class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.pl1 = Place()
+        self.pl1.city_id = "c1"
+        self.pl1.price_by_night = 80
+        self.pl2 = Place()
+        self.pl2.city_id = "c1"
+        self.pl2.price_by_night = 120
+        self.pl3 = Place()
+        self.pl3.city_id = "c2"
+        self.pl3.price_by_night = 60
+        self.us = User()
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_query_is_query(self):
+        self.assertEqual(Query, type(models.storage.query(Place)))
+
+    def test_no_conditions(self):
+        self.assertCountEqual([self.pl1, self.pl2, self.pl3],
+                              models.storage.query(Place))
+        self.assertEqual(4, len(list(models.storage.query())))
+
+    def test_equal(self):
+        query = models.storage.query(Place).where(city_id="c1")
+        self.assertCountEqual([self.pl1, self.pl2], query)
+
+    def test_operators(self):
+        query = models.storage.query("Place")
+        self.assertCountEqual([self.pl1, self.pl3],
+                              query.where(price_by_night__lt=100))
+        self.assertEqual([self.pl3], list(query.where(price_by_night__lte=60)))
+        self.assertEqual([self.pl2], list(query.where(price_by_night__gt=80)))
+        self.assertCountEqual([self.pl1, self.pl2],
+                              query.where(price_by_night__gte=80))
+        self.assertEqual([self.pl3], list(query.where(city_id__ne="c1")))
+        self.assertCountEqual([self.pl1, self.pl3],
+                              query.where(price_by_night__in=(60, 80)))
+
+    def test_contains(self):
+        self.pl1.amenity_ids = ["wifi", "pool"]
+        self.pl2.amenity_ids = ["wifi"]
+        query = models.storage.query(Place)
+        self.assertCountEqual([self.pl1, self.pl2],
+                              query.where(amenity_ids__contains=["wifi"]))
+        self.assertEqual([self.pl1], list(query.where(
+            amenity_ids__contains=["wifi"], price_by_night__lt=100)))
+        self.assertEqual([], list(query.where(city_id__contains=["c"])))
+
+    def test_equal_and_range(self):
+        query = models.storage.query(Place).where(city_id="c1",
+                                                  price_by_night__lt=100)
+        self.assertEqual([self.pl1], list(query))
+
+    def test_chained_where(self):
+        query = models.storage.query(Place).where(price_by_night__gt=60)
+        query = query.where(price_by_night__lt=120)
+        self.assertEqual([self.pl1], list(query))
+
+    def test_missing_attribute(self):
+        self.pl1.rating = 5
+        query = models.storage.query(Place).where(rating__ne=4)
+        self.assertEqual([self.pl1], list(query))
+
+    def test_uncomparable_value(self):
+        query = models.storage.query(Place).where(city_id__lt=3)
+        self.assertEqual([], list(query))
+
+    def test_unknown_operator(self):
+        with self.assertRaises(ValueError):
+            models.storage.query(Place).where(price_by_night__near=3)
+
+    def test_count(self):
+        self.assertEqual(3, models.storage.query(Place).count())
+        query = models.storage.query(Place).where(city_id="c1")
+        self.assertEqual(2, query.count())
+        self.assertEqual(0, models.storage.query("MyModel").count())
+
+    def test_sees_later_changes(self):
+        query = models.storage.query(Place).where(price_by_night__lt=100)
+        self.pl2.price_by_night = 90
+        self.assertCountEqual([self.pl1, self.pl2, self.pl3], query)
+
+    def test_lazy(self):
+        results = iter(models.storage.query(Place))
+        self.assertIn(next(results), [self.pl1, self.pl2, self.pl3])
+
+
+class TestQuery_order(unittest.TestCase):
+    """Unittests for testing the ordering and limits of the Query class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.pls = []
+        for price, guests in ((80, 2), (120, 4), (60, 4), (100, 2)):
+            pl = Place()
+            pl.price_by_night = price
+            pl.max_guest = guests
+            self.pls.append(pl)
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def prices(self, query):
+        return [pl.price_by_night for pl in query]
+
+    def test_order_by(self):
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([60, 80, 100, 120], self.prices(query))
+
+    def test_order_by_descending(self):
+        query = models.storage.query(Place).order_by("-price_by_night")
+        self.assertEqual([120, 100, 80, 60], self.prices(query))
+
+    def test_order_by_several_attributes(self):
+        query = models.storage.query(Place).order_by("-max_guest",
+                                                     "price_by_night")
+        self.assertEqual([60, 120, 80, 100], self.prices(query))
+
+    def test_missing_attribute_last(self):
+        self.pls[0].rating = 2
+        self.pls[1].rating = 1
+        for order in ("rating", "-rating"):
+            query = models.storage.query(Place).order_by(order)
+            self.assertEqual(4, len(list(query)))
+            self.assertFalse(hasattr(list(query)[-1], "rating"))
+
+    def test_limit(self):
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([60, 80], self.prices(query.limit(2)))
+        self.assertEqual([120, 100],
+                         self.prices(query.order_by("-price_by_night")
+                                     .limit(2)))
+        self.assertEqual(3, len(list(models.storage.query(Place).limit(3))))
+
+    def test_offset(self):
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([100, 120], self.prices(query.offset(2)))
+        self.assertEqual([80], self.prices(query.offset(1).limit(1)))
+
+    def test_first(self):
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertIs(self.pls[2], query.first())
+        self.assertIsNone(query.where(price_by_night__gt=500).first())
+
+    def test_count_with_limit(self):
+        self.assertEqual(2, models.storage.query(Place).limit(2).count())
+
+    def test_limit_indexed_is_stable(self):
+        for pl in self.pls:
+            pl.city_id = "c1"
+            pl.amenity_ids = ["a1"]
+        ids = sorted(pl.id for pl in self.pls)
+        for query in (models.storage.query(Place).where(city_id="c1"),
+                      models.storage.query(Place).where(
+                          amenity_ids__contains=["a1"])):
+            self.assertEqual(ids[1:3],
+                             [pl.id for pl in query.offset(1).limit(2)])
+
+
+class TestQuery_values(unittest.TestCase):
+    """Unittests for testing the projections of the Query class."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.pl.name = "Loft"
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_values(self):
+        query = models.storage.query(Place).values("id", "name")
+        self.assertEqual([{"id": self.pl.id, "name": "Loft"}], list(query))
+
+    def test_values_missing_attribute(self):
+        query = models.storage.query(Place).values("id", "nickname")
+        self.assertEqual([{"id": self.pl.id}], list(query))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,13 +5,20 @@ Unittest classes:
     TestPlace_instantiation
     TestPlace_save
     TestPlace_to_dict
+    TestPlace_relationships
 """
+import copy
 import os
 import models
+import pickle
 import unittest
 from datetime import datetime
 from time import sleep
 from models.place import Place
+from models.amenity import Amenity
+from models.city import City
+from models.review import Review
+from models.user import User
 
 
 class TestPlace_instantiation(unittest.TestCase):
@@ -98,6 +105,33 @@ class TestPlace_instantiation(unittest.TestCase):
         self.assertIn("amenity_ids", dir(pl))
         self.assertNotIn("amenity_ids", pl.__dict__)
 
+    def test_amenity_ids_not_shared(self):
+        pl1, pl2 = Place(), Place()
+        pl1.amenity_ids.append("a1")
+        self.assertEqual(["a1"], pl1.amenity_ids)
+        self.assertEqual([], pl2.amenity_ids)
+        self.assertEqual([], Place.amenity_ids)
+        self.assertNotIn("amenity_ids", pl2.__dict__)
+
+    def test_amenity_ids_pickle_and_copy(self):
+        pl = Place()
+        pl.amenity_ids.append("a1")
+        for other in (pickle.loads(pickle.dumps(pl)), copy.deepcopy(pl)):
+            self.assertEqual(pl.id, other.id)
+            self.assertEqual(["a1"], other.amenity_ids)
+            other.amenity_ids.append("a2")
+            self.assertEqual(["a1"], pl.amenity_ids)
+
+    def test_amenity_ids_from_dict(self):
+        odict = Place().to_dict()
+        odict["amenity_ids"] = ["a1"]
+        pl = Place.from_dict(odict)
+        pl.amenity_ids.append("a2")
+        self.assertEqual(["a1", "a2"], pl.__dict__["amenity_ids"])
+        other = Place(**pl.to_dict())
+        other.amenity_ids.append("a3")
+        self.assertEqual(["a1", "a2"], pl.amenity_ids)
+
     def test_two_places_unique_ids(self):
         pl1 = Place()
         pl2 = Place()
@@ -194,6 +228,15 @@ class TestPlace_save(unittest.TestCase):
         with open("file.json", "r") as f:
             self.assertIn(plid, f.read())
 
+    def test_amenity_ids_changes_reach_storage(self):
+        pl = Place()
+        models.storage.save()
+        pl.amenity_ids.extend(["a1", "a2"])
+        pl.amenity_ids.remove("a1")
+        self.assertEqual(["a2"], pl.to_dict()["amenity_ids"])
+        self.assertEqual([pl], models.storage.having(Place,
+                                                     amenity_ids=["a2"]))
+
 
 class TestPlace_to_dict(unittest.TestCase):
     """Unittests for testing to_dict method of the Place class."""
@@ -246,5 +289,30 @@ class TestPlace_to_dict(unittest.TestCase):
 
 
 
+class TestPlace_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the Place class."""
+
+    def test_city_and_owner(self):
+        cy, us, pl = City(), User(), Place()
+        pl.city_id, pl.user_id = cy.id, us.id
+        self.assertIs(cy, pl.city)
+        self.assertIs(us, pl.owner)
+        models.storage.delete(us)
+        self.assertIsNone(pl.owner)
+
+    def test_reviews(self):
+        pl = Place()
+        rv1, rv2 = Review(), Review()
+        rv1.place_id = rv2.place_id = pl.id
+        self.assertCountEqual([rv1, rv2], pl.reviews)
+        models.storage.delete(rv1)
+        self.assertEqual([rv2], pl.reviews)
+
+    def test_amenities(self):
+        am1, am2, pl = Amenity(), Amenity(), Place()
+        pl.amenity_ids = [am2.id, "missing", am1.id]
+        self.assertEqual([am2, am1], pl.amenities)
+
+
 if __name__ == "__main__":
     unittest.main()
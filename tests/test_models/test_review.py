@@ -5,6 +5,7 @@ Unittest classes:
     TestReview_instantiation
     TestReview_save
     TestReview_to_dict
+    TestReview_relationships
 """
 import os
 import models
@@ -12,6 +13,8 @@ import unittest
 from datetime import datetime
 from time import sleep
 from models.review import Review
+from models.place import Place
+from models.user import User
 
 
 class TestReview_instantiation(unittest.TestCase):
@@ -197,5 +200,16 @@ class TestReview_to_dict(unittest.TestCase):
             rv.to_dict(None)
 
 
+class TestReview_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the Review class."""
+
+    def test_place_and_user(self):
+        pl, us, rv = Place(), User(), Review()
+        rv.place_id, rv.user_id = pl.id, us.id
+        self.assertIs(pl, rv.place)
+        self.assertIs(us, rv.user)
+        self.assertIsNone(Review().place)
+
+
 if __name__ == "__main__":
     unittest.main()
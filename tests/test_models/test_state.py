@@ -5,6 +5,7 @@ Unittest classes:
     TestState_instantiation
     TestState_save
     TestState_to_dict
+    TestState_relationships
 """
 import os
 import models
@@ -12,6 +13,7 @@ import unittest
 from datetime import datetime
 from time import sleep
 from models.state import State
+from models.city import City
 
 
 class TestState_instantiation(unittest.TestCase):
@@ -185,5 +187,31 @@ class TestState_to_dict(unittest.TestCase):
             st.to_dict(None)
 
 
+class TestState_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the State class."""
+
+    def test_cities(self):
+        st1, st2 = State(), State()
+        cy1, cy2 = City(), City()
+        cy1.state_id = cy2.state_id = st1.id
+        self.assertCountEqual([cy1, cy2], st1.cities)
+        self.assertEqual([], st2.cities)
+
+    def test_cities_follow_changes(self):
+        st = State()
+        cy1, cy2 = City(), City()
+        cy1.state_id = st.id
+        self.assertEqual([cy1], st.cities)
+        cy2.state_id = st.id
+        cy1.state_id = "other"
+        self.assertEqual([cy2], st.cities)
+        models.storage.delete(cy2)
+        self.assertEqual([], st.cities)
+
+    def test_cities_read_only(self):
+        with self.assertRaises(AttributeError):
+            State().cities = []
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,10 +5,13 @@ Unittest classes:
     TestUser_instantiation
     TestUser_save
     TestUser_to_dict
+    TestUser_relationships
 """
 import os
 import models
 from models.user import User
+from models.place import Place
+from models.review import Review
 import unittest
 from datetime import datetime
 from time import sleep
@@ -192,5 +195,16 @@ class TestUser_to_dict(unittest.TestCase):
 
 
 
+class TestUser_relationships(unittest.TestCase):
+    """Unittests for testing the relationships of the User class."""
+
+    def test_places_and_reviews(self):
+        us, pl, rv = User(), Place(), Review()
+        pl.user_id = rv.user_id = us.id
+        self.assertEqual([pl], us.places)
+        self.assertEqual([rv], us.reviews)
+        self.assertEqual([], User().places)
+
+
 if __name__ == "__main__":
     unittest.main()